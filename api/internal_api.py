@@ -1,13 +1,47 @@
 import os
+import json
+import time
+import hashlib
+import logging
+import threading
 from datetime import datetime, timedelta
 import streamlit as st
 import sqlalchemy
 import pandas as pd
 from sqlalchemy.orm import sessionmaker
 from contextlib import contextmanager
-from typing import Generator, List
+from typing import Callable, Generator, List, Optional
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
+
+# constants
+POOL_SIZE = 5
+MAX_OVERFLOW = 10
+POOL_TIMEOUT = 30
+POOL_RECYCLE = 1800
+POOL_WARMUP = 2
+DEFAULT_STATEMENT_TIMEOUT = 120
+CANCEL_POLL_INTERVAL = 0.5
+QUERY_CANCELED = "57014"
+
+
+class QueryTimeoutError(Exception):
+    """Raised when a query is stopped by its statement timeout."""
+
+    def __init__(self, query: str, timeout: float):
+        super().__init__(f"Query exceeded the {timeout}s statement timeout")
+        self.query = query
+        self.timeout = timeout
+
+
+class QueryCancelledError(Exception):
+    """Raised when a running query is cancelled by its caller."""
+
+    def __init__(self, query: str):
+        super().__init__("Query was cancelled")
+        self.query = query
+
 
 def get_db_config(streamlit=True):
     if streamlit:
@@ -36,11 +70,26 @@ def get_db_config(streamlit=True):
     }
 
 
-def _get_connection(db_config):
-    connection_string = f"postgresql://{db_config['user']}:{db_config['password']}@{db_config['host']}:{db_config['port']}/{db_config['dbname']}"
-    engine = sqlalchemy.create_engine(connection_string)
-    conn = engine.connect()
-    return conn
+def get_pool_config(streamlit=True):
+    """
+    Read the connection pool settings, like `get_db_config`.
+
+    Settings not given in the `database` secrets, or in the environment
+    when `streamlit` is False, use the module defaults.
+    """
+    if streamlit:
+        settings = st.secrets.database
+    else:
+        load_dotenv()
+        settings = os.environ
+
+    return {
+        "pool_size": int(settings.get("POOL_SIZE", POOL_SIZE)),
+        "max_overflow": int(settings.get("MAX_OVERFLOW", MAX_OVERFLOW)),
+        "pool_timeout": float(settings.get("POOL_TIMEOUT", POOL_TIMEOUT)),
+        "pool_recycle": int(settings.get("POOL_RECYCLE", POOL_RECYCLE)),
+        "warm_connections": int(settings.get("POOL_WARMUP", POOL_WARMUP)),
+    }
 
 
 class SynthetixAPI:
@@ -52,15 +101,59 @@ class SynthetixAPI:
     }
 
     def __init__(
-        self, db_config: dict, environment: str = "prod", streamlit: bool = True
+        self,
+        db_config: dict,
+        environment: str = "prod",
+        streamlit: bool = True,
+        statement_timeout: Optional[float] = DEFAULT_STATEMENT_TIMEOUT,
+        pool_size: Optional[int] = None,
+        max_overflow: Optional[int] = None,
+        pool_timeout: Optional[float] = None,
+        pool_recycle: Optional[int] = None,
+        warm_connections: Optional[int] = None,
     ):
         """
         Initialize the SynthetixAPI.
 
         Args:
             environment (str): The environment to query data for ('prod' or 'dev')
+            statement_timeout (float): Default query timeout in seconds, or None
+                for no timeout
+            pool_size (int): Connections kept open in the pool
+            max_overflow (int): Extra connections opened when the pool is busy
+            pool_timeout (float): Seconds to wait for a free connection
+            pool_recycle (int): Seconds before a pooled connection is replaced
+            warm_connections (int): Connections to open in the background at
+                startup
+
+        Pool settings left as None are read by `get_pool_config`.
         """
         self.db_config = get_db_config(streamlit)
+        self.statement_timeout = statement_timeout
+        self._local = threading.local()
+        pool_config = get_pool_config(streamlit)
+        overrides = {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": pool_timeout,
+            "pool_recycle": pool_recycle,
+            "warm_connections": warm_connections,
+        }
+        pool_config.update(
+            {name: value for name, value in overrides.items() if value is not None}
+        )
+        warm_connections = pool_config.pop("warm_connections")
+        self.pool_config = pool_config
+        self._pool_stats = {
+            "checkouts": 0,
+            "connects": 0,
+            "invalidations": 0,
+            "wait_seconds": 0.0,
+            "max_wait": 0.0,
+            "peak_checked_out": 0,
+            "peak_overflow": 0,
+        }
+        self._pool_lock = threading.Lock()
 
         if db_config["env"] is not None:
             self.environment = self.db_config["env"]
@@ -69,11 +162,69 @@ class SynthetixAPI:
 
         self.engine = self._create_engine()
         self.Session = sessionmaker(bind=self.engine)
+        threading.Thread(
+            target=self.warm_pool, args=(warm_connections,), daemon=True
+        ).start()
 
     def _create_engine(self):
         """Create and return a database engine with connection pooling."""
         connection_string = f"postgresql://{self.db_config['user']}:{self.db_config['password']}@{self.db_config['host']}:{self.db_config['port']}/{self.db_config['dbname']}"
-        return sqlalchemy.create_engine(connection_string, pool_size=5, max_overflow=10)
+        engine = sqlalchemy.create_engine(
+            connection_string, pool_pre_ping=True, **self.pool_config
+        )
+        sqlalchemy.event.listen(engine, "connect", self._on_connect)
+        sqlalchemy.event.listen(engine, "invalidate", self._on_invalidate)
+        return engine
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._pool_lock:
+            self._pool_stats["connects"] += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._pool_lock:
+            self._pool_stats["invalidations"] += 1
+
+    def warm_pool(self, connections: int):
+        """
+        Open pooled connections ahead of the first query.
+
+        Connections are held together so each one is a separate session, then
+        returned to the pool. Failures are logged, not raised, so the API can
+        still start while the database is unreachable.
+
+        Args:
+            connections (int): Number of connections to open, at most the pool size
+        """
+        opened = []
+        try:
+            for _ in range(min(connections, self.pool_config["pool_size"])):
+                opened.append(self.engine.connect())
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            logger.warning(f"Could not warm the connection pool: {str(e)}")
+        finally:
+            for connection in opened:
+                connection.close()
+
+    def pool_metrics(self) -> dict:
+        """
+        Return the connection pool's current state and counters.
+
+        Returns:
+            dict: Current `size`, `checked_out`, `checked_in` and `overflow`,
+            plus totals since startup: `checkouts`, `connects` (new database
+            sessions), `invalidations` (connections dropped, including failed
+            pre-pings), `wait_seconds` and `max_wait` spent waiting for a
+            connection, and the peak checked out and overflow counts.
+        """
+        pool = self.engine.pool
+        with self._pool_lock:
+            return {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                **self._pool_stats,
+            }
 
     def __enter__(self):
         return self
@@ -86,24 +237,197 @@ class SynthetixAPI:
         self,
     ) -> Generator[sqlalchemy.engine.base.Connection, None, None]:
         """Context manager for database connections."""
+        start_time = time.perf_counter()
         connection = self.engine.connect()
+        wait = time.perf_counter() - start_time
+
+        pool = self.engine.pool
+        with self._pool_lock:
+            stats = self._pool_stats
+            stats["checkouts"] += 1
+            stats["wait_seconds"] += wait
+            stats["max_wait"] = max(stats["max_wait"], wait)
+            stats["peak_checked_out"] = max(
+                stats["peak_checked_out"], pool.checkedout()
+            )
+            stats["peak_overflow"] = max(stats["peak_overflow"], pool.overflow())
         try:
             yield connection
         finally:
             connection.close()
 
-    def _run_query(self, query: str) -> pd.DataFrame:
+    @contextmanager
+    def timeout(self, seconds: Optional[float]) -> Generator[None, None, None]:
+        """
+        Override the statement timeout for queries run in this thread.
+
+        Args:
+            seconds (float): Timeout in seconds, or None for no timeout
+        """
+        previous = getattr(self._local, "timeout", False)
+        self._local.timeout = seconds
+        try:
+            yield
+        finally:
+            self._local.timeout = previous
+
+    @contextmanager
+    def cancel_when(self, check: Callable[[], bool]) -> Generator[None, None, None]:
+        """
+        Cancel queries run in this thread once `check` returns True.
+
+        The check is polled while each query runs. A cancelled query raises
+        QueryCancelledError.
+
+        Args:
+            check (Callable[[], bool]): Returns True when queries should stop
+        """
+        previous = getattr(self._local, "cancel_check", None)
+        self._local.cancel_check = check
+        try:
+            yield
+        finally:
+            self._local.cancel_check = previous
+
+    @contextmanager
+    def explain(self, on_plan: Callable[[dict], None]) -> Generator[None, None, None]:
+        """
+        Explain every query run in this thread, passing each plan to `on_plan`.
+
+        Queries still return their results. Each one is then run again under
+        `explain_query`, so queries from other threads sharing this API are
+        neither explained nor slowed down.
+
+        Args:
+            on_plan (Callable[[dict], None]): Receives each query's plan
+        """
+        previous = getattr(self._local, "on_plan", None)
+        self._local.on_plan = on_plan
+        try:
+            yield
+        finally:
+            self._local.on_plan = previous
+
+    def _resolve_timeout(self, timeout: Optional[float]) -> Optional[float]:
+        if timeout is not None:
+            return timeout
+        thread_timeout = getattr(self._local, "timeout", False)
+        if thread_timeout is not False:
+            return thread_timeout
+        return self.statement_timeout
+
+    @contextmanager
+    def _watch_cancellation(
+        self, conn: sqlalchemy.engine.base.Connection
+    ) -> Generator[threading.Event, None, None]:
+        """Cancel the connection's running statement when the check fires."""
+        cancelled = threading.Event()
+        check = getattr(self._local, "cancel_check", None)
+        if check is None:
+            yield cancelled
+            return
+
+        done = threading.Event()
+
+        def watch():
+            while not done.wait(CANCEL_POLL_INTERVAL):
+                if check():
+                    cancelled.set()
+                    conn.connection.dbapi_connection.cancel()
+                    return
+
+        watcher = threading.Thread(target=watch, daemon=True)
+        watcher.start()
+        try:
+            yield cancelled
+        finally:
+            done.set()
+            watcher.join()
+
+    def _execute(
+        self,
+        query: str,
+        run: Callable[[sqlalchemy.engine.base.Connection], object],
+        timeout: Optional[float] = None,
+    ):
+        """Call `run` on a connection under the query's timeout and cancel check."""
+        timeout = self._resolve_timeout(timeout)
+        with self._get_connection() as conn:
+            if timeout is not None:
+                # scoped to this transaction, so it does not leak into the pool
+                conn.exec_driver_sql(
+                    f"SET LOCAL statement_timeout = {int(timeout * 1000)}"
+                )
+            with self._watch_cancellation(conn) as cancelled:
+                try:
+                    return run(conn)
+                except sqlalchemy.exc.DBAPIError as e:
+                    if getattr(e.orig, "pgcode", None) != QUERY_CANCELED:
+                        raise
+                    if cancelled.is_set():
+                        raise QueryCancelledError(query) from e
+                    raise QueryTimeoutError(query, timeout) from e
+
+    def _run_query(self, query: str, timeout: Optional[float] = None) -> pd.DataFrame:
         """
         Run a SQL query and return the results as a DataFrame.
 
         Args:
             query (str): The SQL query to run.
+            timeout (float): Statement timeout in seconds for this query,
+                overriding `timeout()` and the default.
 
         Returns:
             pandas.DataFrame: The query results.
+
+        Raises:
+            QueryTimeoutError: The query ran past its statement timeout.
+            QueryCancelledError: The query was cancelled through `cancel_when`.
         """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        df = self._execute(query, lambda conn: pd.read_sql_query(query, conn), timeout)
+
+        on_plan = getattr(self._local, "on_plan", None)
+        if on_plan is not None:
+            on_plan(self.explain_query(query, timeout))
+
+        # tag the frame so downstream caches can key on it cheaply
+        df.attrs["query_key"] = hashlib.sha1(query.encode()).hexdigest()
+        df.attrs["fetched_at"] = time.time()
+        return df
+
+    def explain_query(self, query: str, timeout: Optional[float] = None) -> dict:
+        """
+        Run a SQL query under EXPLAIN ANALYZE and return its plan.
+
+        EXPLAIN ANALYZE executes the query again, so it runs under the same
+        statement timeout and cancel check as `_run_query`.
+
+        Args:
+            query (str): The SQL query to explain.
+            timeout (float): Statement timeout in seconds, overriding
+                `timeout()` and the default.
+
+        Returns:
+            dict: The plan from `EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`, with
+            the node tree under "Plan" and the timings in "Planning Time" and
+            "Execution Time".
+
+        Raises:
+            QueryTimeoutError: The query ran past its statement timeout.
+            QueryCancelledError: The query was cancelled through `cancel_when`.
+        """
+        plan = self._execute(
+            query,
+            lambda conn: conn.exec_driver_sql(
+                f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}"
+            ).scalar(),
+            timeout,
+        )
+
+        # psycopg2 decodes the json column, other drivers return text
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]
 
     # queries
     def get_volume(
@@ -134,8 +458,7 @@ class SynthetixAPI:
         WHERE ts >= '{start_date}' and ts <= '{end_date}'
         ORDER BY ts
         """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        return self._run_query(query)
 
     def get_core_stats(
         self,
@@ -166,8 +489,7 @@ class SynthetixAPI:
         GROUP BY ts, chain
         ORDER BY ts
         """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        return self._run_query(query)
 
     def get_core_stats_by_collateral(
         self,
@@ -211,8 +533,7 @@ class SynthetixAPI:
             ts >= '{start_date}' and ts <= '{end_date}'
         ORDER BY ts
         """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        return self._run_query(query)
 
     def get_core_account_activity(
         self,
@@ -247,8 +568,7 @@ class SynthetixAPI:
         GROUP BY 1, 2, 3
         ORDER BY 1
         """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        return self._run_query(query)
 
     def get_core_nof_stakers(
         self,
@@ -278,8 +598,7 @@ class SynthetixAPI:
         WHERE date >= '{start_date}' and date <= '{end_date}'
         ORDER BY date
         """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        return self._run_query(query)
 
     def get_perps_stats(
         self,
@@ -312,8 +631,7 @@ class SynthetixAPI:
             ts >= '{start_date}' and ts <= '{end_date}'
         ORDER BY ts
         """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        return self._run_query(query)
 
     def get_perps_open_interest(
         self,
@@ -347,8 +665,7 @@ class SynthetixAPI:
         GROUP BY 1, 2
         ORDER BY 2, 1
         """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        return self._run_query(query)
 
     def get_perps_markets_history(
         self,
@@ -382,8 +699,7 @@ class SynthetixAPI:
             ts >= '{start_date}' and ts <= '{end_date}'
         ORDER BY ts
         """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        return self._run_query(query)
 
     def get_perps_account_activity(
         self,
@@ -417,8 +733,7 @@ class SynthetixAPI:
         GROUP BY 1, 2
         ORDER BY 1
         """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        return self._run_query(query)
 
     def get_snx_token_buyback(
         self,
@@ -450,8 +765,7 @@ class SynthetixAPI:
             ts >= '{start_date}' and ts <= '{end_date}'
         ORDER BY ts
         """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        return self._run_query(query)
 
     # V2 queries
     def get_perps_v2_stats(
@@ -485,8 +799,7 @@ class SynthetixAPI:
             ts >= '{start_date}' and ts <= '{end_date}'
         ORDER BY ts
         """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        return self._run_query(query)
 
     def get_perps_v2_open_interest(
         self,
@@ -518,5 +831,4 @@ class SynthetixAPI:
             ts >= '{start_date}' and ts <= '{end_date}'
         ORDER BY ts
         """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        return self._run_query(query)
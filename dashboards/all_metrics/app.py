@@ -1,6 +1,8 @@
 import streamlit as st
 from dashboards.utils.display import sidebar_logo, sidebar_icon
 from api.internal_api import SynthetixAPI, get_db_config
+from dashboards.utils.profiling import profile_page
+from dashboards.utils.cancellation import cancel_on_rerun
 
 st.set_page_config(
     page_title="Synthetix Stats - All",
@@ -41,4 +43,5 @@ pages = {
     "": [all_chains, ethereum, base, arbitrum, optimism, links],
 }
 nav = st.navigation(pages)
-nav.run()
+with profile_page(nav.title), cancel_on_rerun(st.session_state.api):
+    nav.run()
@@ -3,11 +3,14 @@ from datetime import datetime, timedelta
 import streamlit as st
 import pandas as pd
 
-from dashboards.utils.data import export_data
-from dashboards.utils.charts import chart_lines, chart_many_bars
+from dashboards.utils.data import export_data, show_fetch_status
+from dashboards.utils.charts import TOP_N, ChartFrame, chart_lines, chart_many_bars
+from dashboards.utils.cache import COARSER_RESOLUTION, cache_charts, cache_fetch
+from dashboards.utils.scenarios import register_scenarios
 
 
-@st.cache_data(ttl="30m")
+@cache_fetch(ttl="30m", fallback=COARSER_RESOLUTION)
+@register_scenarios({"resolution": ["daily", "hourly"]})
 def fetch_data(start_date, end_date, resolution):
     """
     Fetches data from the database using the API based on the provided filters.
@@ -48,7 +51,7 @@ def fetch_data(start_date, end_date, resolution):
     }
 
 
-@st.cache_data(ttl="30m")
+@cache_charts
 def make_charts(data):
     """
     Creates charts based on the fetched data.
@@ -60,6 +63,7 @@ def make_charts(data):
         dict: A dictionary containing Plotly chart objects.
     """
     df = data["integrator_stats_agg"]
+    df_frame = ChartFrame(df, x_col="ts", color_by="tracking_code")
     return {
         "volume": chart_many_bars(
             df,
@@ -116,28 +120,31 @@ def make_charts(data):
             y_format="#",
         ),
         "cumulative_volume": chart_lines(
-            df,
+            df_frame,
             "ts",
             "cumulative_volume",
             "Cumulative Volume",
-            "tracking_code",
             unified_hover=False,
+            top_n=TOP_N,
+            top_n_by="volume",
         ),
         "cumulative_exchange_fees": chart_lines(
-            df,
+            df_frame,
             "ts",
             "cumulative_exchange_fees",
             "Cumulative Exchange Fees",
-            "tracking_code",
             unified_hover=False,
+            top_n=TOP_N,
+            top_n_by="volume",
         ),
         "cumulative_trades": chart_lines(
-            df,
+            df_frame,
             "ts",
             "cumulative_trades",
             "Cumulative Trades",
-            "tracking_code",
             unified_hover=False,
+            top_n=TOP_N,
+            top_n_by="volume",
         ),
     }
 
@@ -188,6 +195,7 @@ def main():
         end_date=st.session_state.end_date,
         resolution=st.session_state.resolution,
     )
+    show_fetch_status(data)
 
     # Create charts based on fetched data
     charts = make_charts(data)
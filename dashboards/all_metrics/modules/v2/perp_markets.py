@@ -3,11 +3,20 @@ from datetime import datetime, timedelta
 import streamlit as st
 import pandas as pd
 
-from dashboards.utils.data import export_data
+from dashboards.utils.data import export_data, show_fetch_status
 from dashboards.utils.charts import chart_bars, chart_lines, chart_oi
+from dashboards.utils.cache import COARSER_RESOLUTION, cache_charts, cache_fetch
+from dashboards.utils.scenarios import register_scenarios
 
 
-@st.cache_data(ttl="30m")
+@cache_fetch(ttl="30m", fallback=COARSER_RESOLUTION)
+@register_scenarios(
+    {
+        "chain": ["optimism_mainnet"],
+        "market": ["ETH", "BTC"],
+        "resolution": ["daily", "hourly"],
+    }
+)
 def fetch_data(chain, market, start_date, end_date, resolution):
     """
     Fetches data from the database using the API based on the provided filters.
@@ -73,7 +82,7 @@ def fetch_data(chain, market, start_date, end_date, resolution):
     }
 
 
-@st.cache_data(ttl="30m")
+@cache_charts
 def make_charts(data, market):
     """
     Creates charts based on the fetched data.
@@ -208,6 +217,7 @@ def main():
         end_date=st.session_state.end_date,
         resolution=st.session_state.resolution,
     )
+    show_fetch_status(data)
 
     # Add market selector
     markets = data["market_stats"]["market"].unique()
@@ -3,11 +3,14 @@ from datetime import datetime, timedelta
 import streamlit as st
 import pandas as pd
 
-from dashboards.utils.data import export_data
+from dashboards.utils.data import export_data, show_fetch_status
 from dashboards.utils.charts import chart_bars, chart_lines
+from dashboards.utils.cache import COARSER_RESOLUTION, cache_charts, cache_fetch
+from dashboards.utils.scenarios import register_scenarios
 
 
-@st.cache_data(ttl="30m")
+@cache_fetch(ttl="30m", fallback=COARSER_RESOLUTION)
+@register_scenarios({"chain": ["optimism_mainnet"], "resolution": ["daily", "hourly"]})
 def fetch_data(chain, start_date, end_date, resolution):
     """
     Fetches data from the database using the API based on the provided filters.
@@ -51,7 +54,7 @@ def fetch_data(chain, start_date, end_date, resolution):
     }
 
 
-@st.cache_data(ttl="30m")
+@cache_charts
 def make_charts(data, resolution):
     """
     Creates charts based on the fetched data.
@@ -160,6 +163,7 @@ def main():
         end_date=st.session_state.end_date,
         resolution=st.session_state.resolution,
     )
+    show_fetch_status(data)
 
     # Create charts based on fetched data
     charts = make_charts(
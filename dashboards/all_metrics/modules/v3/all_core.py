@@ -2,12 +2,15 @@ from datetime import datetime, timedelta
 
 import streamlit as st
 
-from dashboards.utils.data import export_data
+from dashboards.utils.data import export_data, show_fetch_status
 from dashboards.utils.charts import chart_area, chart_lines
 from dashboards.utils.date_utils import get_start_date
+from dashboards.utils.cache import cache_charts, cache_fetch
+from dashboards.utils.scenarios import register_scenarios
 
 
-@st.cache_data(ttl="30m")
+@cache_fetch(ttl="30m")
+@register_scenarios({"resolution": ["28d", "7d", "24h"]})
 def fetch_data(start_date, end_date, resolution):
     api = st.session_state.api
 
@@ -144,7 +147,7 @@ def fetch_data(start_date, end_date, resolution):
     }
 
 
-@st.cache_data(ttl="30m")
+@cache_charts
 def make_charts(data):
     return {
         "tvl_collateral": chart_area(
@@ -227,6 +230,7 @@ def main():
         st.session_state.end_date,
         st.session_state.resolution,
     )
+    show_fetch_status(data)
 
     ## charts
     charts = make_charts(data)
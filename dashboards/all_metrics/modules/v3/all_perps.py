@@ -2,11 +2,14 @@ from datetime import datetime, timedelta
 
 import streamlit as st
 
-from dashboards.utils.data import export_data
+from dashboards.utils.data import export_data, show_fetch_status
 from dashboards.utils.charts import chart_bars
+from dashboards.utils.cache import COARSER_RESOLUTION, cache_charts, cache_fetch
+from dashboards.utils.scenarios import register_scenarios
 
 
-@st.cache_data(ttl="30m")
+@cache_fetch(ttl="30m", fallback=COARSER_RESOLUTION)
+@register_scenarios({"resolution": ["daily", "hourly"]})
 def fetch_data(start_date, end_date, resolution):
     api = st.session_state.api
 
@@ -59,7 +62,7 @@ def fetch_data(start_date, end_date, resolution):
     }
 
 
-@st.cache_data(ttl="30m")
+@cache_charts
 def make_charts(data):
     return {
         "volume": chart_bars(
@@ -130,6 +133,7 @@ def main():
         st.session_state.end_date,
         st.session_state.resolution,
     )
+    show_fetch_status(data)
 
     ## charts
     charts = make_charts(data)
@@ -3,12 +3,18 @@ from datetime import datetime, timedelta
 import streamlit as st
 import pandas as pd
 
-from dashboards.utils.data import export_data
+from dashboards.utils.data import export_data, show_fetch_status
 from dashboards.utils.charts import chart_bars, chart_lines
 from dashboards.utils.date_utils import get_start_date
+from dashboards.utils.cache import cache_charts, cache_fetch
+from dashboards.utils.scenarios import register_scenarios
+from dashboards.key_metrics.constants import SUPPORTED_CHAINS_CORE
 
 
-@st.cache_data(ttl="30m")
+@cache_fetch(ttl="30m")
+@register_scenarios(
+    {"chain": list(SUPPORTED_CHAINS_CORE), "resolution": ["28d", "7d", "24h"]}
+)
 def fetch_data(chain, start_date, end_date, resolution):
     """
     Fetches data from the database using the API based on the provided filters.
@@ -86,7 +92,7 @@ def fetch_data(chain, start_date, end_date, resolution):
     }
 
 
-@st.cache_data(ttl="30m")
+@cache_charts
 def make_charts(data, resolution):
     """
     Creates charts based on the fetched data.
@@ -226,6 +232,7 @@ def main():
         end_date=st.session_state.end_date,
         resolution=st.session_state.resolution,
     )
+    show_fetch_status(data)
 
     # Create charts based on fetched data
     charts = make_charts(
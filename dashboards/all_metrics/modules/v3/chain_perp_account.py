@@ -3,11 +3,15 @@ from datetime import datetime, timedelta
 import streamlit as st
 import pandas as pd
 
-from dashboards.utils.data import export_data
+from dashboards.utils.data import export_data, show_fetch_status
 from dashboards.utils.charts import chart_bars, chart_lines
+from dashboards.utils.cache import cache_charts, cache_fetch
+from dashboards.utils.scenarios import register_scenarios
+from dashboards.key_metrics.constants import SUPPORTED_CHAINS_PERPS
 
 
-@st.cache_data(ttl="30m")
+@cache_fetch(ttl="30m")
+@register_scenarios({"chain": list(SUPPORTED_CHAINS_PERPS), "account_id": [None]})
 def fetch_data(chain, account_id, start_date, end_date):
     """
     Fetches data from the database using the API based on the provided filters.
@@ -140,7 +144,7 @@ def fetch_data(chain, account_id, start_date, end_date):
     }
 
 
-@st.cache_data(ttl="30m")
+@cache_charts
 def make_charts(data):
     return {
         "cumulative_volume": chart_lines(
@@ -230,6 +234,7 @@ def main():
         start_date=st.session_state.start_date,
         end_date=st.session_state.end_date,
     )
+    show_fetch_status(data)
 
     # Process data for open positions
     df_open_positions = (
@@ -3,12 +3,18 @@ from datetime import datetime, timedelta
 import streamlit as st
 import pandas as pd
 
-from dashboards.utils.data import export_data
-from dashboards.utils.charts import chart_bars, chart_lines
+from dashboards.utils.data import export_data, show_fetch_status
+from dashboards.utils.charts import TOP_N, ChartFrame, chart_bars, chart_lines
 from dashboards.utils.date_utils import get_start_date
+from dashboards.utils.cache import COARSER_RESOLUTION, cache_charts, cache_fetch
+from dashboards.utils.scenarios import register_scenarios
+from dashboards.key_metrics.constants import SUPPORTED_CHAINS_PERPS
 
 
-@st.cache_data(ttl="30m")
+@cache_fetch(ttl="30m", fallback=COARSER_RESOLUTION)
+@register_scenarios(
+    {"chain": list(SUPPORTED_CHAINS_PERPS), "resolution": ["daily", "hourly"]}
+)
 def fetch_data(chain, start_date, end_date, resolution):
     """
     Fetches data from the database using the API based on the provided filters.
@@ -52,7 +58,7 @@ def fetch_data(chain, start_date, end_date, resolution):
     }
 
 
-@st.cache_data(ttl="30m")
+@cache_charts
 def make_charts(data):
     """
     Creates charts based on the fetched data.
@@ -63,74 +69,85 @@ def make_charts(data):
     Returns:
         dict: A dictionary containing Plotly chart objects.
     """
+    df = ChartFrame(data["stats"], x_col="ts", color_by="tracking_code")
+
     return {
         "accounts": chart_bars(
-            df=data["stats"],
+            df=df,
             x_col="ts",
             y_cols="accounts",
             title="Accounts",
-            color_by="tracking_code",
+            top_n=TOP_N,
+            top_n_by="volume",
             y_format="#",
         ),
         "volume": chart_bars(
-            df=data["stats"],
+            df=df,
             x_col="ts",
             y_cols="volume",
             title="Volume",
-            color_by="tracking_code",
+            top_n=TOP_N,
+            top_n_by="volume",
         ),
         "volume_pct": chart_bars(
-            df=data["stats"],
+            df=df,
             x_col="ts",
             y_cols="volume_share",
             title="Volume %",
-            color_by="tracking_code",
+            top_n=TOP_N,
+            top_n_by="volume",
             y_format="%",
         ),
         "trades": chart_bars(
-            df=data["stats"],
+            df=df,
             x_col="ts",
             y_cols="trades",
             title="Trades",
-            color_by="tracking_code",
+            top_n=TOP_N,
+            top_n_by="volume",
             y_format="#",
         ),
         "trades_pct": chart_bars(
-            df=data["stats"],
+            df=df,
             x_col="ts",
             y_cols="trades_share",
             title="Trades %",
-            color_by="tracking_code",
+            top_n=TOP_N,
+            top_n_by="volume",
             y_format="%",
         ),
         "exchange_fees": chart_bars(
-            df=data["stats"],
+            df=df,
             x_col="ts",
             y_cols="exchange_fees",
             title="Exchange Fees",
-            color_by="tracking_code",
+            top_n=TOP_N,
+            top_n_by="volume",
         ),
         "exchange_fees_pct": chart_bars(
-            df=data["stats"],
+            df=df,
             x_col="ts",
             y_cols="exchange_fees_share",
             title="Exchange Fees %",
-            color_by="tracking_code",
+            top_n=TOP_N,
+            top_n_by="volume",
             y_format="%",
         ),
         "referral_fees": chart_bars(
-            df=data["stats"],
+            df=df,
             x_col="ts",
             y_cols="referral_fees",
             title="Referral Fees",
-            color_by="tracking_code",
+            top_n=TOP_N,
+            top_n_by="volume",
         ),
         "referral_fees_pct": chart_bars(
-            df=data["stats"],
+            df=df,
             x_col="ts",
             y_cols="referral_fees_share",
             title="Referral Fees %",
-            color_by="tracking_code",
+            top_n=TOP_N,
+            top_n_by="volume",
             y_format="%",
         ),
     }
@@ -192,6 +209,7 @@ def main():
         end_date=st.session_state.end_date,
         resolution=st.session_state.resolution,
     )
+    show_fetch_status(data)
 
     # Create charts based on fetched data
     charts = make_charts(data)
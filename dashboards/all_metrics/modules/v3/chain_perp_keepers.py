@@ -3,11 +3,17 @@ from datetime import datetime, timedelta
 import streamlit as st
 import pandas as pd
 
-from dashboards.utils.data import export_data
-from dashboards.utils.charts import chart_bars
+from dashboards.utils.data import export_data, show_fetch_status
+from dashboards.utils.charts import TOP_N, ChartFrame, chart_bars
+from dashboards.utils.cache import COARSER_RESOLUTION, cache_charts, cache_fetch
+from dashboards.utils.scenarios import register_scenarios
+from dashboards.key_metrics.constants import SUPPORTED_CHAINS_PERPS
 
 
-@st.cache_data(ttl="30m")
+@cache_fetch(ttl="30m", fallback=COARSER_RESOLUTION)
+@register_scenarios(
+    {"chain": list(SUPPORTED_CHAINS_PERPS), "resolution": ["daily", "hourly"]}
+)
 def fetch_data(chain, start_date, end_date, resolution):
     """
     Fetches data from the database using the API based on the provided filters.
@@ -46,7 +52,7 @@ def fetch_data(chain, start_date, end_date, resolution):
     }
 
 
-@st.cache_data(ttl="30m")
+@cache_charts
 def make_charts(data):
     """
     Creates charts based on the fetched data.
@@ -57,7 +63,7 @@ def make_charts(data):
     Returns:
         dict: A dictionary containing Plotly chart objects.
     """
-    df = data["keeper"]
+    df = ChartFrame(data["keeper"], x_col="ts", color_by="keeper")
 
     return {
         "trades": chart_bars(
@@ -65,7 +71,8 @@ def make_charts(data):
             x_col="ts",
             y_cols="trades",
             title="Orders Settled",
-            color_by="keeper",
+            top_n=TOP_N,
+            top_n_by="amount_settled",
             y_format="#",
             unified_hover=False,
         ),
@@ -74,7 +81,8 @@ def make_charts(data):
             x_col="ts",
             y_cols="trades_pct",
             title="Orders Settled %",
-            color_by="keeper",
+            top_n=TOP_N,
+            top_n_by="amount_settled",
             y_format="%",
             unified_hover=False,
         ),
@@ -83,7 +91,8 @@ def make_charts(data):
             x_col="ts",
             y_cols="amount_settled",
             title="Notional Size Settled",
-            color_by="keeper",
+            top_n=TOP_N,
+            top_n_by="amount_settled",
             unified_hover=False,
         ),
         "amount_settled_pct": chart_bars(
@@ -91,7 +100,8 @@ def make_charts(data):
             x_col="ts",
             y_cols="amount_settled_pct",
             title="Notional Size Settled %",
-            color_by="keeper",
+            top_n=TOP_N,
+            top_n_by="amount_settled",
             y_format="%",
             unified_hover=False,
         ),
@@ -100,7 +110,8 @@ def make_charts(data):
             x_col="ts",
             y_cols="settlement_rewards",
             title="Settlement Rewards",
-            color_by="keeper",
+            top_n=TOP_N,
+            top_n_by="amount_settled",
             unified_hover=False,
         ),
         "settlement_rewards_pct": chart_bars(
@@ -108,7 +119,8 @@ def make_charts(data):
             x_col="ts",
             y_cols="settlement_rewards_pct",
             title="Settlement Rewards %",
-            color_by="keeper",
+            top_n=TOP_N,
+            top_n_by="amount_settled",
             y_format="%",
             unified_hover=False,
         ),
@@ -166,6 +178,7 @@ def main():
         end_date=st.session_state.end_date,
         resolution=st.session_state.resolution,
     )
+    show_fetch_status(data)
 
     # Create charts based on fetched data
     charts = make_charts(data)
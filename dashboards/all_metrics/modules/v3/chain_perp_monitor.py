@@ -3,11 +3,22 @@ from datetime import datetime, timedelta
 import streamlit as st
 import pandas as pd
 
-from dashboards.utils.data import export_data
-from dashboards.utils.charts import chart_bars, chart_lines, chart_many_bars
-
-
-@st.cache_data(ttl="30m")
+from dashboards.utils.data import export_data, show_fetch_status
+from dashboards.utils.charts import (
+    ChartFrame,
+    chart_bars,
+    chart_lines,
+    chart_many_bars,
+)
+from dashboards.utils.cache import COARSER_RESOLUTION, cache_charts, cache_fetch
+from dashboards.utils.scenarios import register_scenarios
+from dashboards.key_metrics.constants import SUPPORTED_CHAINS_PERPS
+
+
+@cache_fetch(ttl="30m", fallback=COARSER_RESOLUTION)
+@register_scenarios(
+    {"chain": list(SUPPORTED_CHAINS_PERPS), "resolution": ["daily", "hourly"]}
+)
 def fetch_data(chain, start_date, end_date, resolution):
     """
     Fetches data from the database using the API based on the provided filters.
@@ -129,7 +140,7 @@ def fetch_data(chain, start_date, end_date, resolution):
     }
 
 
-@st.cache_data(ttl="30m")
+@cache_charts
 def make_charts(data):
     """
     Creates charts based on the fetched data.
@@ -140,38 +151,36 @@ def make_charts(data):
     Returns:
         dict: A dictionary containing Plotly chart objects.
     """
+    df_market = ChartFrame(data["market"], x_col="ts", color_by="market_symbol")
+
     return {
         "volume": chart_bars(
-            data["market"],
+            df_market,
             "ts",
             "volume",
             "Volume",
-            "market_symbol",
             unified_hover=False,
         ),
         "exchange_fees": chart_bars(
-            data["market"],
+            df_market,
             "ts",
             "exchange_fees",
             "Exchange Fees",
-            "market_symbol",
             unified_hover=False,
         ),
         "trades": chart_bars(
-            data["market"],
+            df_market,
             "ts",
             "trades",
             "Trades",
-            "market_symbol",
             unified_hover=False,
             y_format="#",
         ),
         "position_liquidations": chart_bars(
-            data["market"],
+            df_market,
             "ts",
             "liquidations",
             "Position Liquidations",
-            "market_symbol",
             y_format="#",
             unified_hover=False,
         ),
@@ -258,6 +267,7 @@ def main():
         end_date=st.session_state.end_date,
         resolution=st.session_state.resolution,
     )
+    show_fetch_status(data)
 
     ## make the charts
     charts = make_charts(data)
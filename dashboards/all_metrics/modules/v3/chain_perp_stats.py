@@ -3,11 +3,17 @@ from datetime import datetime, timedelta
 import streamlit as st
 import pandas as pd
 
-from dashboards.utils.data import export_data
+from dashboards.utils.data import export_data, show_fetch_status
 from dashboards.utils.charts import chart_bars, chart_lines
+from dashboards.utils.cache import COARSER_RESOLUTION, cache_charts, cache_fetch
+from dashboards.utils.scenarios import register_scenarios
+from dashboards.key_metrics.constants import SUPPORTED_CHAINS_PERPS
 
 
-@st.cache_data(ttl="30m")
+@cache_fetch(ttl="30m", fallback=COARSER_RESOLUTION)
+@register_scenarios(
+    {"chain": list(SUPPORTED_CHAINS_PERPS), "resolution": ["daily", "hourly"]}
+)
 def fetch_data(chain, start_date, end_date, resolution):
     api = st.session_state.api
 
@@ -51,7 +57,7 @@ def fetch_data(chain, start_date, end_date, resolution):
         WHERE ts >= '{start_date}' and ts <= '{end_date}'
         """
         )
-        if st.session_state.chain.startswith("base")
+        if chain.startswith("base")
         else pd.DataFrame()
     )
 
@@ -62,7 +68,7 @@ def fetch_data(chain, start_date, end_date, resolution):
     }
 
 
-@st.cache_data(ttl="30m")
+@cache_charts
 def make_charts(data):
     return {
         "volume": chart_bars(
@@ -193,6 +199,7 @@ def main():
         end_date=st.session_state.end_date,
         resolution=st.session_state.resolution,
     )
+    show_fetch_status(data)
 
     ## make the charts
     charts = make_charts(data)
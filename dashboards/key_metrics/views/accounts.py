@@ -4,7 +4,9 @@ import streamlit as st
 import pandas as pd
 
 from dashboards.utils.charts import chart_bars, chart_lines
+from dashboards.utils.data import show_fetch_status
 from dashboards.utils.date_utils import get_start_date
+from dashboards.utils.cache import cache_fetch
 from dashboards.key_metrics.constants import (
     SUPPORTED_CHAINS_CORE,
     SUPPORTED_CHAINS_PERPS,
@@ -21,7 +23,7 @@ st.query_params.chain = st.session_state.chain
 st.query_params.date_range = st.session_state.date_range
 
 
-@st.cache_data(ttl="30m")
+@cache_fetch(ttl="30m")
 def fetch_data(date_range, chain):
     end_date = datetime.now()
     start_date = get_start_date(date_range)
@@ -114,6 +116,7 @@ def fetch_data(date_range, chain):
 
 
 data = fetch_data(st.session_state.date_range, st.session_state.chain)
+show_fetch_status(data)
 
 filter_col1, filter_col2 = st.columns(2)
 
@@ -4,7 +4,9 @@ import streamlit as st
 import pandas as pd
 
 from dashboards.utils.charts import chart_area, chart_bars
+from dashboards.utils.data import show_fetch_status
 from dashboards.utils.date_utils import get_start_date
+from dashboards.utils.cache import cache_fetch
 
 st.markdown("# SNX Token")
 
@@ -16,7 +18,7 @@ if "date_range" not in st.session_state:
 st.query_params.date_range = st.session_state.date_range
 
 
-@st.cache_data(ttl="30m")
+@cache_fetch(ttl="30m")
 def fetch_data(date_range):
     end_date = datetime.now()
     start_date = get_start_date(date_range)
@@ -41,6 +43,7 @@ def fetch_data(date_range):
 
 
 data = fetch_data(st.session_state.date_range)
+show_fetch_status(data)
 
 st.radio(
     "Select date range",
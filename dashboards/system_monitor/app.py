@@ -2,6 +2,9 @@ import os
 from dotenv import load_dotenv
 import streamlit as st
 from api.internal_api import SynthetixAPI, get_db_config
+from dashboards.utils.profiling import profile_page
+from dashboards.utils.cancellation import cancel_on_rerun
+from dashboards.system_monitor.modules.settings import warm_snx
 
 load_dotenv()
 
@@ -33,12 +36,18 @@ st.session_state.api = load_api()
 
 # pages
 core = st.Page("views/core.py", title="Core System")
+overview = st.Page("views/overview.py", title="All Networks")
 perps = st.Page("views/perps.py", title="Perps Markets")
 performance = st.Page("views/performance.py", title="Query Performance")
+memory = st.Page("views/memory.py", title="Cache Memory")
 
 # navigation
 pages = {
-    "": [core, perps, performance],
+    "": [core, perps, overview, performance, memory],
 }
 nav = st.navigation(pages)
-nav.run()
+with profile_page(nav.title), cancel_on_rerun(st.session_state.api):
+    nav.run()
+
+# build the other networks' clients once the first page is drawn
+warm_snx()
@@ -0,0 +1,95 @@
+import os
+import pickle
+import logging
+from importlib.metadata import version
+from threading import Lock
+from typing import Dict
+
+import synthetix.synthetix
+from synthetix.contracts import contracts as synthetix_contracts
+
+logger = logging.getLogger(__name__)
+
+# constants
+CONTRACT_CACHE_DIR_ENV = "CONTRACT_CACHE_DIR"
+CONTRACT_CACHE_DIR = "contract_cache"
+
+# network id -> contract name -> {"address", "abi"}, as read from disk
+_trees: Dict[int, dict] = {}
+_lock = Lock()
+
+
+def cache_path(network_id: int) -> str:
+    """Return the cache file of a network for the installed synthetix version."""
+    directory = os.environ.get(CONTRACT_CACHE_DIR_ENV, CONTRACT_CACHE_DIR)
+    return os.path.join(directory, f"{network_id}-{version('synthetix')}.pkl")
+
+
+def _strip(contracts: dict) -> dict:
+    # keep addresses and abis, which can be pickled, and drop the web3 objects
+    return {
+        name: (
+            {"address": entry["address"], "abi": entry["abi"]}
+            if "abi" in entry
+            else _strip(entry)
+        )
+        for name, entry in contracts.items()
+    }
+
+
+def _build(snx, tree: dict) -> dict:
+    return {
+        name: (
+            {
+                **entry,
+                "contract": snx.web3.eth.contract(
+                    address=entry["address"], abi=entry["abi"]
+                ),
+            }
+            if "abi" in entry
+            else _build(snx, entry)
+        )
+        for name, entry in tree.items()
+    }
+
+
+def load_contract_tree(snx) -> dict:
+    """
+    Return the deployed addresses and ABIs of a network.
+
+    The deployment files shipped with synthetix are parsed once and written
+    to a single pickle per network and package version, which later
+    processes read instead of the individual JSON files.
+    """
+    with _lock:
+        if snx.network_id in _trees:
+            return _trees[snx.network_id]
+
+        path = cache_path(snx.network_id)
+        try:
+            with open(path, "rb") as f:
+                tree = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            tree = _strip(synthetix_contracts.load_local_contracts(snx))
+            try:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                with open(f"{path}.tmp", "wb") as f:
+                    pickle.dump(tree, f)
+                os.replace(f"{path}.tmp", path)
+            except OSError as e:
+                logger.warning(f"Could not write contract cache {path}: {str(e)}")
+
+        _trees[snx.network_id] = tree
+        return tree
+
+
+def load_contracts(snx) -> dict:
+    """Load a client's contracts from the cache, or from cannon when configured."""
+    if snx.cannon_config is not None:
+        return synthetix_contracts.load_contracts(snx)
+    return _build(snx, load_contract_tree(snx))
+
+
+def use_contract_cache():
+    """Make new Synthetix clients load their contracts through this cache."""
+    synthetix.synthetix.load_contracts = load_contracts
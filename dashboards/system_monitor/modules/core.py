@@ -0,0 +1,297 @@
+import pandas as pd
+from synthetix.utils import wei_to_ether
+from eth_utils import encode_hex
+
+from dashboards.system_monitor.modules.markets import discover_markets
+from dashboards.system_monitor.modules.snapshot import pinned_multicall
+from dashboards.system_monitor.modules.token_metadata import (
+    get_token_metadata,
+    token_description,
+)
+
+
+def get_configs(snx):
+    raw_configs = snx.core.core_proxy.functions.getCollateralConfigurations(
+        False
+    ).call()
+
+    # token metadata never changes, so it is fetched once and cached locally
+    metadata = get_token_metadata(snx, [config[5] for config in raw_configs])
+
+    configs = {}
+    for config in raw_configs:
+        (
+            enabled,
+            issuance_ratio,
+            liquidation_ratio,
+            liquidation_reward,
+            oracle_node_id,
+            token_address,
+            min_delegation,
+        ) = config
+
+        configs[token_address] = {
+            "token": token_description(metadata[token_address]),
+            "enabled": enabled,
+            "min_delegation": wei_to_ether(min_delegation),
+            "issuance_ratio": wei_to_ether(issuance_ratio),
+            "liquidation_ratio": wei_to_ether(liquidation_ratio),
+            "liquidation_reward": wei_to_ether(liquidation_reward),
+            "token_address": token_address,
+            "oracle_node_id": encode_hex(oracle_node_id),
+        }
+
+    # create a dataframe and clean it
+    df = pd.DataFrame.from_dict(configs, orient="index")
+
+    # replace all values over 1e59 with "Infinity"
+    float_cols = df.select_dtypes("float").columns
+    df[float_cols] = (
+        df[float_cols].astype(object).mask(df[float_cols] > 1e59, "Infinity")
+    )
+
+    # change some types to percentages
+    df["issuance_ratio"] = df["issuance_ratio"].astype(float).map("{:.2%}".format)
+    df["liquidation_ratio"] = df["liquidation_ratio"].astype(float).map("{:.2%}".format)
+    return df
+
+
+def to_ether(value):
+    # calls isolated as failing by the multicall come back as None
+    return wei_to_ether(value) if value is not None else None
+
+
+def get_oracle_calls(snx):
+    # get the price updates perps markets need, if perps are deployed
+    if "markets_by_id" in dir(snx.perps):
+        calls, _ = snx.perps._prepare_oracle_call()
+    else:
+        calls = []
+    return calls
+
+
+def vault_requests(snx, collaterals):
+    function_inputs = [(1, collateral) for collateral in collaterals]
+    return [
+        (snx.core.core_proxy, function_name, function_inputs)
+        for function_name in [
+            "getVaultCollateral",
+            "isVaultLiquidatable",
+            "getVaultCollateralRatio",
+            "getVaultDebt",
+        ]
+    ]
+
+
+def build_vaults(configs, collaterals, results):
+    (
+        collateral_calls,
+        is_vault_liquidatables,
+        vault_collateral_ratios,
+        vault_debts,
+    ) = results
+
+    collateral_results = {
+        collateral: {
+            "token": configs.loc[collateral, "token"],
+            "collateral_amount": to_ether(result[0]),
+            "collateral_value": to_ether(result[1]),
+            "vault_debt": to_ether(vault_debt),
+            "vault_collateral_ratio": to_ether(vault_collateral_ratio),
+            "is_vault_liquidatable": is_vault_liquidatable,
+        }
+        for collateral, result, is_vault_liquidatable, vault_debt, vault_collateral_ratio in zip(
+            collaterals,
+            [result or (None, None) for result in collateral_calls],
+            is_vault_liquidatables,
+            vault_debts,
+            vault_collateral_ratios,
+        )
+    }
+    df = pd.DataFrame.from_dict(collateral_results, orient="index")
+    return df
+
+
+def get_market_type(snx, market_address):
+    # get the type of perps market that is enabled
+    perps_type = str(type(snx.perps))
+    perps_type = perps_type.split(".")[-1][:-2]
+
+    if (
+        "market_proxy" in dir(snx.perps)
+        and market_address == snx.perps.market_proxy.address
+    ):
+        return perps_type
+    elif (
+        "market_proxy" in dir(snx.spot)
+        and market_address == snx.spot.market_proxy.address
+    ):
+        return "Spot"
+    else:
+        return "Unknown"
+
+
+def get_markets(snx, block):
+    # only markets registered since the last refresh are looked up
+    market_addresses = discover_markets(snx, block=block)
+    markets = {
+        market_id: {
+            "market_id": market_id,
+            "market_address": address,
+            "market_type": get_market_type(snx, address),
+        }
+        for market_id, address in market_addresses.items()
+    }
+
+    # filter perps and spot
+    perps = pd.DataFrame.from_dict(
+        {
+            market_id: market
+            for market_id, market in markets.items()
+            if market["market_type"] in ["PerpsV3", "BfPerps"]
+        },
+        orient="index",
+    )
+    spot = pd.DataFrame.from_dict(
+        {
+            market_id: market
+            for market_id, market in markets.items()
+            if market["market_type"] == "Spot"
+        },
+        orient="index",
+    )
+    return perps, spot
+
+
+def market_requests(snx, markets, contract):
+    market_ids = [(market_id,) for market_id in markets["market_id"].tolist()]
+    return [(contract, "name", market_ids)] + [
+        (snx.core.core_proxy, function_name, market_ids)
+        for function_name in [
+            "isMarketCapacityLocked",
+            "getWithdrawableMarketUsd",
+            "getMarketReportedDebt",
+            "getMarketTotalDebt",
+        ]
+    ]
+
+
+def build_market_details(markets, results):
+    (
+        market_names,
+        is_capacity_lockeds,
+        withdrawable_margin_usds,
+        market_reported_debts,
+        market_total_debts,
+    ) = results
+
+    # make a copy and add data
+    market_details = markets.copy()
+    market_details["market_name"] = market_names
+    market_details["is_capacity_locked"] = is_capacity_lockeds
+    market_details["withdrawable_margin_usd"] = [
+        to_ether(withdrawable_margin_usd)
+        for withdrawable_margin_usd in withdrawable_margin_usds
+    ]
+    market_details["market_reported_debt"] = [
+        to_ether(market_reported_debt) for market_reported_debt in market_reported_debts
+    ]
+    market_details["market_total_debt"] = [
+        to_ether(market_total_debts) for market_total_debts in market_total_debts
+    ]
+    return market_details
+
+
+def get_market_collaterals(configs, markets):
+    return [
+        (market_id, collateral)
+        for market_id in markets["market_id"]
+        for collateral in configs["token_address"]
+    ]
+
+
+def market_collateral_requests(snx, market_collaterals):
+    return [
+        (snx.core.core_proxy, function_name, market_collaterals)
+        for function_name in ["getMaximumMarketCollateral", "getMarketCollateralAmount"]
+    ]
+
+
+def build_market_collateral_details(configs, markets, market_collaterals, results):
+    max_collaterals, collateral_amounts = results
+
+    # create the dataframe and filter
+    market_details = pd.DataFrame.from_dict(
+        {
+            market_collateral: {
+                "market_id": market_collateral[0],
+                "market_name": markets.loc[market_collateral[0], "market_name"],
+                "collateral_name": configs.loc[market_collateral[1], "token"],
+                "collateral_amount": to_ether(collateral_amount),
+                "max_collateral": to_ether(max_collateral),
+                "cap_used": (
+                    wei_to_ether(collateral_amount) / wei_to_ether(max_collateral)
+                    if collateral_amount is not None and (max_collateral or 0) > 0
+                    else 0
+                ),
+            }
+            for market_collateral, max_collateral, collateral_amount in zip(
+                market_collaterals,
+                max_collaterals,
+                collateral_amounts,
+            )
+        },
+        orient="index",
+    )
+    market_details = market_details[market_details["max_collateral"] > 0]
+
+    # change some types to percentages
+    market_details["cap_used"] = market_details["cap_used"].map("{:.2%}".format)
+    return market_details
+
+
+def get_snapshot(snx, configs, block):
+    """
+    Read the vaults and markets of a network at one block.
+
+    The vault, market and market collateral calls are merged into a single
+    multicall pinned to `block`, so collateral, debt and ratios are consistent
+    with each other.
+    """
+    collaterals = configs.index.tolist()
+    perps, spot = get_markets(snx, block)
+
+    # build one request list, remembering which slice belongs to what
+    requests = {"vaults": vault_requests(snx, collaterals)}
+    markets = {"perps": perps, "spot": spot}
+    contracts = {"perps": snx.perps, "spot": snx.spot}
+    market_collaterals = {}
+    for name, df in markets.items():
+        if df.shape[0] > 0:
+            market_collaterals[name] = get_market_collaterals(configs, df)
+            requests[name] = market_requests(snx, df, contracts[name].market_proxy)
+            requests[f"{name}_collateral"] = market_collateral_requests(
+                snx, market_collaterals[name]
+            )
+
+    flat_requests = [request for group in requests.values() for request in group]
+    flat_results = pinned_multicall(
+        snx, flat_requests, block, calls=get_oracle_calls(snx)
+    )
+    results, offset = {}, 0
+    for name, group in requests.items():
+        results[name] = flat_results[offset : offset + len(group)]
+        offset += len(group)
+
+    snapshot = {
+        "block": block,
+        "vaults": build_vaults(configs, collaterals, results["vaults"]),
+    }
+    for name, df in markets.items():
+        if df.shape[0] > 0:
+            df = build_market_details(df, results[name])
+            snapshot[f"{name}_collateral"] = build_market_collateral_details(
+                configs, df, market_collaterals[name], results[f"{name}_collateral"]
+            )
+        snapshot[name] = df
+    return snapshot
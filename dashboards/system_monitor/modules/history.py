@@ -0,0 +1,190 @@
+import os
+import time
+import sqlite3
+from contextlib import closing
+from typing import Dict, Optional
+
+import pandas as pd
+
+# constants
+MONITOR_HISTORY_DB_ENV = "MONITOR_HISTORY_DB"
+MONITOR_HISTORY_DB = "monitor_history.db"
+MAX_SNAPSHOT_AGE = 600
+HISTORY_RETENTION = 30 * 24 * 60 * 60
+
+
+def history_path() -> str:
+    return os.environ.get(MONITOR_HISTORY_DB_ENV, MONITOR_HISTORY_DB)
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS snapshots (
+            snapshot_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            network_id INTEGER,
+            block INTEGER,
+            polled_at REAL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS snapshots_network_polled_at
+        ON snapshots (network_id, polled_at)
+        """
+    )
+    return conn
+
+
+def _storable(df: pd.DataFrame) -> pd.DataFrame:
+    # sqlite only stores scalars, so containers and raw bytes are kept as text
+    df = df.rename_axis("key").reset_index()
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].map(
+            lambda x: (
+                x.hex()
+                if isinstance(x, bytes)
+                else str(x) if isinstance(x, (dict, list, tuple)) else x
+            )
+        )
+    return df
+
+
+def _tables(conn: sqlite3.Connection) -> list:
+    # every table other than snapshots and sqlite's own holds one frame
+    return [
+        row[0]
+        for row in conn.execute(
+            """
+            SELECT name FROM sqlite_master
+            WHERE type = 'table' AND name != 'snapshots' AND name NOT LIKE 'sqlite_%'
+            """
+        )
+    ]
+
+
+def _append(conn: sqlite3.Connection, name: str, df: pd.DataFrame):
+    # add any columns the frame gained since the table was created
+    if name in _tables(conn):
+        columns = [row[1] for row in conn.execute(f'PRAGMA table_info("{name}")')]
+        for col in df.columns:
+            if col not in columns:
+                conn.execute(f'ALTER TABLE "{name}" ADD COLUMN "{col}"')
+    df.to_sql(name, conn, if_exists="append", index=False)
+    conn.execute(
+        f'CREATE INDEX IF NOT EXISTS "{name}_snapshot_id" ON "{name}" (snapshot_id)'
+    )
+
+
+def save_snapshot(
+    network_id: int,
+    block: int,
+    frames: Dict[str, pd.DataFrame],
+    path: Optional[str] = None,
+) -> int:
+    """
+    Append one network's monitor frames to the history store.
+
+    Each frame goes to a table of the same name, tagged with the snapshot
+    id. Returns the new snapshot id.
+    """
+    with closing(_connect(path or history_path())) as conn, conn:
+        cursor = conn.execute(
+            "INSERT INTO snapshots (network_id, block, polled_at) VALUES (?, ?, ?)",
+            (network_id, block, time.time()),
+        )
+        snapshot_id = cursor.lastrowid
+        for name, df in frames.items():
+            if df.shape[0] > 0:
+                _append(conn, name, _storable(df).assign(snapshot_id=snapshot_id))
+    return snapshot_id
+
+
+def latest_snapshot(network_id: int, path: Optional[str] = None) -> Optional[dict]:
+    """
+    Return the most recent snapshot of a network, or None if there is none.
+
+    The snapshot has its `block`, `polled_at` time and the stored `frames`,
+    indexed as they were when saved.
+    """
+    with closing(_connect(path or history_path())) as conn:
+        row = conn.execute(
+            """
+            SELECT snapshot_id, block, polled_at FROM snapshots
+            WHERE network_id = ? ORDER BY snapshot_id DESC LIMIT 1
+            """,
+            (network_id,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        snapshot_id, block, polled_at = row
+        frames = {}
+        for name in _tables(conn):
+            df = pd.read_sql_query(
+                f'SELECT * FROM "{name}" WHERE snapshot_id = ?',
+                conn,
+                params=(snapshot_id,),
+            )
+            frames[name] = (
+                df.drop(columns="snapshot_id").set_index("key").rename_axis(None)
+            )
+    return {"block": block, "polled_at": polled_at, "frames": frames}
+
+
+def fresh_snapshot(
+    network_id: int, max_age: float = MAX_SNAPSHOT_AGE, path: Optional[str] = None
+) -> Optional[dict]:
+    """Return the latest snapshot if the poller took it within `max_age` seconds."""
+    snapshot = latest_snapshot(network_id, path=path)
+    if snapshot is None or time.time() - snapshot["polled_at"] > max_age:
+        return None
+    return snapshot
+
+
+def load_history(
+    network_id: int,
+    name: str,
+    since: Optional[float] = None,
+    path: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Return every stored row of one frame for a network, oldest first.
+
+    Rows carry the `block` and `polled_at` time of their snapshot. Pass
+    `since` as a unix time to only load recent snapshots.
+    """
+    with closing(_connect(path or history_path())) as conn:
+        if name not in _tables(conn):
+            return pd.DataFrame()
+        df = pd.read_sql_query(
+            f"""
+            SELECT s.block, s.polled_at, f.* FROM "{name}" f
+            JOIN snapshots s ON s.snapshot_id = f.snapshot_id
+            WHERE s.network_id = ? AND s.polled_at >= ?
+            ORDER BY s.snapshot_id
+            """,
+            conn,
+            params=(network_id, since or 0),
+        )
+    df["polled_at"] = pd.to_datetime(df["polled_at"], unit="s")
+    return df
+
+
+def prune_snapshots(
+    max_age: float = HISTORY_RETENTION, path: Optional[str] = None
+) -> int:
+    """Delete snapshots older than `max_age` seconds, returning how many went."""
+    cutoff = time.time() - max_age
+    with closing(_connect(path or history_path())) as conn, conn:
+        expired = "SELECT snapshot_id FROM snapshots WHERE polled_at < ?"
+        for name in _tables(conn):
+            conn.execute(
+                f'DELETE FROM "{name}" WHERE snapshot_id IN ({expired})', (cutoff,)
+            )
+        deleted = conn.execute(
+            "DELETE FROM snapshots WHERE polled_at < ?", (cutoff,)
+        ).rowcount
+    return deleted
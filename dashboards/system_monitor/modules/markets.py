@@ -0,0 +1,74 @@
+import time
+import logging
+from threading import Lock
+from typing import Dict, List, Tuple
+
+from dashboards.system_monitor.modules.snapshot import pinned_multicall
+
+logger = logging.getLogger(__name__)
+
+# constants
+MARKET_PROBE_BATCH = 8
+MARKET_DISCOVERY_TTL = 24 * 60 * 60
+
+# network id -> (discovered at, market id -> market address)
+_discovered: Dict[int, Tuple[float, Dict[int, str]]] = {}
+_lock = Lock()
+
+
+def probe_market_addresses(
+    snx, market_ids: List[int], block="latest"
+) -> Dict[int, str]:
+    """Return the addresses of the registered markets among `market_ids`."""
+    (market_addresses,) = pinned_multicall(
+        snx,
+        [
+            (
+                snx.core.core_proxy,
+                "getMarketAddress",
+                [(market_id,) for market_id in market_ids],
+            )
+        ],
+        block,
+    )
+    return {
+        market_id: snx.web3.to_checksum_address(address)
+        for market_id, address in zip(market_ids, market_addresses)
+        if address is not None and int(address, 16) != 0
+    }
+
+
+def discover_markets(snx, block="latest") -> Dict[int, str]:
+    """
+    Return every registered market id and address on a network.
+
+    Market ids are assigned sequentially, so the ids above the highest known
+    market are probed in batches that double in size while they keep
+    finding markets, and probing stops at the first empty batch. Discovered
+    markets are kept per network, so after the first call only the tail is
+    probed. The full range is probed again after `MARKET_DISCOVERY_TTL`.
+    """
+    with _lock:
+        discovered_at, markets = _discovered.get(snx.network_id, (0, {}))
+        if time.time() - discovered_at > MARKET_DISCOVERY_TTL:
+            discovered_at, markets = time.time(), {}
+
+        start = max(markets) + 1 if markets else 1
+        size = MARKET_PROBE_BATCH
+        probes = 0
+        while True:
+            found = probe_market_addresses(
+                snx, list(range(start, start + size)), block=block
+            )
+            probes += 1
+            markets.update(found)
+            if not found:
+                break
+            start += size
+            size *= 2
+
+        logger.debug(
+            f"Found {len(markets)} markets on {snx.network_id} in {probes} probes"
+        )
+        _discovered[snx.network_id] = (discovered_at, markets)
+        return dict(sorted(markets.items()))
@@ -0,0 +1,97 @@
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from dashboards.system_monitor.modules import core, perps
+from dashboards.system_monitor.modules.settings import NETWORK_CONFIGS, load_snx
+from dashboards.system_monitor.modules.snapshot import get_block_number
+
+logger = logging.getLogger(__name__)
+
+# constants
+NETWORK_TIMEOUT = 60
+
+
+def refresh_network(network_id: int) -> Tuple[int, Dict[str, pd.DataFrame]]:
+    """
+    Read the core, perps and spot state of one network.
+
+    Returns the snapshot block and the frames shown on the core and perps
+    pages, keyed by name.
+    """
+    snx = load_snx(network_id)
+    configs = core.get_configs(snx)
+    block = get_block_number(snx)
+    snapshot = core.get_snapshot(snx, configs, block)
+
+    frames = {"configs": configs}
+    frames.update({name: df for name, df in snapshot.items() if name != "block"})
+    if network_id in perps.PERPS_NETWORKS:
+        df_markets, df_collaterals = perps.get_configs(snx)
+        frames["perps_markets"] = perps.clean_markets(df_markets)
+        frames["perps_collaterals"] = df_collaterals
+    return block, frames
+
+
+def _timed_refresh(network_id: int):
+    start_time = time.time()
+    block, frames = refresh_network(network_id)
+    return block, frames, time.time() - start_time
+
+
+def refresh_all_networks(
+    network_ids: Optional[List[int]] = None, timeout: float = NETWORK_TIMEOUT
+) -> Dict[str, pd.DataFrame]:
+    """
+    Refresh every network concurrently and consolidate the results.
+
+    Each network runs on its own thread. Networks that fail, or have not
+    finished within `timeout` seconds, are left out of the frames and
+    reported in the "status" frame. Every other frame has a leading
+    `network` column, so one network can be picked out without another
+    RPC call.
+    """
+    network_ids = network_ids if network_ids is not None else list(NETWORK_CONFIGS)
+
+    # worker threads need the page's script context for the cached clients
+    ctx = get_script_run_ctx()
+    executor = ThreadPoolExecutor(
+        max_workers=len(network_ids),
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx),
+    )
+    futures = {
+        executor.submit(_timed_refresh, network_id): network_id
+        for network_id in network_ids
+    }
+    done, _ = wait(futures, timeout=timeout)
+    # do not wait for networks that timed out
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    frames: Dict[str, List[pd.DataFrame]] = {}
+    status = []
+    for future, network_id in futures.items():
+        network_name = NETWORK_CONFIGS[network_id]["network_name"]
+        row = {"network": network_name, "block": None, "elapsed": None, "error": None}
+        if future not in done:
+            row["error"] = f"No response within {timeout}s"
+        elif future.exception() is not None:
+            row["error"] = str(future.exception())
+        else:
+            row["block"], network_frames, row["elapsed"] = future.result()
+            for name, df in network_frames.items():
+                df = df.copy()
+                df.insert(0, "network", network_name)
+                frames.setdefault(name, []).append(df)
+
+        if row["error"] is not None:
+            logger.warning(f"Could not refresh {network_name}: {row['error']}")
+        status.append(row)
+
+    overview = {name: pd.concat(dfs) for name, dfs in frames.items()}
+    overview["status"] = pd.DataFrame(status).astype({"block": "Int64"})
+    return overview
@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+from synthetix.utils import wei_to_ether
+from synthetix.utils.multicall import call_erc7412, multicall_erc7412
+
+# constants
+PERPS_NETWORKS = [
+    8453,
+    84532,
+    42161,
+    421614,
+]
+
+
+def get_configs(snx):
+    markets = snx.perps.markets_by_name
+
+    # call other functions
+    # - getSupportedCollaterals -> [collateralId1, collateralId2, ...]
+    # - getCollateralConfigurationFull(collateralId) -> (maxCollateralAmount, upperLimitDiscount, lowerLimitDiscount, discountScalar)
+
+    # if multicollateral
+    if snx.perps.is_multicollateral:
+        supported_collaterals = call_erc7412(
+            snx, snx.perps.market_proxy, "getSupportedCollaterals", ()
+        )
+        supported_collaterals = [x for x in supported_collaterals if x != 0]
+        collateral_configurations = multicall_erc7412(
+            snx,
+            snx.perps.market_proxy,
+            "getCollateralConfigurationFull",
+            [(collateral_id,) for collateral_id in supported_collaterals],
+        )
+        collateral_configurations = [
+            {
+                "market_id": idx,
+                "market_name": snx.spot.markets_by_id[idx]["market_name"],
+                "max_collateral_amount": wei_to_ether(x[0]),
+                "upper_limit_discount": wei_to_ether(x[1]),
+                "lower_limit_discount": wei_to_ether(x[2]),
+                "discount_scalar": wei_to_ether(x[3]),
+            }
+            for idx, x in zip(supported_collaterals, collateral_configurations)
+        ]
+        df_collaterals = pd.DataFrame.from_records(collateral_configurations)
+    else:
+        df_collaterals = pd.DataFrame()
+
+    # create a dataframe and clean it
+    df_markets = pd.DataFrame.from_dict(markets, orient="index").sort_values(
+        "market_id"
+    )
+    df_markets["funding_apr"] = df_markets["current_funding_rate"] * 365
+
+    # change some types to percentages
+    percent_cols = [
+        "maker_fee",
+        "taker_fee",
+        "current_funding_rate",
+        "funding_apr",
+        "current_funding_velocity",
+        "interest_rate",
+    ]
+    for col in percent_cols:
+        pct_format = "{:.4%}" if "funding" in col else "{:.2%}"
+        df_markets[col] = df_markets[col].astype(float).map(pct_format.format)
+
+    return df_markets, df_collaterals
+
+
+def safe_divide(numerator, denominator) -> pd.Series:
+    """Divide column-wise, returning 0 wherever the denominator is not positive."""
+    numerator = pd.Series(numerator, dtype=float)
+    denominator = pd.Series(denominator, dtype=float)
+    ratio = np.divide(
+        numerator.to_numpy(),
+        denominator.to_numpy(),
+        out=np.zeros(len(numerator)),
+        where=denominator.to_numpy() > 0,
+    )
+    return pd.Series(ratio, index=numerator.index)
+
+
+def format_pct(values: pd.Series, valid: pd.Series) -> pd.Series:
+    """Format fractions as percentage strings, showing "0%" where not `valid`."""
+    return (values * 100).map("{:.2f}%".format).where(valid, "0%")
+
+
+def clean_markets(configs):
+    """
+    Add open interest and utilization columns to a frame of perps markets.
+
+    Everything is computed column-wise, so the same function works on the
+    live markets and on the rows of many stored snapshots at once.
+    """
+    size = configs["size"].astype(float)
+    skew = configs["skew"].astype(float)
+    index_price = configs["index_price"].astype(float)
+
+    # add OI
+    configs["open_interest"] = size * index_price
+    configs["long_oi"] = (size + skew) / 2 * index_price
+    configs["short_oi"] = (size - skew) / 2 * index_price
+    has_oi = configs["open_interest"] > 0
+    configs["long_pct"] = format_pct(
+        safe_divide(configs["long_oi"], configs["open_interest"]), has_oi
+    )
+    configs["short_pct"] = format_pct(
+        safe_divide(configs["short_oi"], configs["open_interest"]), has_oi
+    )
+
+    # calculate amount of oi used
+    # it is the larger of the size versus max_open_interest OR the size * index_price versus the max_market_value
+    configs["oi_used"] = np.maximum(
+        safe_divide(size, configs["max_open_interest"]),
+        safe_divide(configs["open_interest"], configs["max_market_value"]),
+    )
+    configs["oi_used_pct"] = configs["oi_used"].map("{:.2%}".format)
+    return configs
@@ -0,0 +1,132 @@
+import time
+import logging
+import argparse
+from typing import Dict, List, Optional
+
+from dashboards.system_monitor.modules.history import (
+    HISTORY_RETENTION,
+    history_path,
+    prune_snapshots,
+    save_snapshot,
+)
+from dashboards.system_monitor.modules.overview import refresh_network
+from dashboards.system_monitor.modules.settings import NETWORK_CONFIGS, load_snx
+from dashboards.system_monitor.modules.snapshot import get_block_number
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+
+# constants
+POLL_TARGET_SECONDS = 300
+CHECK_INTERVAL = 15
+PRUNE_INTERVAL = 60 * 60
+
+
+def default_block_intervals(network_ids: List[int]) -> Dict[int, int]:
+    """Return the block count between snapshots that gives about one per 5 minutes."""
+    return {
+        network_id: max(
+            1, round(POLL_TARGET_SECONDS / NETWORK_CONFIGS[network_id]["block_time"])
+        )
+        for network_id in network_ids
+    }
+
+
+def poll_once(
+    network_ids: List[int],
+    block_intervals: Dict[int, int],
+    last_blocks: Dict[int, int],
+    path: str,
+):
+    """Snapshot every network that has advanced by its block interval."""
+    for network_id in network_ids:
+        try:
+            block = get_block_number(load_snx(network_id))
+            if block - last_blocks.get(network_id, 0) < block_intervals[network_id]:
+                continue
+
+            block, frames = refresh_network(network_id)
+            snapshot_id = save_snapshot(network_id, block, frames, path=path)
+            last_blocks[network_id] = block
+            logger.info(
+                f"Saved snapshot {snapshot_id} of {network_id} at block {block}"
+            )
+        except Exception as e:
+            logger.error(f"Could not snapshot {network_id}: {str(e)}")
+
+
+def run_poller(
+    network_ids: List[int],
+    block_intervals: Dict[int, int],
+    path: str,
+    check_interval: float = CHECK_INTERVAL,
+    iterations: Optional[int] = None,
+    retention: float = HISTORY_RETENTION,
+):
+    """
+    Snapshot the monitor state of each network every N blocks.
+
+    Networks are checked every `check_interval` seconds and snapshotted once
+    they are `block_intervals[network_id]` blocks past their last snapshot.
+    Snapshots older than `retention` seconds are deleted once an hour.
+    Runs until interrupted, or for `iterations` checks.
+    """
+    last_blocks: Dict[int, int] = {}
+    last_pruned = 0.0
+    count = 0
+    while iterations is None or count < iterations:
+        poll_once(network_ids, block_intervals, last_blocks, path)
+        if time.time() - last_pruned > PRUNE_INTERVAL:
+            try:
+                pruned = prune_snapshots(retention, path=path)
+                logger.info(f"Pruned {pruned} snapshots older than {retention}s")
+            except Exception as e:
+                logger.error(f"Could not prune the history store: {str(e)}")
+            last_pruned = time.time()
+        count += 1
+        if iterations is None or count < iterations:
+            time.sleep(check_interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Poll on-chain monitor state into the local history store."
+    )
+    parser.add_argument(
+        "--networks",
+        default=",".join(str(network_id) for network_id in NETWORK_CONFIGS),
+        help="comma-separated network ids to poll",
+    )
+    parser.add_argument(
+        "--blocks",
+        type=int,
+        help="blocks between snapshots (default: about 5 minutes per network)",
+    )
+    parser.add_argument("--interval", type=float, default=CHECK_INTERVAL)
+    parser.add_argument("--history", default=history_path())
+    parser.add_argument(
+        "--retention-days",
+        type=float,
+        default=HISTORY_RETENTION / (24 * 60 * 60),
+        help="days of snapshots to keep",
+    )
+    args = parser.parse_args()
+
+    network_ids = [int(network_id) for network_id in args.networks.split(",")]
+    block_intervals = (
+        {network_id: args.blocks for network_id in network_ids}
+        if args.blocks is not None
+        else default_block_intervals(network_ids)
+    )
+    logger.info(f"Polling {block_intervals} into {args.history}")
+    run_poller(
+        network_ids,
+        block_intervals,
+        args.history,
+        args.interval,
+        retention=args.retention_days * 24 * 60 * 60,
+    )
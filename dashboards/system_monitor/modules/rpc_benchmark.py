@@ -0,0 +1,165 @@
+import os
+import time
+import logging
+import argparse
+import tempfile
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+from synthetix import Synthetix
+from synthetix.constants import DEFAULT_PRICE_SERVICE_ENDPOINT
+
+from dashboards.utils.providers import get_provider_url
+from dashboards.system_monitor.modules import core, markets, perps, token_metadata
+from dashboards.system_monitor.modules.rpc_replay import RpcReplayServer
+from dashboards.system_monitor.modules.snapshot import (
+    get_block_number,
+    pinned_multicall,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+
+# constants
+RECORDING_DIR = "rpc_recordings"
+ITERATIONS = 5
+
+
+def recording_path(network_id: int) -> str:
+    return os.path.join(RECORDING_DIR, f"{network_id}.json")
+
+
+def load_client(server: RpcReplayServer) -> Synthetix:
+    """Build a Synthetix client that talks only to the stand-in server."""
+    return Synthetix(
+        provider_rpc=server.url,
+        network_id=server.network_id,
+        price_service_endpoint=server.pyth_url,
+    )
+
+
+def reset_caches(metadata_path: str):
+    # each iteration starts without the monitor's in-process caches
+    with markets._lock:
+        markets._discovered.clear()
+    with token_metadata._lock:
+        token_metadata._memory.clear()
+    if os.path.exists(metadata_path):
+        os.remove(metadata_path)
+
+
+def get_vaults(snx, configs: pd.DataFrame, block: int) -> pd.DataFrame:
+    collaterals = configs.index.tolist()
+    results = pinned_multicall(
+        snx,
+        core.vault_requests(snx, collaterals),
+        block,
+        calls=core.get_oracle_calls(snx),
+    )
+    return core.build_vaults(configs, collaterals, results)
+
+
+def monitor_scenarios(snx, block: int) -> Dict[str, Callable]:
+    """Return the monitor reads to benchmark, keyed by name."""
+    configs = core.get_configs(snx)
+    scenarios = {
+        "get_configs": lambda: core.get_configs(snx),
+        "get_vaults": lambda: get_vaults(snx, configs, block),
+        "get_markets": lambda: core.get_markets(snx, block),
+    }
+    if snx.network_id in perps.PERPS_NETWORKS:
+        df_markets, _ = perps.get_configs(snx)
+        scenarios["clean_markets"] = lambda: perps.clean_markets(df_markets.copy())
+    return scenarios
+
+
+def record(network_id: int, path: str, upstream_rpc: Optional[str] = None):
+    """Record the responses the monitor reads need, for offline replay."""
+    server = RpcReplayServer(
+        network_id,
+        path,
+        upstream_rpc=upstream_rpc or get_provider_url(network_id),
+        upstream_pyth=DEFAULT_PRICE_SERVICE_ENDPOINT,
+    )
+    with server, tempfile.TemporaryDirectory() as tmp:
+        os.environ[token_metadata.METADATA_DB_ENV] = os.path.join(tmp, "tokens.db")
+        snx = load_client(server)
+        block = get_block_number(snx)
+        server.recording["block"] = block
+        for name, scenario in monitor_scenarios(snx, block).items():
+            logger.info(f"Recording {name} at block {block}")
+            reset_caches(os.environ[token_metadata.METADATA_DB_ENV])
+            scenario()
+        server.save()
+    logger.info(f"Recorded {len(server.recording['rpc'])} responses to {path}")
+
+
+def run(network_id: int, path: str, iterations: int = ITERATIONS) -> pd.DataFrame:
+    """
+    Time the monitor reads against a recording, with no network access.
+
+    Every iteration starts with cold in-process caches and reads the same
+    recorded block, so runs are repeatable. Returns one row per scenario
+    with its latency percentiles and the RPC and Pyth calls it made.
+    """
+    rows = []
+    server = RpcReplayServer(network_id, path)
+    with server, tempfile.TemporaryDirectory() as tmp:
+        metadata_path = os.path.join(tmp, "tokens.db")
+        os.environ[token_metadata.METADATA_DB_ENV] = metadata_path
+        snx = load_client(server)
+        block = server.recording["block"]
+        for name, scenario in monitor_scenarios(snx, block).items():
+            times, calls = [], []
+            for _ in range(iterations):
+                reset_caches(metadata_path)
+                server.reset_counts()
+                start_time = time.time()
+                scenario()
+                times.append(time.time() - start_time)
+                calls.append(dict(server.calls))
+
+            p95 = np.percentile(times, 95)
+            rows.append(
+                {
+                    "scenario": name,
+                    "network_id": network_id,
+                    "block": block,
+                    "iterations": iterations,
+                    "median_time": float(np.median(times)),
+                    "p95_time": float(p95),
+                    "rpc_calls": sum(v for k, v in calls[-1].items() if k != "pyth"),
+                    "pyth_calls": calls[-1].get("pyth", 0),
+                    "eth_calls": calls[-1].get("eth_call", 0),
+                    "misses": server.misses,
+                }
+            )
+            logger.info(f"{name}: {rows[-1]['median_time']:.4f}s median")
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark system monitor reads against recorded RPC responses."
+    )
+    parser.add_argument("mode", choices=["record", "run"])
+    parser.add_argument("--network", type=int, default=8453)
+    parser.add_argument("--recording", help="recording file to write or replay")
+    parser.add_argument("--upstream", help="RPC url to record from")
+    parser.add_argument("--iterations", type=int, default=ITERATIONS)
+    parser.add_argument("--output", help="write the results to this csv file")
+    args = parser.parse_args()
+
+    path = args.recording or recording_path(args.network)
+    if args.mode == "record":
+        record(args.network, path, upstream_rpc=args.upstream)
+    else:
+        df = run(args.network, path, iterations=args.iterations)
+        print(df.to_string(index=False))
+        if args.output:
+            df.to_csv(args.output, index=False)
@@ -0,0 +1,340 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# constants
+RPC_CACHE_DB_ENV = "RPC_CACHE_DB"
+RPC_CACHE_DB = "rpc_cache.db"
+RPC_CACHE_BUDGET_ENV = "RPC_CACHE_BUDGET_MB"
+RPC_CACHE_BUDGET_MB = 256
+DEFAULT_BLOCK_TIME = 2
+# blocks behind the head after which a block is treated as final
+CONFIRMATIONS = 64
+# accessed_at updates are written once this many disk hits are pending
+ACCESS_BATCH_SIZE = 100
+STATIC_METHODS = ["eth_chainId", "net_version"]
+LATEST_METHODS = ["eth_blockNumber"]
+# position of the block parameter for methods that read state at a block
+BLOCK_PARAM_INDEX = {
+    "eth_call": 1,
+    "eth_getBalance": 1,
+    "eth_getCode": 1,
+    "eth_getStorageAt": 2,
+    "eth_getBlockByNumber": 0,
+}
+
+FOREVER = "forever"
+ONE_BLOCK = "block"
+
+
+def _is_block_number(block) -> bool:
+    return isinstance(block, int) or (isinstance(block, str) and block.startswith("0x"))
+
+
+def _is_final(block, head: Optional[int], confirmations: int) -> bool:
+    # a block number read before the head is known could still be reorged
+    if head is None or not _is_block_number(block):
+        return False
+    number = block if isinstance(block, int) else int(block, 16)
+    return number <= head - confirmations
+
+
+def cache_policy(
+    method: str, params, head: Optional[int] = None, confirmations: int = CONFIRMATIONS
+) -> Optional[str]:
+    """
+    Decide how long a JSON-RPC response can be cached.
+
+    Responses pinned to a block at least `confirmations` blocks behind
+    `head` never change, so they are kept on disk indefinitely. Reads
+    against "latest", or against a block recent enough to be reorged, are
+    kept in memory for one block time. Anything else is not cached.
+    """
+    params = list(params or [])
+    if method in STATIC_METHODS:
+        return FOREVER
+    if method in LATEST_METHODS:
+        return ONE_BLOCK
+    if method in BLOCK_PARAM_INDEX:
+        idx = BLOCK_PARAM_INDEX[method]
+        block = params[idx] if len(params) > idx else "latest"
+        if _is_final(block, head, confirmations):
+            return FOREVER
+        return ONE_BLOCK if block == "latest" or _is_block_number(block) else None
+    if method == "eth_getLogs" and params:
+        log_filter = params[0]
+        if "blockHash" in log_filter or (
+            _is_block_number(log_filter.get("fromBlock"))
+            and _is_final(log_filter.get("toBlock"), head, confirmations)
+        ):
+            return FOREVER
+    return None
+
+
+def _encode(value):
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    return str(value)
+
+
+def request_key(chain_id: int, method: str, params) -> str:
+    """Hash a request, with its chain, into a cache key."""
+    payload = json.dumps(
+        [chain_id, method, params], sort_keys=True, default=_encode
+    ).encode()
+    return hashlib.sha1(payload).hexdigest()
+
+
+def rpc_cache_budget() -> int:
+    """Return the disk budget of the RPC cache in bytes."""
+    return int(float(os.environ.get(RPC_CACHE_BUDGET_ENV, RPC_CACHE_BUDGET_MB)) * 2**20)
+
+
+class RpcCache:
+    """
+    A cache of JSON-RPC results, with hit rates per network.
+
+    Immutable results are stored in SQLite at `RPC_CACHE_DB` (default
+    `rpc_cache.db`) and shared across restarts, with the least recently used
+    rows deleted once the store exceeds `RPC_CACHE_BUDGET_MB`. Results read
+    at "latest" are kept in memory until the next block is expected. Disk
+    hits update their access time in batches of `ACCESS_BATCH_SIZE`.
+    """
+
+    def __init__(self, path: Optional[str] = None, budget: Optional[int] = None):
+        self.path = path or os.environ.get(RPC_CACHE_DB_ENV, RPC_CACHE_DB)
+        self.budget = budget if budget is not None else rpc_cache_budget()
+        self._memory: Dict[str, Tuple[float, Any]] = {}
+        self._stats: Dict[int, Dict[str, int]] = {}
+        self._heads: Dict[int, int] = {}
+        self._accessed: Dict[str, float] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._bytes = 0
+        self._lock = Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    chain_id INTEGER,
+                    method TEXT,
+                    result TEXT,
+                    bytes INTEGER,
+                    accessed_at REAL
+                )
+                """
+            )
+            self._bytes = self._conn.execute(
+                "SELECT COALESCE(SUM(bytes), 0) FROM responses"
+            ).fetchone()[0]
+        return self._conn
+
+    def _chain_stats(self, chain_id: int) -> Dict[str, int]:
+        return self._stats.setdefault(
+            chain_id,
+            {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0},
+        )
+
+    def get(self, chain_id: int, key: str, policy: str):
+        """Return a cached result, or None on a miss."""
+        with self._lock:
+            stats = self._chain_stats(chain_id)
+            if policy == ONE_BLOCK:
+                entry = self._memory.get(key)
+                if entry is not None and entry[0] > time.time():
+                    stats["memory_hits"] += 1
+                    return entry[1]
+            else:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT result FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self._accessed[key] = time.time()
+                    if len(self._accessed) >= ACCESS_BATCH_SIZE:
+                        self._flush_accessed(conn)
+                        conn.commit()
+                    stats["disk_hits"] += 1
+                    return json.loads(row[0])
+            stats["misses"] += 1
+            return None
+
+    def set(
+        self,
+        chain_id: int,
+        key: str,
+        method: str,
+        result,
+        policy: str,
+        block_time: float = DEFAULT_BLOCK_TIME,
+    ):
+        with self._lock:
+            if policy == ONE_BLOCK:
+                now = time.time()
+                # drop expired entries so the memory layer stays small
+                self._memory = {
+                    k: entry for k, entry in self._memory.items() if entry[0] > now
+                }
+                self._memory[key] = (now + block_time, result)
+                return
+
+            payload = json.dumps(result)
+            conn = self._connect()
+            replaced = conn.execute(
+                "SELECT bytes FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if replaced is not None:
+                self._bytes -= replaced[0]
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, chain_id, method, payload, len(payload), time.time()),
+            )
+            self._bytes += len(payload)
+            self._accessed.pop(key, None)
+            if self._bytes > self.budget:
+                self._flush_accessed(conn)
+                self._evict(conn)
+            conn.commit()
+
+    def _flush_accessed(self, conn: sqlite3.Connection):
+        conn.executemany(
+            "UPDATE responses SET accessed_at = ? WHERE key = ?",
+            [(accessed_at, key) for key, accessed_at in self._accessed.items()],
+        )
+        self._accessed.clear()
+
+    def _evict(self, conn: sqlite3.Connection):
+        # delete least recently used rows until the store is back under budget
+        rows = conn.execute(
+            "SELECT key, chain_id, bytes FROM responses ORDER BY accessed_at"
+        ).fetchall()
+        evicted = []
+        for key, chain_id, size in rows:
+            if self._bytes <= self.budget:
+                break
+            evicted.append((key,))
+            self._bytes -= size
+            self._chain_stats(chain_id)["evictions"] += 1
+        conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+            self._memory.clear()
+            self._accessed.clear()
+            self._stats.clear()
+            self._bytes = 0
+
+    def head(self, chain_id: int, make_request: Callable) -> Optional[int]:
+        """Return the highest block seen on a chain, asking for it if none was."""
+        if chain_id not in self._heads:
+            response = make_request("eth_blockNumber", [])
+            self._observe_head(chain_id, response.get("result"))
+        return self._heads.get(chain_id)
+
+    def _observe_head(self, chain_id: int, block):
+        # any block number seen is a lower bound on the head, which is enough
+        # to tell that older blocks are final
+        if _is_block_number(block):
+            number = block if isinstance(block, int) else int(block, 16)
+            with self._lock:
+                self._heads[chain_id] = max(self._heads.get(chain_id, 0), number)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def stats(self) -> pd.DataFrame:
+        """Return hits, misses, hit rate and evictions per network."""
+        with self._lock:
+            rows = []
+            for chain_id, stats in self._stats.items():
+                hits = stats["memory_hits"] + stats["disk_hits"]
+                rows.append(
+                    {
+                        "chain_id": chain_id,
+                        **stats,
+                        "hit_rate": (
+                            hits / (hits + stats["misses"])
+                            if hits + stats["misses"] > 0
+                            else 0
+                        ),
+                    }
+                )
+        return pd.DataFrame(
+            rows,
+            columns=[
+                "chain_id",
+                "memory_hits",
+                "disk_hits",
+                "misses",
+                "evictions",
+                "hit_rate",
+            ],
+        )
+
+    def middleware(
+        self, chain_id: int, block_time: float = DEFAULT_BLOCK_TIME
+    ) -> Callable:
+        """
+        Return a web3 middleware that answers cacheable calls from this cache.
+
+        Inject it at the innermost layer so it sees raw JSON-RPC responses.
+        The chain head is taken from the `eth_blockNumber` responses that pass
+        through, to tell final blocks from ones that could still be reorged.
+        Error responses are never cached.
+        """
+
+        def rpc_cache_middleware(make_request, w3):
+            def middleware(method, params):
+                head = (
+                    self.head(chain_id, make_request)
+                    if method in BLOCK_PARAM_INDEX or method == "eth_getLogs"
+                    else None
+                )
+                policy = cache_policy(method, params, head=head)
+                if policy is None:
+                    return make_request(method, params)
+
+                key = request_key(chain_id, method, params)
+                cached = self.get(chain_id, key, policy)
+                if cached is not None:
+                    return {"jsonrpc": "2.0", "id": 0, "result": cached}
+
+                response = make_request(method, params)
+                if method in LATEST_METHODS:
+                    self._observe_head(chain_id, response.get("result"))
+                if "error" not in response and response.get("result") is not None:
+                    self.set(
+                        chain_id, key, method, response["result"], policy, block_time
+                    )
+                return response
+
+            return middleware
+
+        return rpc_cache_middleware
+
+
+rpc_cache = RpcCache()
+
+
+def add_rpc_cache(snx, block_time: float = DEFAULT_BLOCK_TIME):
+    """Route a Synthetix client's RPC calls through the shared `rpc_cache`."""
+    snx.web3.middleware_onion.inject(
+        rpc_cache.middleware(snx.network_id, block_time), name="rpc_cache", layer=0
+    )
+    return snx
@@ -0,0 +1,173 @@
+import os
+import json
+import logging
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+import requests
+
+from dashboards.system_monitor.modules.rpc_cache import request_key
+
+logger = logging.getLogger(__name__)
+
+# constants
+PYTH_PATH = "/pyth"
+UPSTREAM_TIMEOUT = 30
+NOT_RECORDED = -32001
+
+
+class RpcReplayServer:
+    """
+    A local stand-in for a network's RPC provider and Pyth price service.
+
+    In record mode (`upstream_rpc` given) every JSON-RPC request is forwarded
+    to the real provider and its response stored, keyed by the request like
+    the RPC cache. Requests under `/pyth` are forwarded to `upstream_pyth`.
+    In replay mode the stored responses are served without any network
+    access, and requests that were never recorded get a JSON-RPC error.
+
+    Point a client at `url` for RPC and at `pyth_url` for prices. Requests
+    are counted per method in `calls`, so benchmarks can report call counts.
+    """
+
+    def __init__(
+        self,
+        network_id: int,
+        path: str,
+        upstream_rpc: Optional[str] = None,
+        upstream_pyth: Optional[str] = None,
+    ):
+        self.network_id = network_id
+        self.path = path
+        self.upstream_rpc = upstream_rpc
+        self.upstream_pyth = upstream_pyth
+        self.calls = Counter()
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+        if os.path.exists(path):
+            with open(path) as f:
+                self.recording = json.load(f)
+        elif upstream_rpc is None:
+            raise FileNotFoundError(f"No recording at {path} to replay")
+        else:
+            self.recording = {"network_id": network_id, "rpc": {}, "http": {}}
+
+    @property
+    def recording_mode(self) -> bool:
+        return self.upstream_rpc is not None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def pyth_url(self) -> str:
+        return f"{self.url}{PYTH_PATH}"
+
+    def rpc(self, request: dict) -> dict:
+        """Answer one JSON-RPC request from the recording."""
+        method, params = request.get("method"), request.get("params", [])
+        key = request_key(self.network_id, method, params)
+        with self._lock:
+            self.calls[method] += 1
+            response = self.recording["rpc"].get(key)
+
+        if response is None and self.recording_mode:
+            response = requests.post(
+                self.upstream_rpc, json=request, timeout=UPSTREAM_TIMEOUT
+            ).json()
+            response.pop("id", None)
+            with self._lock:
+                response = self.recording["rpc"].setdefault(key, response)
+        elif response is None:
+            with self._lock:
+                self.misses += 1
+            logger.warning(f"No recorded response for {method} {params}")
+            response = {
+                "jsonrpc": "2.0",
+                "error": {"code": NOT_RECORDED, "message": f"{method} not recorded"},
+            }
+        return {**response, "id": request.get("id")}
+
+    def http(self, path: str):
+        """Answer a Pyth price service request, returning (status, body)."""
+        with self._lock:
+            self.calls["pyth"] += 1
+            entry = self.recording["http"].get(path)
+
+        if entry is None and self.recording_mode:
+            response = requests.get(
+                f"{self.upstream_pyth}{path}", timeout=UPSTREAM_TIMEOUT
+            )
+            entry = {"status": response.status_code, "body": response.text}
+            with self._lock:
+                entry = self.recording["http"].setdefault(path, entry)
+        elif entry is None:
+            with self._lock:
+                self.misses += 1
+            logger.warning(f"No recorded response for {path}")
+            entry = {"status": 404, "body": "not recorded"}
+        return entry["status"], entry["body"]
+
+    def reset_counts(self):
+        with self._lock:
+            self.calls.clear()
+            self.misses = 0
+
+    def save(self):
+        """Write the recording, including anything recorded since it was loaded."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock:
+            with open(self.path, "w") as f:
+                json.dump(self.recording, f)
+
+    def start(self) -> "RpcReplayServer":
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                if isinstance(body, list):
+                    result = [server.rpc(request) for request in body]
+                else:
+                    result = server.rpc(body)
+                self._respond(200, json.dumps(result), "application/json")
+
+            def do_GET(self):
+                if not self.path.startswith(PYTH_PATH):
+                    self._respond(404, "not found", "text/plain")
+                    return
+                status, body = server.http(self.path[len(PYTH_PATH) :])
+                self._respond(status, body, "application/json")
+
+            def _respond(self, status, body, content_type):
+                payload = body.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "RpcReplayServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
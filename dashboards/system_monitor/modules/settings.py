@@ -1,44 +1,67 @@
 import os
+import time
+import logging
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from synthetix import Synthetix
 from api.internal_api import SynthetixAPI, get_db_config
 from dashboards.utils.providers import get_provider_url
+from dashboards.system_monitor.modules.rpc_cache import add_rpc_cache
+from dashboards.system_monitor.modules.contract_cache import use_contract_cache
 
-# constants
-ALCHEMY_KEY = st.secrets.settings.WEB3_ALCHEMY_API_KEY
+logger = logging.getLogger(__name__)
+
+# clients read their contract abis from the on-disk cache
+use_contract_cache()
 
+# constants
 NETWORK_CONFIGS = {
     1: {
         "network_id": 1,
         "network_name": "Ethereum Mainnet",
-        "provider_rpc": get_provider_url(1),
+        "block_time": 12,
     },
     8453: {
         "network_id": 8453,
         "network_name": "Base Mainnet",
-        "provider_rpc": get_provider_url(8453),
+        "block_time": 2,
     },
     42161: {
         "network_id": 42161,
         "network_name": "Arbitrum Mainnet",
-        "provider_rpc": get_provider_url(42161),
+        "block_time": 0.25,
     },
     11155111: {
         "network_id": 11155111,
         "network_name": "Ethereum Sepolia",
-        "provider_rpc": get_provider_url(11155111),
+        "block_time": 12,
     },
     84532: {
         "network_id": 84532,
         "network_name": "Base Sepolia",
-        "provider_rpc": get_provider_url(84532),
+        "block_time": 2,
     },
     421614: {
         "network_id": 421614,
         "network_name": "Arbitrum Sepolia",
-        "provider_rpc": get_provider_url(421614),
+        "block_time": 0.25,
     },
 }
+SNX_TTL = 3600
+
+_warm_lock = threading.Lock()
+_warming = False
+# when the last warm-up finished, after which its clients expire within SNX_TTL
+_warmed_at = None
+
+
+@lru_cache(maxsize=None)
+def get_network_rpc(network_id):
+    """Resolve a network's RPC url the first time a client needs it."""
+    return get_provider_url(network_id)
 
 
 # set the API
@@ -47,12 +70,57 @@ def load_api():
     return SynthetixAPI(db_config=get_db_config(streamlit=True))
 
 
-@st.cache_resource(ttl=3600)
+@st.cache_resource(ttl=SNX_TTL)
 def load_snx(network_id=8453):
-    provider_rpc = NETWORK_CONFIGS[network_id]["provider_rpc"]
-    return Synthetix(
+    provider_rpc = get_network_rpc(network_id)
+    snx = Synthetix(
         provider_rpc=provider_rpc,
+        network_id=network_id,
     )
+    return add_rpc_cache(snx, NETWORK_CONFIGS[network_id]["block_time"])
+
+
+def _warm_network(network_id):
+    try:
+        load_snx(network_id)
+    except Exception as e:
+        logger.warning(f"Could not warm up the {network_id} client: {str(e)}")
+
+
+def _warm_all(network_ids, ctx):
+    global _warming, _warmed_at
+    # worker threads need the page's script context for the cached clients
+    try:
+        with ThreadPoolExecutor(
+            max_workers=len(network_ids),
+            initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx),
+        ) as executor:
+            executor.map(_warm_network, network_ids)
+    finally:
+        with _warm_lock:
+            _warming = False
+            _warmed_at = time.time()
+
+
+def warm_snx(network_ids=NETWORK_CONFIGS.keys()):
+    """
+    Build the clients of `network_ids` on background threads.
+
+    Call this after the page has rendered, so switching networks later is
+    served from `load_snx`'s cache. A call starts the warm-up unless one is
+    running, or one finished less than `SNX_TTL` ago, so the clients are
+    rebuilt once `load_snx` has expired them.
+    """
+    global _warming
+    with _warm_lock:
+        if _warming or (_warmed_at is not None and time.time() - _warmed_at < SNX_TTL):
+            return
+        _warming = True
+
+    # let the page finish while the clients build
+    threading.Thread(
+        target=_warm_all, args=(list(network_ids), get_script_run_ctx()), daemon=True
+    ).start()
 
 
 def settings(enabled_markets=NETWORK_CONFIGS.keys()):
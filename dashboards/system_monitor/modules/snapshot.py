@@ -0,0 +1,236 @@
+import os
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import pandas as pd
+from web3.exceptions import ContractLogicError
+from synthetix.utils.multicall import decode_result, handle_erc7412_error
+
+logger = logging.getLogger(__name__)
+
+# constants
+MULTICALL_CHUNK_SIZE_ENV = "MULTICALL_CHUNK_SIZE"
+MULTICALL_CHUNK_SIZE = 200
+MULTICALL_WORKERS = 4
+MULTICALL_RETRIES = 2
+MULTICALL_BACKOFF = 0.5
+MAX_ORACLE_ROUNDS = 5
+CHUNK_STATS_SIZE = 1000
+# provider errors that a smaller chunk avoids, unlike rate limits or outages
+SPLITTABLE_ERRORS = [
+    "out of gas",
+    "gas limit",
+    "gas required exceeds",
+    "response size",
+    "response is too big",
+    "too many calls",
+]
+
+# a contract, one of its view functions and the argument tuples to call it with
+MulticallRequest = Tuple[object, str, List[tuple]]
+
+# one entry per chunk attempt, newest last
+_chunk_stats = deque(maxlen=CHUNK_STATS_SIZE)
+_stats_lock = threading.Lock()
+
+
+def multicall_chunk_size() -> int:
+    """Return the number of calls sent in one multicall."""
+    return int(os.environ.get(MULTICALL_CHUNK_SIZE_ENV, MULTICALL_CHUNK_SIZE))
+
+
+def get_block_number(snx) -> int:
+    """Return the latest block number, to pin a snapshot's calls to."""
+    return snx.web3.eth.block_number
+
+
+def _record_chunk(network_id: int, size: int, elapsed: float, attempt: int, error):
+    with _stats_lock:
+        _chunk_stats.append(
+            {
+                "network_id": network_id,
+                "chunk_size": size,
+                "elapsed": elapsed,
+                "attempt": attempt,
+                "error": None if error is None else str(error),
+            }
+        )
+
+
+def chunk_stats() -> pd.DataFrame:
+    """
+    Summarize recent multicall chunks by network and chunk size.
+
+    Compare the latency and error rate of each size to pick a
+    `MULTICALL_CHUNK_SIZE` that suits a provider.
+    """
+    with _stats_lock:
+        df = pd.DataFrame(
+            list(_chunk_stats),
+            columns=["network_id", "chunk_size", "elapsed", "attempt", "error"],
+        )
+    df["failed"] = df["error"].notna()
+    return (
+        df.groupby(["network_id", "chunk_size"])
+        .agg(
+            chunks=("elapsed", "size"),
+            mean_time=("elapsed", "mean"),
+            max_time=("elapsed", "max"),
+            retries=("attempt", lambda x: int((x > 0).sum())),
+            error_rate=("failed", "mean"),
+        )
+        .reset_index()
+    )
+
+
+def _aggregate(snx, calls: list, these_calls: list, block) -> Tuple[list, list]:
+    # retry with the oracle updates asked for by ERC-7412 errors prepended,
+    # as `multicall_erc7412` does; any other error is raised
+    for _ in range(MAX_ORACLE_ROUNDS):
+        try:
+            all_calls = calls + these_calls
+            results = snx.multicall.functions.aggregate3Value(all_calls).call(
+                {"value": sum(call[2] for call in all_calls)}, block_identifier=block
+            )
+            return calls, results[len(calls) :]
+        except Exception as e:
+            # check if the error is related to oracle data
+            snx.logger.debug(f"Simulation failed, decoding the error {e}")
+            error = e
+            calls = handle_erc7412_error(snx, e) + calls
+    raise error
+
+
+def _is_splittable(error: Exception) -> bool:
+    # a revert or a gas or response size limit fails the same way on every
+    # attempt, so only splitting the chunk can get around it
+    if isinstance(error, ContractLogicError):
+        return True
+    message = str(error).lower()
+    return any(pattern in message for pattern in SPLITTABLE_ERRORS)
+
+
+def _decode(contract, function_name: str, result):
+    # failed calls carry revert data, which would decode as garbage or raise
+    if result is None or not result[0]:
+        return None
+    try:
+        value = decode_result(contract, function_name, result[1])
+    except Exception as e:
+        logger.warning(f"Could not decode {function_name}: {str(e)}")
+        return None
+    return value if len(value) > 1 else value[0]
+
+
+def _run_chunk(
+    snx, calls: list, chunk: list, block, retries: int, backoff: float
+) -> Tuple[list, list]:
+    """
+    Run one chunk of calls, returning the oracle calls used and the results.
+
+    Transient failures, such as rate limits, timeouts and outages, are
+    retried with exponential backoff and raised once the retries are used
+    up. A revert or a gas or response size limit is not retried. Instead
+    the chunk is split in half, down to single calls, whose result is None
+    if they still fail.
+    """
+    error = None
+    for attempt in range(retries + 1):
+        if attempt > 0:
+            time.sleep(backoff * 2 ** (attempt - 1))
+        start_time = time.time()
+        try:
+            calls, results = _aggregate(snx, calls, chunk, block)
+            _record_chunk(
+                snx.network_id, len(chunk), time.time() - start_time, attempt, None
+            )
+            return calls, results
+        except Exception as e:
+            error = e
+            _record_chunk(
+                snx.network_id, len(chunk), time.time() - start_time, attempt, e
+            )
+            if _is_splittable(e):
+                break
+
+    if not _is_splittable(error):
+        raise error
+    if len(chunk) == 1:
+        logger.warning(f"Multicall item failed on {snx.network_id}: {str(error)}")
+        return calls, [None]
+
+    middle = len(chunk) // 2
+    calls, first = _run_chunk(snx, calls, chunk[:middle], block, retries, backoff)
+    calls, second = _run_chunk(snx, calls, chunk[middle:], block, retries, backoff)
+    return calls, first + second
+
+
+def pinned_multicall(
+    snx,
+    requests: List[MulticallRequest],
+    block: int,
+    calls: Optional[list] = None,
+    chunk_size: Optional[int] = None,
+    workers: int = MULTICALL_WORKERS,
+    retries: int = MULTICALL_RETRIES,
+    backoff: float = MULTICALL_BACKOFF,
+) -> List[list]:
+    """
+    Run several `multicall_erc7412` requests as multicalls at one block.
+
+    The calls are split into chunks of `chunk_size` (default
+    `MULTICALL_CHUNK_SIZE`), all read against `block` so every result comes
+    from the same chain state. The first chunk resolves the oracle updates
+    asked for by ERC-7412 errors, and the others then run on `workers`
+    threads with those updates prepended. Chunks that hit a transient
+    provider error are retried, and chunks that revert or exceed a gas or
+    response size limit are bisected to isolate the calls that break them.
+    Calls that revert, or
+    whose results cannot be decoded, come back as None rather than failing
+    the snapshot. Returns the decoded results of each request, in order.
+    """
+    calls = list(calls or [])
+    chunk_size = chunk_size or multicall_chunk_size()
+    these_calls = [
+        (
+            contract.address,
+            True,
+            0,
+            contract.encodeABI(fn_name=function_name, args=args),
+        )
+        for contract, function_name, args_list in requests
+        for args in args_list
+    ]
+    chunks = [
+        these_calls[start : start + chunk_size]
+        for start in range(0, len(these_calls), chunk_size)
+    ]
+    if not chunks:
+        return [[] for _ in requests]
+
+    calls, results = _run_chunk(snx, calls, chunks[0], block, retries, backoff)
+    if len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_run_chunk, snx, calls, chunk, block, retries, backoff)
+                for chunk in chunks[1:]
+            ]
+            for future in futures:
+                results += future.result()[1]
+
+    # split the results back into their requests
+    offset = 0
+    decoded = []
+    for contract, function_name, args_list in requests:
+        decoded.append(
+            [
+                _decode(contract, function_name, result)
+                for result in results[offset : offset + len(args_list)]
+            ]
+        )
+        offset += len(args_list)
+    return decoded
@@ -0,0 +1,164 @@
+import os
+import sqlite3
+import logging
+from threading import Lock
+from typing import Dict, List, Optional, Tuple, TypedDict
+
+from synthetix.utils.multicall import decode_result
+
+logger = logging.getLogger(__name__)
+
+# constants
+METADATA_DB_ENV = "TOKEN_METADATA_DB"
+METADATA_DB = "token_metadata.db"
+METADATA_FIELDS = ["name", "symbol", "decimals"]
+
+
+class TokenMetadata(TypedDict):
+    name: Optional[str]
+    symbol: Optional[str]
+    decimals: Optional[int]
+
+
+_memory: Dict[Tuple[int, str], TokenMetadata] = {}
+_lock = Lock()
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS tokens (
+            chain_id INTEGER,
+            address TEXT,
+            name TEXT,
+            symbol TEXT,
+            decimals INTEGER,
+            PRIMARY KEY (chain_id, address)
+        )
+        """
+    )
+    return conn
+
+
+def load_cached(
+    chain_id: int, addresses: List[str], path: str
+) -> Dict[str, TokenMetadata]:
+    """Return the stored metadata for the addresses that have any."""
+    if not addresses:
+        return {}
+    with _connect(path) as conn:
+        rows = conn.execute(
+            f"""
+            SELECT address, name, symbol, decimals FROM tokens
+            WHERE chain_id = ? AND address IN ({", ".join("?" * len(addresses))})
+            """,
+            (chain_id, *addresses),
+        ).fetchall()
+    conn.close()
+    return {
+        address: {"name": name, "symbol": symbol, "decimals": decimals}
+        for address, name, symbol, decimals in rows
+    }
+
+
+def save_cached(chain_id: int, metadata: Dict[str, TokenMetadata], path: str):
+    """Store metadata permanently, since token names and decimals never change."""
+    with _connect(path) as conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO tokens VALUES (?, ?, ?, ?, ?)",
+            [
+                (chain_id, address, meta["name"], meta["symbol"], meta["decimals"])
+                for address, meta in metadata.items()
+            ],
+        )
+    conn.close()
+
+
+def _decode_field(token, field: str, data: bytes):
+    try:
+        return decode_result(token, field, data)[0]
+    except Exception:
+        # some early tokens return their name and symbol as bytes32
+        if field != "decimals" and len(data) == 32:
+            return data.rstrip(b"\x00").decode("utf-8", errors="ignore") or None
+        return None
+
+
+def fetch_token_metadata(snx, addresses: List[str]) -> Dict[str, TokenMetadata]:
+    """
+    Read name, symbol and decimals for every address in one multicall.
+
+    Calls are allowed to fail individually, so contracts that are not ERC20
+    compliant get None for the fields they do not implement. An error from
+    the multicall itself is raised.
+    """
+    tokens = {
+        address: snx.web3.eth.contract(
+            address=address, abi=snx.contracts["common"]["ERC20"]["abi"]
+        )
+        for address in addresses
+    }
+    calls = [
+        (address, True, 0, token.encodeABI(fn_name=field))
+        for address, token in tokens.items()
+        for field in METADATA_FIELDS
+    ]
+    results = snx.multicall.functions.aggregate3Value(calls).call({"value": 0})
+
+    metadata = {}
+    for idx, (address, token) in enumerate(tokens.items()):
+        fields = results[idx * len(METADATA_FIELDS) : (idx + 1) * len(METADATA_FIELDS)]
+        metadata[address] = {
+            field: _decode_field(token, field, data) if success else None
+            for field, (success, data) in zip(METADATA_FIELDS, fields)
+        }
+    return metadata
+
+
+def get_token_metadata(
+    snx, addresses: List[str], path: Optional[str] = None
+) -> Dict[str, TokenMetadata]:
+    """
+    Return token metadata keyed by address, fetching only what is not cached.
+
+    Lookups are cached in memory and in a local SQLite store at
+    `TOKEN_METADATA_DB` (default `token_metadata.db`), keyed by chain id and
+    address, so each token is only read from the chain once. A field that
+    reverts, because the contract is not ERC20 compliant, is cached as None
+    like any other result. If the multicall itself fails, the tokens get
+    None for every field and are not cached, so they are read again on the
+    next call.
+    """
+    path = path or os.environ.get(METADATA_DB_ENV, METADATA_DB)
+    chain_id = snx.network_id
+    with _lock:
+        missing = [a for a in addresses if (chain_id, a) not in _memory]
+        if missing:
+            stored = load_cached(chain_id, missing, path)
+            _memory.update({(chain_id, a): meta for a, meta in stored.items()})
+            missing = [a for a in missing if a not in stored]
+
+        fetched = {}
+        if missing:
+            logger.info(f"Fetching metadata for {len(missing)} tokens on {chain_id}")
+            try:
+                fetched = fetch_token_metadata(snx, missing)
+            except Exception as e:
+                logger.warning(f"Could not fetch token metadata: {str(e)}")
+                fetched = {a: dict.fromkeys(METADATA_FIELDS) for a in missing}
+            else:
+                save_cached(chain_id, fetched, path)
+                _memory.update({(chain_id, a): meta for a, meta in fetched.items()})
+
+        return {
+            address: _memory.get((chain_id, address)) or fetched[address]
+            for address in addresses
+        }
+
+
+def token_description(metadata: TokenMetadata) -> str:
+    """Format a token as "Name (SYMBOL)", or "Unknown Token" if it is not ERC20."""
+    if metadata["name"] is None or metadata["symbol"] is None:
+        return "Unknown Token"
+    return f"{metadata['name']} ({metadata['symbol']})"
@@ -0,0 +1,66 @@
+import streamlit as st
+
+from dashboards.utils.cache import (
+    load_memory_reports,
+    result_cache,
+    session_state_sizes,
+)
+from dashboards.system_monitor.modules.rpc_cache import rpc_cache
+
+st.markdown("# Cache Memory")
+
+MB = 2**20
+
+df_reports = load_memory_reports()
+
+# totals across every dashboard process
+st.markdown("## By app")
+if df_reports.empty:
+    st.info("No cache memory reports yet")
+else:
+    df_apps = (
+        df_reports.groupby("app")
+        .agg(
+            processes=("pid", "nunique"),
+            entries=("entries", "sum"),
+            mb=("bytes", lambda sizes: sizes.sum() / MB),
+            data_mb=("data_bytes", lambda sizes: sizes.sum() / MB),
+        )
+        .reset_index()
+    )
+    st.dataframe(df_apps, hide_index=True)
+
+    st.markdown("## By function")
+    df_functions = (
+        df_reports.groupby(["app", "function"])
+        .agg(
+            entries=("entries", "sum"),
+            mb=("bytes", lambda sizes: sizes.sum() / MB),
+            data_mb=("data_bytes", lambda sizes: sizes.sum() / MB),
+        )
+        .reset_index()
+        .sort_values("mb", ascending=False)
+    )
+    st.dataframe(df_functions, hide_index=True)
+
+# this process
+st.markdown("## This process")
+st.metric(
+    "Cache memory",
+    f"{result_cache.total_bytes / MB:.1f} MB",
+    help=f"Budget: {result_cache.budget / MB:.0f} MB",
+)
+st.dataframe(result_cache.stats(), hide_index=True)
+st.button("Clear cache", on_click=result_cache.clear)
+
+st.markdown("## RPC cache")
+st.metric(
+    "RPC cache size",
+    f"{rpc_cache.total_bytes / MB:.1f} MB",
+    help=f"Budget: {rpc_cache.budget / MB:.0f} MB, stored in {rpc_cache.path}",
+)
+st.dataframe(rpc_cache.stats(), hide_index=True)
+st.button("Clear RPC cache", on_click=rpc_cache.clear)
+
+st.markdown("## Session state")
+st.dataframe(session_state_sizes(st.session_state), hide_index=True)
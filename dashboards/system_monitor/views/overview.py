@@ -0,0 +1,46 @@
+import streamlit as st
+
+from dashboards.system_monitor.modules.overview import refresh_all_networks
+from dashboards.system_monitor.modules.settings import NETWORK_CONFIGS
+
+st.markdown("# Synthetix V3: All Networks")
+
+SECTIONS = {
+    "configs": "Collateral Configurations",
+    "vaults": "Vault Information",
+    "perps": "Perps Markets",
+    "perps_collateral": "Perps Market Collateral Details",
+    "spot": "Spot Markets",
+    "spot_collateral": "Spot Market Collateral Details",
+    "perps_markets": "Perps Market Information",
+    "perps_collaterals": "Perps Collateral Configurations",
+}
+
+
+# every network is refreshed at once, so switching between them is free
+@st.cache_data(ttl=300)
+def get_overview():
+    return refresh_all_networks()
+
+
+overview = get_overview()
+
+st.markdown("### Networks")
+st.dataframe(overview["status"], hide_index=True, use_container_width=True)
+
+network = st.selectbox(
+    "Network",
+    options=["All networks"]
+    + [config["network_name"] for config in NETWORK_CONFIGS.values()],
+)
+
+for name, title in SECTIONS.items():
+    if name not in overview:
+        continue
+    df = overview[name]
+    if network != "All networks":
+        df = df[df["network"] == network]
+    if df.shape[0] == 0:
+        continue
+    st.markdown(f"### {title}")
+    st.dataframe(df, hide_index=True, use_container_width=True)
@@ -1,23 +1,80 @@
 import streamlit as st
+import pandas as pd
 
 from api.internal_api import SynthetixAPI, get_db_config
 from dashboards.utils import performance
+from dashboards.utils.scenarios import DATE_RANGES
+from dashboards.utils.query_plans import full_scans, summarize_plans
+from dashboards.system_monitor.modules.snapshot import chunk_stats
 
 st.markdown("# Query Performance")
 
 if "df_query" not in st.session_state:
     st.session_state.df_query = None
+if "df_plans" not in st.session_state:
+    st.session_state.df_plans = None
 
 
 def time_queries():
-    results = performance.run_benchmarks(st.session_state.api)
+    progress_bar = st.progress(0.0, text="Starting benchmark run")
+    table = st.empty()
+    completed = {}
+
+    def show_progress(done, total, scenario_key, benchmark_data):
+        completed[scenario_key] = benchmark_data
+        progress_bar.progress(done / total, text=f"{done}/{total}: {scenario_key}")
+        table.dataframe(performance.create_benchmark_dataframe(completed))
+
+    results = performance.run_benchmarks(
+        st.session_state.api,
+        date_ranges=st.session_state.benchmark_date_ranges,
+        explain=st.session_state.benchmark_explain,
+        workers=st.session_state.benchmark_workers,
+        progress=show_progress,
+    )
+    progress_bar.empty()
+    table.empty()
 
     # create dataframe
     df = performance.create_benchmark_dataframe(results)
     st.session_state.df_query = df
 
+    # summarize captured plans per table
+    plans = [plan for data in results.values() for plan in data["plans"]]
+    st.session_state.df_plans = summarize_plans(plans) if plans else None
 
-st.button("Run queries", on_click=time_queries)
+
+st.multiselect("Date ranges", DATE_RANGES, default=["7d"], key="benchmark_date_ranges")
+st.number_input(
+    "Concurrent scenarios",
+    min_value=1,
+    max_value=15,
+    value=1,
+    key="benchmark_workers",
+    help="Scenarios run on a worker pool; results record the concurrency level.",
+)
+st.checkbox(
+    "Capture query plans (runs each query again under EXPLAIN ANALYZE)",
+    key="benchmark_explain",
+)
+if st.button("Run queries"):
+    time_queries()
 
 if st.session_state.df_query is not None:
     st.dataframe(st.session_state.df_query)
+
+st.markdown("## Connection pool")
+st.dataframe(
+    pd.DataFrame([st.session_state.api.pool_metrics()]),
+    hide_index=True,
+)
+
+st.markdown("## Multicall chunks")
+st.dataframe(chunk_stats(), hide_index=True)
+
+if st.session_state.df_plans is not None:
+    st.markdown("## Fully scanned fct_* tables")
+    st.dataframe(full_scans(st.session_state.df_plans), hide_index=True)
+
+    st.markdown("## Scans by table")
+    st.dataframe(st.session_state.df_plans, hide_index=True)
@@ -0,0 +1,366 @@
+import sys
+import json
+import sqlite3
+import logging
+import argparse
+import platform
+import subprocess
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+
+# constants
+HISTORY_DB = "benchmark_history.db"
+SCENARIO_COLUMNS = ["query_name", "chain", "date_range", "params"]
+# stored in their own columns, or as the date range label
+KEYED_PARAMS = ["chain", "start_date", "end_date"]
+MIN_SLOWDOWN = 0.10
+SIGNIFICANCE = 0.05
+PERMUTATIONS = 2000
+
+
+def git_sha() -> Optional[str]:
+    """Return the current commit, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS runs (
+            run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_at TEXT,
+            git_sha TEXT,
+            environment TEXT,
+            python_version TEXT,
+            pandas_version TEXT,
+            scenarios INTEGER,
+            num_runs INTEGER,
+            warmup_runs INTEGER,
+            label TEXT,
+            concurrency INTEGER DEFAULT 1
+        )
+        """
+    )
+    # stores created before runs recorded their concurrency
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(runs)")]
+    if "concurrency" not in columns:
+        conn.execute("ALTER TABLE runs ADD COLUMN concurrency INTEGER DEFAULT 1")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS samples (
+            run_id INTEGER,
+            query_name TEXT,
+            chain TEXT,
+            date_range TEXT,
+            params TEXT DEFAULT '',
+            execution_time REAL,
+            server_time REAL,
+            client_time REAL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS plans (
+            run_id INTEGER,
+            query_name TEXT,
+            chain TEXT,
+            date_range TEXT,
+            params TEXT DEFAULT '',
+            plan TEXT
+        )
+        """
+    )
+    # stores created before scenarios recorded their other parameters
+    for table in ["samples", "plans"]:
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+        if "params" not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN params TEXT DEFAULT ''")
+    return conn
+
+
+def _date_range_label(params: dict) -> str:
+    if "start_date" not in params or "end_date" not in params:
+        return ""
+    return f"{(params['end_date'] - params['start_date']).days}d"
+
+
+def params_key(params: dict) -> str:
+    """
+    Return a normalized key of the scenario parameters not stored elsewhere.
+
+    Resolution, market, account and the like are kept as sorted JSON, so
+    runs of the same query with different parameters are compared apart.
+    """
+    other = {name: value for name, value in params.items() if name not in KEYED_PARAMS}
+    return json.dumps(other, sort_keys=True, default=str) if other else ""
+
+
+def save_run(
+    results: dict,
+    environment: str,
+    num_runs: int,
+    warmup_runs: int,
+    label: Optional[str] = None,
+    path: str = HISTORY_DB,
+    concurrency: int = 1,
+) -> int:
+    """
+    Append a `run_benchmarks` result to the history store.
+
+    Every timed execution is kept so later runs can be compared by
+    distribution rather than by a single average, along with any captured
+    query plans. Returns the new run id.
+    """
+    with _connect(path) as conn:
+        cursor = conn.execute(
+            """
+            INSERT INTO runs (
+                run_at, git_sha, environment, python_version, pandas_version,
+                scenarios, num_runs, warmup_runs, label, concurrency
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                git_sha(),
+                environment,
+                platform.python_version(),
+                pd.__version__,
+                len(results),
+                num_runs,
+                warmup_runs,
+                label,
+                concurrency,
+            ),
+        )
+        run_id = cursor.lastrowid
+        conn.executemany(
+            """
+            INSERT INTO samples (
+                run_id, query_name, chain, date_range, params,
+                execution_time, server_time, client_time
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    run_id,
+                    data["query_name"],
+                    data["params"].get("chain", ""),
+                    data.get("date_range") or _date_range_label(data["params"]),
+                    params_key(data["params"]),
+                    execution_time,
+                    server_time,
+                    client_time,
+                )
+                for data in results.values()
+                for execution_time, server_time, client_time in zip(
+                    data["execution_times"],
+                    data["server_times"],
+                    data["client_times"],
+                )
+            ],
+        )
+        conn.executemany(
+            """
+            INSERT INTO plans (run_id, query_name, chain, date_range, params, plan)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    run_id,
+                    data["query_name"],
+                    data["params"].get("chain", ""),
+                    data.get("date_range") or _date_range_label(data["params"]),
+                    params_key(data["params"]),
+                    json.dumps(captured["plan"]),
+                )
+                for data in results.values()
+                for captured in data.get("plans", [])
+            ],
+        )
+    conn.close()
+    return run_id
+
+
+def load_runs(path: str = HISTORY_DB) -> pd.DataFrame:
+    """Return the metadata of every recorded run."""
+    with _connect(path) as conn:
+        df = pd.read_sql_query("SELECT * FROM runs ORDER BY run_id", conn)
+    conn.close()
+    return df
+
+
+def load_samples(run_id: int, path: str = HISTORY_DB) -> pd.DataFrame:
+    """Return the timed executions of one run."""
+    with _connect(path) as conn:
+        df = pd.read_sql_query(
+            "SELECT * FROM samples WHERE run_id = ?", conn, params=(run_id,)
+        )
+    conn.close()
+    return df
+
+
+def load_plans(run_id: int, path: str = HISTORY_DB) -> List[dict]:
+    """Return the query plans captured in one run."""
+    with _connect(path) as conn:
+        df = pd.read_sql_query(
+            "SELECT * FROM plans WHERE run_id = ?", conn, params=(run_id,)
+        )
+    conn.close()
+    return [{**row, "plan": json.loads(row["plan"])} for row in df.to_dict("records")]
+
+
+def permutation_pvalue(
+    baseline: np.ndarray, candidate: np.ndarray, permutations: int = PERMUTATIONS
+) -> float:
+    """
+    One-sided p-value that the candidate median is higher than the baseline.
+
+    Samples are shuffled between the two groups and the observed difference
+    in medians is compared against the shuffled ones.
+    """
+    rng = np.random.default_rng(0)
+    observed = np.median(candidate) - np.median(baseline)
+    pooled = np.concatenate([baseline, candidate])
+    count = 0
+    for _ in range(permutations):
+        shuffled = rng.permutation(pooled)
+        diff = np.median(shuffled[len(baseline) :]) - np.median(
+            shuffled[: len(baseline)]
+        )
+        count += diff >= observed
+    return (count + 1) / (permutations + 1)
+
+
+def compare_runs(
+    baseline: pd.DataFrame,
+    candidate: pd.DataFrame,
+    min_slowdown: float = MIN_SLOWDOWN,
+    significance: float = SIGNIFICANCE,
+) -> pd.DataFrame:
+    """
+    Compare two runs per scenario.
+
+    A scenario regresses when its median time grows by more than
+    `min_slowdown` and the permutation test p-value is below `significance`.
+    """
+    rows = []
+    baseline_groups = dict(list(baseline.groupby(SCENARIO_COLUMNS)))
+    for scenario, group in candidate.groupby(SCENARIO_COLUMNS):
+        if scenario not in baseline_groups:
+            continue
+        base_times = baseline_groups[scenario]["execution_time"].to_numpy()
+        times = group["execution_time"].to_numpy()
+        base_median = float(np.median(base_times))
+        median = float(np.median(times))
+        change = (median - base_median) / base_median if base_median > 0 else 0
+        pvalue = permutation_pvalue(base_times, times)
+        rows.append(
+            {
+                **dict(zip(SCENARIO_COLUMNS, scenario)),
+                "baseline_median": base_median,
+                "median": median,
+                "change": change,
+                "server_change": _median_change(
+                    baseline_groups[scenario]["server_time"], group["server_time"]
+                ),
+                "client_change": _median_change(
+                    baseline_groups[scenario]["client_time"], group["client_time"]
+                ),
+                "pvalue": pvalue,
+                "regression": change > min_slowdown and pvalue < significance,
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def _median_change(baseline: pd.Series, candidate: pd.Series) -> float:
+    base_median = baseline.median()
+    return (candidate.median() - base_median) / base_median if base_median > 0 else 0
+
+
+def print_comparison(df: pd.DataFrame, runs: Dict[str, pd.Series]):
+    """Print a formatted comparison of two benchmark runs."""
+    print("\nSynthetixAPI Benchmark Comparison")
+    print("=================================")
+    for name, run in runs.items():
+        print(
+            f"{name}: run {run['run_id']} at {run['run_at']} "
+            f"({run['git_sha'] or 'unknown sha'}, {run['environment']}, "
+            f"concurrency {run['concurrency']})"
+        )
+    if len({run["concurrency"] for run in runs.values()}) > 1:
+        print("Warning: runs used different concurrency levels")
+
+    if df.empty:
+        print("\nNo common scenarios")
+        return
+
+    print(f"\nScenarios compared: {len(df)}")
+    print(f"Regressions: {int(df['regression'].sum())}")
+    print("\nDetailed Results:")
+    print("----------------")
+    print(
+        df.sort_values("change", ascending=False).to_string(
+            index=False, float_format=lambda value: f"{value:.4f}"
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare the latest benchmark run against a baseline run."
+    )
+    parser.add_argument("--history", default=HISTORY_DB)
+    parser.add_argument(
+        "--baseline", type=int, help="baseline run id (default: the previous run)"
+    )
+    parser.add_argument(
+        "--candidate", type=int, help="candidate run id (default: the latest run)"
+    )
+    parser.add_argument("--min-slowdown", type=float, default=MIN_SLOWDOWN)
+    parser.add_argument("--significance", type=float, default=SIGNIFICANCE)
+    args = parser.parse_args()
+
+    runs = load_runs(args.history).set_index("run_id", drop=False)
+    if len(runs) < 2 and (args.baseline is None or args.candidate is None):
+        logger.error("Need at least two recorded runs to compare")
+        sys.exit(2)
+
+    candidate_id = int(args.candidate if args.candidate is not None else runs.index[-1])
+    baseline_id = int(
+        args.baseline
+        if args.baseline is not None
+        else runs.index[runs.index < candidate_id][-1]
+    )
+
+    df = compare_runs(
+        load_samples(baseline_id, args.history),
+        load_samples(candidate_id, args.history),
+        min_slowdown=args.min_slowdown,
+        significance=args.significance,
+    )
+    print_comparison(
+        df, {"Baseline": runs.loc[baseline_id], "Candidate": runs.loc[candidate_id]}
+    )
+
+    sys.exit(1 if not df.empty and df["regression"].any() else 0)
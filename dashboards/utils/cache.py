@@ -0,0 +1,525 @@
+import os
+import sys
+import json
+import time
+import pickle
+import inspect
+import logging
+import tempfile
+import functools
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Dict, Optional, TypedDict, Union
+
+import numpy as np
+import pandas as pd
+from plotly.basedatatypes import BaseFigure
+
+from api.internal_api import QueryTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# constants
+CACHE_SIZE = 512
+RECORD_DIR_ENV = "CHART_BENCHMARK_RECORD_DIR"
+MEMORY_BUDGET_ENV = "DASHBOARD_CACHE_BUDGET_MB"
+MEMORY_BUDGET_MB = 1024
+MEMORY_REPORT_DIR_ENV = "DASHBOARD_CACHE_REPORT_DIR"
+MEMORY_REPORT_DIR = os.path.join(tempfile.gettempdir(), "dashboard_cache")
+MEMORY_REPORT_INTERVAL = 30
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+COARSER_RESOLUTION = {"resolution": {"hourly": "daily"}}
+# trace properties that hold per-point data, which dominate a figure's size
+TRACE_ARRAYS = ["x", "y", "z", "customdata", "text", "hovertext", "labels", "values"]
+FRESH = "fresh"
+STALE = "stale"
+COARSER = "coarser"
+
+
+class CacheEntry(TypedDict):
+    value: Union[bytes, Dict[str, BaseFigure]]
+    bytes: int
+    data_bytes: int
+    app: str
+    page: str
+    function: str
+    expires_at: Optional[float]
+
+
+class FetchResult(dict):
+    """
+    The data returned by a `cache_fetch` function, and how it was served.
+
+    `status` is FRESH, or STALE or COARSER when a query timed out and
+    expired or coarser data was returned instead, with `message` saying so.
+    """
+
+    def __init__(self, data: dict, status: str = FRESH, message: Optional[str] = None):
+        super().__init__(data)
+        self.status = status
+        self.message = message
+
+
+def _served(result, status: str = FRESH, message: Optional[str] = None):
+    if not isinstance(result, dict):
+        return result
+    return FetchResult(result, status, message)
+
+
+def fingerprint(df: pd.DataFrame) -> tuple:
+    """
+    Return a cheap identity for a DataFrame.
+
+    Frames returned by `SynthetixAPI._run_query` carry the query key and fetch
+    timestamp in `df.attrs`, so the fingerprint is built from those and the row
+    count. Untagged frames fall back to hashing their contents.
+    """
+    if "query_key" in df.attrs and "fetched_at" in df.attrs:
+        return (df.attrs["query_key"], df.attrs["fetched_at"], len(df))
+    return (
+        "hash",
+        tuple(df.columns),
+        len(df),
+        int(pd.util.hash_pandas_object(df, index=False).sum()),
+    )
+
+
+def _fingerprint_arg(value):
+    if isinstance(value, pd.DataFrame):
+        return fingerprint(value)
+    if isinstance(value, dict):
+        return tuple((key, _fingerprint_arg(val)) for key, val in value.items())
+    return repr(value)
+
+
+def deep_size(value) -> int:
+    """
+    Estimate the memory held by a value.
+
+    DataFrames are measured with `memory_usage(deep=True)` and figures with
+    `figure_size`; containers are summed over their items.
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, BaseFigure):
+        return figure_size(value)
+    if isinstance(value, dict):
+        return sum(deep_size(val) for val in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(deep_size(val) for val in value)
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    return sys.getsizeof(value)
+
+
+def _array_size(value) -> int:
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return value.nbytes + sum(sys.getsizeof(item) for item in value.flat)
+        return value.nbytes
+    if isinstance(value, (list, tuple)):
+        return sum(sys.getsizeof(item) for item in value)
+    return 0
+
+
+def figure_size(fig: BaseFigure) -> int:
+    """
+    Estimate the memory held by a figure from its trace arrays.
+
+    Only the per-point data is counted, without serializing the figure, so
+    sizing stays cheap next to building it.
+    """
+    return sum(
+        _array_size(getattr(trace, name, None))
+        for trace in fig.data
+        for name in TRACE_ARRAYS
+    )
+
+
+def memory_budget() -> int:
+    """Return the cache memory budget in bytes."""
+    return int(float(os.environ.get(MEMORY_BUDGET_ENV, MEMORY_BUDGET_MB)) * 2**20)
+
+
+class ResultCache:
+    """
+    A bounded LRU of cached results, with hit rates and memory per page.
+
+    Entries are evicted oldest first when either the entry count or the
+    memory budget is exceeded, and expire after their TTL. Expired entries
+    stay until evicted so they can still be served when a refresh times out.
+    """
+
+    def __init__(self, maxsize: int = CACHE_SIZE, budget: Optional[int] = None):
+        self.maxsize = maxsize
+        self.budget = budget if budget is not None else memory_budget()
+        self._entries: "OrderedDict[tuple, CacheEntry]" = OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._bytes = 0
+        self._reported_at = 0.0
+        self._lock = Lock()
+
+    def get(self, page: str, key: tuple):
+        with self._lock:
+            stats = self._page_stats(page)
+            entry = self._entries.get(key)
+            if entry is None or _expired(entry):
+                stats["misses"] += 1
+                return None
+            stats["hits"] += 1
+            self._entries.move_to_end(key)
+            return entry["value"]
+
+    def get_stale(self, key: tuple):
+        """Return an entry even if it has expired, without counting a hit."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry["value"] if entry is not None else None
+
+    def set(
+        self,
+        key: tuple,
+        value,
+        size: int,
+        data_size: int,
+        app: str,
+        page: str,
+        function: str,
+        ttl: Optional[float] = None,
+    ):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = {
+                "value": value,
+                "bytes": size,
+                "data_bytes": data_size,
+                "app": app,
+                "page": page,
+                "function": function,
+                "expires_at": time.time() + ttl if ttl is not None else None,
+            }
+            self._bytes += size
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.maxsize or self._bytes > self.budget
+            ):
+                evicted_key = next(iter(self._entries))
+                self._page_stats(self._entries[evicted_key]["page"])["evictions"] += 1
+                self._remove(evicted_key)
+            report_due = time.time() - self._reported_at > MEMORY_REPORT_INTERVAL
+        if report_due:
+            self.write_report()
+
+    def _page_stats(self, page: str) -> Dict[str, int]:
+        return self._stats.setdefault(page, {"hits": 0, "misses": 0, "evictions": 0})
+
+    def _remove(self, key: tuple):
+        self._bytes -= self._entries.pop(key)["bytes"]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._stats.clear()
+            self._bytes = 0
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def stats(self) -> pd.DataFrame:
+        """Return hits, misses, hit rate, entries, bytes and evictions per page."""
+        with self._lock:
+            entries, sizes = {}, {}
+            for entry in self._entries.values():
+                entries[entry["page"]] = entries.get(entry["page"], 0) + 1
+                sizes[entry["page"]] = sizes.get(entry["page"], 0) + entry["bytes"]
+            rows = [
+                {
+                    "page": page,
+                    "hits": stats["hits"],
+                    "misses": stats["misses"],
+                    "hit_rate": (
+                        stats["hits"] / (stats["hits"] + stats["misses"])
+                        if stats["hits"] + stats["misses"] > 0
+                        else 0
+                    ),
+                    "entries": entries.get(page, 0),
+                    "bytes": sizes.get(page, 0),
+                    "evictions": stats["evictions"],
+                }
+                for page, stats in self._stats.items()
+            ]
+        return pd.DataFrame(
+            rows,
+            columns=[
+                "page",
+                "hits",
+                "misses",
+                "hit_rate",
+                "entries",
+                "bytes",
+                "evictions",
+            ],
+        )
+
+    def memory(self) -> pd.DataFrame:
+        """
+        Return entries and memory per app and cached function.
+
+        `bytes` is what the cache holds (pickled results, or figures as
+        estimated by `figure_size`) and `data_bytes` the deep size of the
+        result when it was stored.
+        """
+        with self._lock:
+            rows = [
+                {
+                    "app": entry["app"],
+                    "function": f"{entry['page']}.{entry['function']}",
+                    "bytes": entry["bytes"],
+                    "data_bytes": entry["data_bytes"],
+                }
+                for entry in self._entries.values()
+            ]
+        df = pd.DataFrame(rows, columns=["app", "function", "bytes", "data_bytes"])
+        return (
+            df.groupby(["app", "function"])
+            .agg(
+                entries=("bytes", "count"),
+                bytes=("bytes", "sum"),
+                data_bytes=("data_bytes", "sum"),
+            )
+            .reset_index()
+            .sort_values("bytes", ascending=False)
+        )
+
+    def write_report(self):
+        """
+        Write this process's memory totals for the system monitor.
+
+        Each dashboard app runs in its own process, so every process writes
+        a report to `DASHBOARD_CACHE_REPORT_DIR` and the monitor reads them all.
+        """
+        report_dir = os.environ.get(MEMORY_REPORT_DIR_ENV, MEMORY_REPORT_DIR)
+        self._reported_at = time.time()
+        report = {
+            "pid": os.getpid(),
+            "reported_at": self._reported_at,
+            "budget": self.budget,
+            "functions": self.memory().to_dict("records"),
+        }
+        try:
+            os.makedirs(report_dir, exist_ok=True)
+            path = os.path.join(report_dir, f"{os.getpid()}.json")
+            with open(f"{path}.tmp", "w") as f:
+                json.dump(report, f)
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            logger.warning(f"Could not write cache memory report: {str(e)}")
+
+
+def _expired(entry: CacheEntry) -> bool:
+    return entry["expires_at"] is not None and entry["expires_at"] < time.time()
+
+
+result_cache = ResultCache()
+
+
+def load_memory_reports() -> pd.DataFrame:
+    """Return the cache memory reports of every live dashboard process."""
+    report_dir = os.environ.get(MEMORY_REPORT_DIR_ENV, MEMORY_REPORT_DIR)
+    rows = []
+    if os.path.isdir(report_dir):
+        for filename in os.listdir(report_dir):
+            if not filename.endswith(".json"):
+                continue
+            with open(os.path.join(report_dir, filename)) as f:
+                report = json.load(f)
+            if not _process_alive(report["pid"]):
+                continue
+            rows.extend(
+                {"pid": report["pid"], "reported_at": report["reported_at"], **row}
+                for row in report["functions"]
+            )
+    return pd.DataFrame(
+        rows,
+        columns=[
+            "pid",
+            "reported_at",
+            "app",
+            "function",
+            "entries",
+            "bytes",
+            "data_bytes",
+        ],
+    )
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def session_state_sizes(session_state) -> pd.DataFrame:
+    """Return the deep size of each value in a session state."""
+    return pd.DataFrame(
+        [
+            {"key": key, "type": type(value).__name__, "bytes": deep_size(value)}
+            for key, value in session_state.items()
+        ],
+        columns=["key", "type", "bytes"],
+    ).sort_values("bytes", ascending=False)
+
+
+def page_name(path: str) -> str:
+    """Return the dotted module path of a page's file, e.g. `dashboards.x.y`."""
+    path = os.path.relpath(os.path.abspath(path), REPO_ROOT)
+    return os.path.splitext(path)[0].replace(os.sep, ".")
+
+
+def _page_name(func: Callable) -> str:
+    # keyed by module path, since pages in different apps share file names
+    return page_name(func.__code__.co_filename)
+
+
+def _app_name(func: Callable) -> str:
+    path = os.path.relpath(os.path.abspath(func.__code__.co_filename), REPO_ROOT)
+    parts = path.split(os.sep)
+    return parts[1] if len(parts) > 2 and parts[0] == "dashboards" else parts[0]
+
+
+def _cache_key(page: str, func: Callable, args: tuple, kwargs: dict) -> tuple:
+    return (
+        page,
+        func.__name__,
+        tuple(_fingerprint_arg(arg) for arg in args),
+        tuple((name, _fingerprint_arg(val)) for name, val in kwargs.items()),
+    )
+
+
+def record_inputs(page: str, args: tuple, kwargs: dict):
+    """Save the inputs of a `make_charts` call for the chart benchmarks."""
+    record_dir = os.environ[RECORD_DIR_ENV]
+    os.makedirs(record_dir, exist_ok=True)
+    with open(os.path.join(record_dir, f"{page}.pkl"), "wb") as f:
+        pickle.dump({"args": args, "kwargs": kwargs}, f)
+
+
+def _coarser_arguments(
+    func: Callable, fallback: Dict[str, Dict], args: tuple, kwargs: dict
+) -> Optional[dict]:
+    arguments = inspect.signature(func).bind(*args, **kwargs).arguments
+    coarser = {
+        name: fallback.get(name, {}).get(value, value)
+        for name, value in arguments.items()
+    }
+    return coarser if coarser != arguments else None
+
+
+def cache_fetch(
+    ttl: Optional[Union[float, str]] = None,
+    fallback: Optional[Dict[str, Dict]] = None,
+) -> Callable:
+    """
+    Cache the result of a `fetch_data` function in the shared `result_cache`.
+
+    A drop-in for `st.cache_data` that counts against the cache memory
+    budget. Results are stored pickled, as `st.cache_data` does, so every
+    caller gets its own copy. `ttl` is in seconds or a string like "30m".
+
+    When a query times out, the last cached result for the same arguments is
+    shown even if it has expired. Without one, `fallback` maps argument names
+    to coarser values, e.g. `COARSER_RESOLUTION`, and the fetch is retried
+    with those. The timeout is raised if neither applies. Dict results are
+    returned as a `FetchResult`, whose status the view can show with
+    `show_fetch_status`.
+    """
+    seconds = pd.Timedelta(ttl).total_seconds() if isinstance(ttl, str) else ttl
+
+    def decorator(func: Callable) -> Callable:
+        page, app = _page_name(func), _app_name(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _cache_key(page, func, args, kwargs)
+            cached = result_cache.get(page, key)
+            if cached is not None:
+                return _served(pickle.loads(cached))
+
+            try:
+                result = func(*args, **kwargs)
+            except QueryTimeoutError as e:
+                stale = result_cache.get_stale(key)
+                if stale is not None:
+                    message = f"{str(e)}, showing previously cached data"
+                    return _served(pickle.loads(stale), STALE, message)
+                coarser = _coarser_arguments(func, fallback or {}, args, kwargs)
+                if coarser is None:
+                    raise
+                logger.warning(f"{str(e)}, retrying {page} with {coarser}")
+                message = f"{str(e)}, showing coarser data"
+                return _served(wrapper(**coarser), COARSER, message)
+
+            payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+            result_cache.set(
+                key,
+                payload,
+                size=len(payload),
+                data_size=deep_size(result),
+                app=app,
+                page=page,
+                function=func.__name__,
+                ttl=seconds,
+            )
+            return _served(result)
+
+        return wrapper
+
+    return decorator
+
+
+def cache_charts(func: Callable) -> Callable:
+    """
+    Cache the figures returned by a `make_charts` function.
+
+    DataFrame arguments are keyed by `fingerprint` instead of by content, and
+    the figures themselves are kept in the shared `result_cache`, so a hit
+    hands `st.plotly_chart` a built figure without parsing or validating it
+    again. Cached figures are shared between sessions and must not be
+    modified. When the `CHART_BENCHMARK_RECORD_DIR` environment variable is
+    set, the inputs are also saved there for the chart benchmarks to replay.
+    """
+    page, app = _page_name(func), _app_name(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if os.environ.get(RECORD_DIR_ENV):
+            record_inputs(page, args, kwargs)
+
+        key = _cache_key(page, func, args, kwargs)
+        cached = result_cache.get(page, key)
+        if cached is not None:
+            return dict(cached)
+
+        start_time = time.time()
+        charts = func(*args, **kwargs)
+        size = deep_size(charts)
+        result_cache.set(
+            key,
+            dict(charts),
+            size=size,
+            data_size=size,
+            app=app,
+            page=page,
+            function=func.__name__,
+        )
+        logger.debug(f"Built charts for {page} in {time.time() - start_time:.4f}s")
+        return charts
+
+    return wrapper
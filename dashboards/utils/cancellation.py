@@ -0,0 +1,55 @@
+import logging
+from contextlib import contextmanager
+from typing import Callable
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from api.internal_api import QueryCancelledError
+
+logger = logging.getLogger(__name__)
+
+# Streamlit has no public signal for a superseded run, so this reads the
+# script requests of the run context. The path and `_state` are internal,
+# which is why streamlit is pinned to 1.39.x in pyproject.toml.
+try:
+    from streamlit.runtime.scriptrunner_utils.script_requests import (
+        ScriptRequestType,
+    )
+except ImportError:
+    ScriptRequestType = None
+
+
+def session_cancel_check() -> Callable[[], bool]:
+    """
+    Return a check that fires once the current script run is superseded.
+
+    A run is superseded when the user changes a widget, which requests a
+    rerun, or when the session closes, which requests a stop. Outside a
+    Streamlit run, or on a Streamlit version without the script requests
+    this relies on, the check never fires.
+    """
+    ctx = get_script_run_ctx()
+    requests = getattr(ctx, "script_requests", None)
+    if ScriptRequestType is None or not hasattr(requests, "_state"):
+        return lambda: False
+
+    def cancelled() -> bool:
+        return requests._state != ScriptRequestType.CONTINUE
+
+    return cancelled
+
+
+@contextmanager
+def cancel_on_rerun(api):
+    """
+    Cancel the session's running queries when its script run is superseded.
+
+    Wrap `nav.run()` with it. A cancelled query ends the page quietly, and
+    the runner then picks up the pending rerun or stop. `st.stop()` is not
+    used, since it would replace a pending rerun and drop the user's input.
+    """
+    with api.cancel_when(session_cancel_check()):
+        try:
+            yield
+        except QueryCancelledError as e:
+            logger.debug(f"Run superseded, {str(e).lower()}")
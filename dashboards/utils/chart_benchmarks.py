@@ -0,0 +1,317 @@
+import os
+import sys
+import json
+import time
+import pickle
+import logging
+import argparse
+import importlib
+import inspect
+import pkgutil
+import statistics
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple, TypedDict
+
+import streamlit as st
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+from dashboards.utils.cache import page_name
+from dashboards.utils.synthetic_data import SyntheticAPI
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+
+# constants
+CHART_MODULE_PACKAGES = [
+    "dashboards.all_metrics.modules.v2",
+    "dashboards.all_metrics.modules.v3",
+]
+VIEW_DIRECTORIES = ["dashboards/key_metrics/views"]
+DEFAULT_BUDGET = {
+    "build_time": 5.0,
+    "json_size": 2_000_000,
+    "traces": 50,
+    "points": 200_000,
+}
+HISTORY_FILE = "chart_benchmark_history.csv"
+
+
+class ChartMetrics(TypedDict):
+    page: str
+    chart: str
+    build_time: float
+    json_size: int
+    traces: int
+    points: int
+
+
+def benchmark_state() -> dict:
+    """Return the session state and arguments used to render every page."""
+    return {
+        "chain": "base_mainnet",
+        "resolution": "daily",
+        "market": "ETH",
+        "asset": "ETH",
+        "account_id": "1",
+        "start_date": datetime.today().date() - timedelta(days=14),
+        "end_date": datetime.today().date() + timedelta(days=1),
+    }
+
+
+def figure_metrics(page: str, chart: str, build_time: float, spec: str) -> ChartMetrics:
+    """Measure the serialized size, trace and point counts of a figure."""
+    figure = json.loads(spec)
+    traces = figure.get("data", [])
+    return {
+        "page": page,
+        "chart": chart,
+        "build_time": build_time,
+        "json_size": len(spec),
+        "traces": len(traces),
+        "points": sum(len(trace.get("y", trace.get("x", []))) for trace in traces),
+    }
+
+
+def discover_chart_modules() -> list:
+    """Import every dashboard module that defines `make_charts`."""
+    modules = []
+    for package_name in CHART_MODULE_PACKAGES:
+        package = importlib.import_module(package_name)
+        for module_info in pkgutil.iter_modules(package.__path__):
+            module = importlib.import_module(f"{package_name}.{module_info.name}")
+            if hasattr(module, "make_charts"):
+                modules.append(module)
+    return modules
+
+
+def discover_views() -> List[str]:
+    """List the view scripts to render with AppTest."""
+    return [
+        os.path.join(directory, filename)
+        for directory in VIEW_DIRECTORIES
+        for filename in sorted(os.listdir(directory))
+        if filename.endswith(".py")
+    ]
+
+
+def load_module_inputs(module, api, data_dir: Optional[str] = None):
+    """Return recorded `make_charts` inputs, or build them from `fetch_data`."""
+    page = page_name(module.__file__)
+    if data_dir is not None:
+        path = os.path.join(data_dir, f"{page}.pkl")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                recorded = pickle.load(f)
+            return recorded["args"], recorded["kwargs"]
+
+    state = benchmark_state()
+    st.session_state.api = api
+    for key, value in state.items():
+        st.session_state[key] = value
+
+    fetch_params = inspect.signature(module.fetch_data).parameters
+    data = module.fetch_data(**{param: state[param] for param in fetch_params})
+
+    chart_params = list(inspect.signature(module.make_charts).parameters)[1:]
+    return (data, *[state[param] for param in chart_params]), {}
+
+
+def benchmark_module(
+    module, api, data_dir: Optional[str] = None, num_runs: int = 3
+) -> List[ChartMetrics]:
+    """Time `make_charts` for a module and measure each figure it returns."""
+    page = page_name(module.__file__)
+    args, kwargs = load_module_inputs(module, api, data_dir)
+
+    # bypass the chart cache so every run builds the figures
+    make_charts = getattr(module.make_charts, "__wrapped__", module.make_charts)
+
+    build_times = []
+    for _ in range(num_runs):
+        start_time = time.perf_counter()
+        charts = make_charts(*args, **kwargs)
+        build_times.append(time.perf_counter() - start_time)
+    build_time = statistics.median(build_times)
+
+    return [
+        figure_metrics(page, name, build_time, fig.to_json())
+        for name, fig in charts.items()
+    ]
+
+
+def benchmark_view(path: str, api, num_runs: int = 3) -> List[ChartMetrics]:
+    """Render a view script and measure every Plotly chart it displays."""
+    page = page_name(path)
+    app = AppTest.from_file(path, default_timeout=120)
+    app.session_state["api"] = api
+
+    # the first run fills the data cache so timed runs measure charts only
+    app.run()
+    build_times = []
+    for _ in range(num_runs):
+        start_time = time.perf_counter()
+        app.run()
+        build_times.append(time.perf_counter() - start_time)
+    if len(app.exception) > 0:
+        raise RuntimeError(app.exception[0].value)
+    build_time = statistics.median(build_times)
+
+    metrics = []
+    for idx, element in enumerate(app.get("plotly_chart")):
+        spec = element.proto.spec
+        title = json.loads(spec).get("layout", {}).get("title", {})
+        chart = title.get("text", f"chart_{idx}") if isinstance(title, dict) else title
+        metrics.append(figure_metrics(page, chart, build_time, spec))
+    return metrics
+
+
+def run_chart_benchmarks(
+    api=None, data_dir: Optional[str] = None, num_runs: int = 3
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Benchmark every `make_charts` module and view.
+
+    Returns the chart metrics and one row per page that failed to build.
+    """
+    logger.info("Starting chart benchmark run")
+    api = api if api is not None else SyntheticAPI()
+    results: List[ChartMetrics] = []
+    failures = []
+
+    for module in discover_chart_modules():
+        logger.info(f"Benchmarking {module.__name__}")
+        try:
+            results.extend(benchmark_module(module, api, data_dir, num_runs))
+        except Exception as e:
+            logger.error(f"Error in {module.__name__}: {str(e)}")
+            failures.append({"page": module.__name__, "error": str(e)})
+
+    for path in discover_views():
+        logger.info(f"Benchmarking {path}")
+        try:
+            results.extend(benchmark_view(path, api, num_runs))
+        except Exception as e:
+            logger.error(f"Error in {path}: {str(e)}")
+            failures.append({"page": path, "error": str(e)})
+
+    logger.info("Chart benchmark run completed")
+    return (
+        pd.DataFrame(results, columns=list(ChartMetrics.__annotations__)),
+        pd.DataFrame(failures, columns=["page", "error"]),
+    )
+
+
+def load_budgets(path: Optional[str] = None) -> Dict[str, dict]:
+    """
+    Load chart budgets from a JSON file.
+
+    Keys are "default", a page's module path such as
+    "dashboards.key_metrics.views.perps", or "<page>.<chart>", each mapping to any
+    of `build_time`, `json_size`, `traces` and `points`. More specific keys
+    override less specific ones.
+    """
+    budgets = {"default": dict(DEFAULT_BUDGET)}
+    if path is not None:
+        with open(path) as f:
+            loaded = json.load(f)
+        budgets["default"].update(loaded.pop("default", {}))
+        budgets.update(loaded)
+    return budgets
+
+
+def check_budgets(df: pd.DataFrame, budgets: Dict[str, dict]) -> pd.DataFrame:
+    """Return one row per chart metric that exceeds its budget."""
+    violations = []
+    timed_pages = set()
+    for row in df.to_dict("records"):
+        budget = {
+            **budgets.get("default", {}),
+            **budgets.get(row["page"], {}),
+            **budgets.get(f"{row['page']}.{row['chart']}", {}),
+        }
+        for metric, limit in budget.items():
+            # build time is measured per page, so only check it once
+            if metric == "build_time" and row["page"] in timed_pages:
+                continue
+            if row[metric] > limit:
+                violations.append(
+                    {
+                        "page": row["page"],
+                        "chart": row["chart"],
+                        "metric": metric,
+                        "value": row[metric],
+                        "budget": limit,
+                    }
+                )
+        timed_pages.add(row["page"])
+    return pd.DataFrame(
+        violations, columns=["page", "chart", "metric", "value", "budget"]
+    )
+
+
+def save_history(df: pd.DataFrame, path: str = HISTORY_FILE) -> str:
+    """Append a benchmark run to the history CSV."""
+    df = df.assign(run_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    df.to_csv(path, mode="a", header=not os.path.exists(path), index=False)
+    return path
+
+
+def print_report(df: pd.DataFrame, violations: pd.DataFrame, failures: pd.DataFrame):
+    """Print a formatted report of chart benchmark results."""
+    print("\nChart Benchmark Report")
+    print("======================")
+
+    pages = df.groupby("page").agg(
+        build_time=("build_time", "first"),
+        charts=("chart", "count"),
+        json_size=("json_size", "sum"),
+        traces=("traces", "sum"),
+        points=("points", "sum"),
+    )
+    print(f"\nPages: {len(pages)}")
+    print(f"Charts: {len(df)}")
+    print("\nPer page:")
+    print(pages.sort_values("build_time", ascending=False).to_string())
+
+    print("\nBudget violations:")
+    if violations.empty:
+        print("  None")
+    else:
+        print(violations.to_string(index=False))
+
+    print("\nFailed pages:")
+    if failures.empty:
+        print("  None")
+    else:
+        print(failures.to_string(index=False))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark dashboard chart build time and payload size."
+    )
+    parser.add_argument("--periods", type=int, default=90)
+    parser.add_argument("--groups", type=int, default=10)
+    parser.add_argument("--freq", default="D")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument(
+        "--data-dir",
+        help="directory of inputs recorded with CHART_BENCHMARK_RECORD_DIR",
+    )
+    parser.add_argument("--budgets", help="JSON file of per-page or per-chart budgets")
+    parser.add_argument("--history", default=HISTORY_FILE)
+    args = parser.parse_args()
+
+    api = SyntheticAPI(periods=args.periods, groups=args.groups, freq=args.freq)
+    df, failures = run_chart_benchmarks(api, data_dir=args.data_dir, num_runs=args.runs)
+    violations = check_budgets(df, load_budgets(args.budgets))
+
+    print_report(df, violations, failures)
+    logger.info(f"Results saved to {save_history(df, args.history)}")
+
+    sys.exit(1 if not violations.empty or not failures.empty else 0)
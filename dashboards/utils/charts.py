@@ -8,6 +8,10 @@ from dashboards.utils.formatting import human_format as format_func
 
 # Constants
 HOVER_PREFIX_MAP = {"$": "$", "#": "", "%": ""}
+# d3 formats for hover text rendered in the browser, showing the same values
+# as `human_format`: dollars to 3 significant digits, written out in full
+# since d3 only abbreviates with SI prefixes, and counts as whole numbers
+D3_FORMAT_MAP = {"$": "$,.3r", "#": ",.0f", "%": ".2%"}
 SEQUENTIAL_COLORS = [
     "#E5FAFF",
     "#B7F2FF",
@@ -28,6 +32,9 @@ DEFAULT_LINE_WIDTH = 0
 HELP_TEXT_BGCOLOR = "#333333"
 HELP_TEXT_FONT_SIZE = 14
 HELP_TEXT_FONT_COLOR = "white"
+OTHER_LABEL = "Other"
+TOP_N = 10
+CUMULATIVE_PREFIX = "cumulative_"
 
 
 def chart_bars(
@@ -46,8 +53,14 @@ def chart_bars(
     sort_by_last_value: bool = True,
     sort_ascending: bool = False,
     unified_hover: bool = True,
+    top_n: Optional[int] = None,
+    top_n_by: Optional[str] = None,
+    client_hover: bool = False,
 ):
     """Create a bar chart."""
+    frame = _chart_frame(df, x_col, y_cols, color_by, top_n, top_n_by)
+    if frame is not None:
+        df, color_by = frame.df, frame.color_by
     if isinstance(y_cols, str):
         traces = _create_traces_from_string(
             df,
@@ -57,15 +70,19 @@ def chart_bars(
             color_by,
             human_format,
             y_format,
+            client_hover=client_hover,
+            frame=frame,
         )
     else:
         traces = _create_traces_from_list(
-            df, x_col, y_cols, "bar", human_format, y_format
+            df, x_col, y_cols, "bar", human_format, y_format, client_hover=client_hover
         )
     if sort_by_last_value:
         traces = sort_traces(traces, sort_ascending)
     if custom_agg is not None:
-        traces = add_aggregation(traces, custom_agg, df, x_col, y_format, human_format)
+        traces = add_aggregation(
+            traces, custom_agg, df, x_col, y_format, human_format, client_hover
+        )
     fig = go.Figure(
         traces,
         layout=dict(
@@ -128,8 +145,14 @@ def chart_area(
     human_format: bool = True,
     custom_agg: Optional[Dict[str, str]] = None,
     unified_hover: bool = True,
+    top_n: Optional[int] = None,
+    top_n_by: Optional[str] = None,
+    client_hover: bool = False,
 ):
     """Create an area chart."""
+    frame = _chart_frame(df, x_col, y_cols, color_by, top_n, top_n_by)
+    if frame is not None:
+        df, color_by = frame.df, frame.color_by
     if isinstance(y_cols, str):
         traces = _create_traces_from_string(
             df=df,
@@ -140,6 +163,8 @@ def chart_area(
             human_format=human_format,
             y_format=y_format,
             stackgroup="one",
+            client_hover=client_hover,
+            frame=frame,
         )
     else:
         traces = _create_traces_from_list(
@@ -150,11 +175,14 @@ def chart_area(
             human_format=human_format,
             y_format=y_format,
             stackgroup="one",
+            client_hover=client_hover,
         )
     if sort_by_last_value:
         traces = sort_traces(traces, sort_ascending)
     if custom_agg is not None:
-        traces = add_aggregation(traces, custom_agg, df, x_col, y_format, human_format)
+        traces = add_aggregation(
+            traces, custom_agg, df, x_col, y_format, human_format, client_hover
+        )
     fig = go.Figure(
         traces,
         layout=dict(
@@ -187,8 +215,14 @@ def chart_lines(
     human_format: bool = True,
     custom_agg: Optional[Dict[str, str]] = None,
     unified_hover: bool = True,
+    top_n: Optional[int] = None,
+    top_n_by: Optional[str] = None,
+    client_hover: bool = False,
 ):
     """Create a line chart."""
+    frame = _chart_frame(df, x_col, y_cols, color_by, top_n, top_n_by)
+    if frame is not None:
+        df, color_by = frame.df, frame.color_by
     if isinstance(y_cols, str):
         traces = _create_traces_from_string(
             df,
@@ -199,6 +233,8 @@ def chart_lines(
             human_format=human_format,
             y_format=y_format,
             stackgroup="",
+            client_hover=client_hover,
+            frame=frame,
         )
     else:
         traces = _create_traces_from_list(
@@ -209,11 +245,14 @@ def chart_lines(
             human_format=human_format,
             y_format=y_format,
             stackgroup="",
+            client_hover=client_hover,
         )
     if sort_by_last_value:
         traces = sort_traces(traces, sort_ascending)
     if custom_agg is not None:
-        traces = add_aggregation(traces, custom_agg, df, x_col, y_format, human_format)
+        traces = add_aggregation(
+            traces, custom_agg, df, x_col, y_format, human_format, client_hover
+        )
     fig = go.Figure(traces)
     fig.update_layout(
         title=title,
@@ -250,6 +289,176 @@ def chart_oi(df, x_col: str, title: str, help_text: Optional[str] = None):
     return fig
 
 
+class ChartFrame:
+    """A DataFrame grouped once by `color_by` and shared by many charts.
+
+    Pages that draw several charts from the same frame and grouping key can
+    build a ChartFrame once and pass it as `df` to `chart_bars`, `chart_area`
+    and `chart_lines`, instead of regrouping the frame for every chart.
+    """
+
+    def __init__(self, df: pd.DataFrame, x_col: str, color_by: str):
+        self.df = df
+        self.x_col = x_col
+        self.color_by = color_by
+
+        # factorize once and slice each group out of a single stable sort
+        self.codes, self.labels = pd.factorize(df[color_by], sort=True)
+        order = np.argsort(self.codes, kind="stable")
+        bounds = np.searchsorted(
+            self.codes[order], np.arange(len(self.labels) + 1), side="left"
+        )
+        self.groups = {
+            label: df.iloc[order[bounds[i] : bounds[i + 1]]]
+            for i, label in enumerate(self.labels)
+        }
+        self.x_index = pd.Index(df[x_col][self.codes >= 0].unique()).sort_values()
+
+        self._filled_groups = None
+        self._collapsed = {}
+
+    def filled_groups(self) -> Dict[str, pd.DataFrame]:
+        """Return each group indexed by `x_index`, with missing x values as 0."""
+        if self._filled_groups is None:
+            self._filled_groups = {
+                label: group.set_index(self.x_col).reindex(self.x_index, fill_value=0)
+                for label, group in self.groups.items()
+            }
+        return self._filled_groups
+
+    @classmethod
+    def _from_groups(
+        cls, groups: Dict[str, pd.DataFrame], x_col: str, color_by: str, x_index
+    ) -> "ChartFrame":
+        # build a frame from groups that are already split, without regrouping
+        frame = cls.__new__(cls)
+        frame.x_col = x_col
+        frame.color_by = color_by
+        frame.labels = pd.Index(sorted(groups))
+        frame.groups = {label: groups[label] for label in frame.labels}
+        frame.codes = np.repeat(
+            np.arange(len(frame.labels)),
+            [len(group) for group in frame.groups.values()],
+        )
+        frame.df = pd.concat(frame.groups.values(), ignore_index=True)
+        frame.x_index = x_index
+        frame._filled_groups = None
+        frame._collapsed = {}
+        return frame
+
+    def top_n(self, top_n: int, rank_by: str) -> "ChartFrame":
+        """
+        Return a ChartFrame with all but the top N groups collapsed into "Other".
+
+        The ranking and the collapse are done once per `top_n` and `rank_by`
+        for every numeric column, as `collapse_top_n` does, and the groups
+        kept are reused as they are, so charts of different columns share
+        one collapsed frame.
+        """
+        key = (top_n, rank_by)
+        if key not in self._collapsed:
+            totals = pd.Series(
+                {
+                    label: group[rank_by].abs().sum()
+                    for label, group in self.groups.items()
+                },
+                dtype=float,
+            )
+            if len(totals) <= top_n:
+                self._collapsed[key] = self
+                return self
+
+            top_labels = set(totals.nlargest(top_n).index)
+            value_cols = [
+                col
+                for col in self.df.select_dtypes("number").columns
+                if col not in (self.x_col, self.color_by)
+            ]
+            others = pd.concat(
+                [
+                    group
+                    for label, group in self.groups.items()
+                    if label not in top_labels
+                ]
+            )
+            groups = {
+                label: group
+                for label, group in self.groups.items()
+                if label in top_labels
+            }
+            groups[OTHER_LABEL] = _collapse_other(
+                others, self.x_col, value_cols, self.color_by, self.x_index
+            )
+            self._collapsed[key] = ChartFrame._from_groups(
+                groups, self.x_col, self.color_by, self.x_index
+            )
+        return self._collapsed[key]
+
+
+def _collapse_other(
+    others: pd.DataFrame, x_col: str, cols: List[str], color_by: str, x_index
+) -> pd.DataFrame:
+    # sum the collapsed groups per x value, forward filling cumulative columns
+    # per group so "Other" does not drop where one of them has no row
+    other = others.groupby(x_col)[cols].sum()
+    cumulative = [col for col in cols if col.startswith(CUMULATIVE_PREFIX)]
+    if cumulative:
+        other = other.reindex(x_index, fill_value=0)
+        filled = (
+            others.pivot_table(
+                index=x_col, columns=color_by, values=cumulative, aggfunc="sum"
+            )
+            .reindex(x_index)
+            .ffill()
+            .fillna(0)
+        )
+        other[cumulative] = filled.T.groupby(level=0).sum().T[cumulative]
+    return other.rename_axis(x_col).reset_index().assign(**{color_by: OTHER_LABEL})
+
+
+def collapse_top_n(
+    df,
+    x_col: str,
+    y_cols: Union[str, List[str]],
+    color_by: str,
+    top_n: int,
+    rank_by: Optional[str] = None,
+):
+    """
+    Keep the top N groups by total `rank_by` and sum the rest into "Other".
+
+    Cumulative columns (named `cumulative_*`) carry each collapsed group's
+    last value forward, so "Other" does not drop at x values where one of
+    its groups has no row. Rows without a label are left as they are.
+    """
+    rank_by = rank_by or y_cols
+    totals = df[rank_by].abs().groupby(df[color_by], sort=False).sum()
+    if len(totals) <= top_n:
+        return df
+
+    top_labels = totals.nlargest(top_n).index
+    collapse = df[color_by].notna() & ~df[color_by].isin(top_labels)
+    cols = [y_cols] if isinstance(y_cols, str) else list(y_cols)
+    x_index = pd.Index(df[x_col].unique()).sort_values()
+    other = _collapse_other(df[collapse], x_col, cols, color_by, x_index)
+    return pd.concat([df[~collapse], other], ignore_index=True)
+
+
+def _chart_frame(df, x_col, y_cols, color_by, top_n, top_n_by):
+    """Return the ChartFrame grouped traces are built from, if any."""
+    if isinstance(df, ChartFrame):
+        if df.x_col != x_col:
+            raise ValueError(f"ChartFrame is indexed by {df.x_col}, not {x_col}")
+        if top_n is not None and isinstance(y_cols, str):
+            return df.top_n(top_n, top_n_by or y_cols)
+        return df
+    if color_by is None or not isinstance(y_cols, str):
+        return None
+    if top_n is not None:
+        df = collapse_top_n(df, x_col, y_cols, color_by, top_n, top_n_by)
+    return ChartFrame(df, x_col, color_by)
+
+
 def set_axes(fig, x_format: str, y_format: str):
     """Format axes based on specified formats."""
     format_map = {"%": ".2%", "$": "$", "#": None}
@@ -326,23 +535,18 @@ def sort_traces(traces, sort_ascending):
     return traces
 
 
-def add_aggregation(traces, custom_agg, df, x_col, y_format, human_format):
-    percentage = True if y_format == "%" else False
-    no_decimals = False if y_format == "$" else True
+def add_aggregation(
+    traces, custom_agg, df, x_col, y_format, human_format, client_hover=False
+):
     if custom_agg is not None:
         field = custom_agg.get("field")
         name = custom_agg.get("name", "Total")
         agg = custom_agg.get("agg", "sum")
         y = df.groupby(x_col)[field].agg(agg).reset_index()
-        custom_data = (
-            y[field].apply(
-                format_func,
-                args=(no_decimals, percentage),
-            )
-            if human_format
-            else y[field]
+        custom_data, hover_value = _hover_value(
+            y[field], y_format, human_format, client_hover
         )
-        hover_template = f"<extra></extra><b>%{{fullData.name}}: {HOVER_PREFIX_MAP[y_format]}%{{customdata}}</b>"
+        hover_template = f"<extra></extra><b>%{{fullData.name}}: {hover_value}</b>"
         trace = _create_trace(
             x=y[x_col],
             y=y[field],
@@ -358,6 +562,30 @@ def add_aggregation(traces, custom_agg, df, x_col, y_format, human_format):
     return traces
 
 
+def _hover_value(
+    y: pd.Series,
+    y_format: str = "$",
+    human_format: bool = True,
+    client_hover: bool = False,
+):
+    """Return the customdata and hover placeholder used to display `y`.
+
+    With `client_hover`, the value is formatted in the browser with a d3-format
+    specifier and no customdata is shipped with the trace.
+    """
+    if client_hover:
+        if not human_format:
+            return None, f"{HOVER_PREFIX_MAP[y_format]}%{{y}}"
+        return None, f"%{{y:{D3_FORMAT_MAP[y_format]}}}"
+
+    custom_data = y
+    if human_format:
+        percentage = True if y_format == "%" else False
+        no_decimals = False if y_format == "$" else True
+        custom_data = y.apply(format_func, args=(no_decimals, percentage))
+    return custom_data, f"{HOVER_PREFIX_MAP[y_format]}%{{customdata}}"
+
+
 def _create_traces_from_list(
     df,
     x_col: str,
@@ -367,16 +595,15 @@ def _create_traces_from_list(
     y_format: str = "$",
     stackgroup: Optional[str] = "one",
     color_map: Optional[Dict[str, str]] = CATEGORICAL_COLORS,
+    client_hover: bool = False,
 ):
     traces = []
-    percentage = True if y_format == "%" else False
-    no_decimals = False if y_format == "$" else True
     for i, y_col in enumerate(y_cols):
         color = color_map[i % len(color_map)]
-        hover_template = f"<extra></extra>%{{fullData.name}}: {HOVER_PREFIX_MAP[y_format]}%{{customdata}}"
-        custom_data = df[y_col]
-        if human_format:
-            custom_data = custom_data.apply(format_func, args=(no_decimals, percentage))
+        custom_data, hover_value = _hover_value(
+            df[y_col], y_format, human_format, client_hover
+        )
+        hover_template = f"<extra></extra>%{{fullData.name}}: {hover_value}"
         trace = _create_trace(
             x=df[x_col],
             y=df[y_col],
@@ -403,28 +630,22 @@ def _create_traces_from_string(
     y_format: str = "$",
     stackgroup: Optional[str] = "one",
     color_map: Optional[Dict[str, str]] = CATEGORICAL_COLORS,
+    client_hover: bool = False,
+    frame: Optional[ChartFrame] = None,
 ):
     traces = []
-    percentage = True if y_format == "%" else False
-    no_decimals = False if y_format == "$" else True
     if color_by is not None:
-        if trace_type == "area":
-            # Get all unique indexes
-            all_indexes = pd.Index([])
-            for _, group in df.groupby(color_by):
-                all_indexes = all_indexes.union(group[x_col])
-
-        for i, (label, group) in enumerate(df.groupby(color_by)):
-            if trace_type == "area":
-                # Reindex the group to include all x values
-                group = group.set_index(x_col).reindex(all_indexes, fill_value=0)
+        if frame is None:
+            frame = ChartFrame(df, x_col, color_by)
+        # area groups are reindexed to include all x values
+        groups = frame.filled_groups() if trace_type == "area" else frame.groups
+
+        for i, (label, group) in enumerate(groups.items()):
             color = color_map[i % len(color_map)]
-            custom_data = group[y_cols]
-            if human_format:
-                custom_data = custom_data.apply(
-                    format_func, args=(no_decimals, percentage)
-                )
-            hover_template = f"<extra></extra>%{{fullData.name}}: {HOVER_PREFIX_MAP[y_format]}%{{customdata}}"
+            custom_data, hover_value = _hover_value(
+                group[y_cols], y_format, human_format, client_hover
+            )
+            hover_template = f"<extra></extra>%{{fullData.name}}: {hover_value}"
             trace = _create_trace(
                 x=group.index if trace_type == "area" else group[x_col],
                 y=group[y_cols],
@@ -440,7 +661,10 @@ def _create_traces_from_string(
             traces.append(trace)
     else:
         color = color_map[0]
-        hover_template = f"<extra></extra>%{{fullData.name}}: {HOVER_PREFIX_MAP[y_format]}%{{customdata}}"
+        custom_data, hover_value = _hover_value(
+            df[y_cols], y_format, True, client_hover
+        )
+        hover_template = f"<extra></extra>%{{fullData.name}}: {hover_value}"
         trace = _create_trace(
             x=df[x_col],
             y=df[y_cols],
@@ -448,7 +672,7 @@ def _create_traces_from_string(
             color=color,
             trace_type=trace_type,
             legendrank=0,
-            custom_data=df[y_cols].apply(format_func, args=(no_decimals, percentage)),
+            custom_data=custom_data,
             hover_template=hover_template,
             show_legend=True,
         )
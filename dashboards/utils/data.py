@@ -9,3 +9,10 @@ def export_data(title, df):
         f"Download CSV", csv, "export.csv", "text/csv", key=f"{title}-csv"
     )
     st.write(df.head(25))
+
+
+def show_fetch_status(data):
+    """Warn when data from a `cache_fetch` function is stale or coarser."""
+    message = getattr(data, "message", None)
+    if message is not None:
+        st.warning(message)
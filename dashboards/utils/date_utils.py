@@ -4,7 +4,11 @@ from datetime import datetime, timedelta
 def get_start_date(date_range: str) -> datetime:
     end_date = datetime.now()
 
-    if date_range == "30d":
+    if date_range == "1d":
+        return end_date - timedelta(days=1)
+    elif date_range == "7d":
+        return end_date - timedelta(days=7)
+    elif date_range == "30d":
         return end_date - timedelta(days=30)
     elif date_range == "90d":
         return end_date - timedelta(days=90)
@@ -1,9 +1,32 @@
 import streamlit as st
 import time
+import random
 import logging
-from typing import Dict, List, Tuple, TypedDict
-from datetime import datetime, timedelta
+import argparse
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple, TypedDict
+from datetime import datetime
+import numpy as np
 import pandas as pd
+from sqlalchemy import event
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from api.internal_api import MAX_OVERFLOW, POOL_SIZE, SynthetixAPI, get_db_config
+from dashboards.utils.date_utils import get_start_date
+from dashboards.utils.benchmark_history import HISTORY_DB, save_run
+from dashboards.utils.query_plans import capture_plans, plan_nodes
+from dashboards.utils.scenarios import (
+    DATE_RANGES,
+    SCENARIO_REGISTRY,
+    expand_grid,
+    load_registered_scenarios,
+)
+from dashboards.key_metrics.constants import (
+    SUPPORTED_CHAINS_CORE,
+    SUPPORTED_CHAINS_PERPS,
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -12,104 +35,350 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# constants
+LOAD_CONCURRENCY_LEVELS = [1, 5, 10, 20]
+LOAD_DURATION = 30
+LOAD_THINK_TIME = (1.0, 3.0)
+API_SCENARIO_GRIDS = {
+    "get_volume": {
+        "chain": list(SUPPORTED_CHAINS_PERPS),
+        "resolution": ["daily", "hourly"],
+    },
+    "get_core_stats": {"chain": list(SUPPORTED_CHAINS_CORE)},
+    "get_core_stats_by_collateral": {
+        "chain": list(SUPPORTED_CHAINS_CORE),
+        "resolution": ["24h", "7d", "28d"],
+    },
+    "get_core_account_activity": {
+        "chain": list(SUPPORTED_CHAINS_CORE),
+        "resolution": ["daily", "monthly"],
+    },
+    "get_core_nof_stakers": {"chain": list(SUPPORTED_CHAINS_CORE)},
+    "get_perps_stats": {
+        "chain": list(SUPPORTED_CHAINS_PERPS),
+        "resolution": ["daily", "hourly"],
+    },
+    "get_perps_open_interest": {
+        "chain": list(SUPPORTED_CHAINS_PERPS),
+        "resolution": ["daily", "hourly"],
+    },
+    "get_perps_markets_history": {"chain": list(SUPPORTED_CHAINS_PERPS)},
+    "get_perps_account_activity": {
+        "chain": list(SUPPORTED_CHAINS_PERPS),
+        "resolution": ["day", "month"],
+    },
+    "get_snx_token_buyback": {"chain": ["base_mainnet"]},
+    "get_perps_v2_stats": {"resolution": ["daily", "hourly"]},
+    "get_perps_v2_open_interest": {"resolution": ["daily", "hourly"]},
+}
+
+
+class LoadSample(TypedDict):
+    bundle: str
+    latency: float
+    queries: int
+    error: Optional[str]
+
 
 class BenchmarkData(TypedDict):
     query_name: str
+    date_range: Optional[str]
     params: dict
     execution_times: List[float]
+    server_times: List[float]
+    client_times: List[float]
+    cold_time: Optional[float]
     errors: List[str]
+    plans: List[dict]
+    concurrency: int
 
 
-def create_benchmark_data(query_name: str, params: dict) -> BenchmarkData:
+def create_benchmark_data(
+    query_name: str, params: dict, date_range: Optional[str] = None
+) -> BenchmarkData:
     """Create a new benchmark data dictionary."""
     return {
         "query_name": query_name,
+        "date_range": date_range,
         "params": params,
         "execution_times": [],
+        "server_times": [],
+        "client_times": [],
+        "cold_time": None,
         "errors": [],
+        "plans": [],
+        "concurrency": 1,
     }
 
 
 def calculate_stats(benchmark_data: BenchmarkData) -> Dict[str, float]:
-    """Calculate statistics for a benchmark result."""
+    """
+    Calculate statistics for a benchmark result.
+
+    Only warm runs are included; the first warmup run is reported separately
+    as `cold_time`.
+    """
     times = benchmark_data["execution_times"]
     if not times:
-        return {"avg_time": 0, "min_time": 0, "max_time": 0, "success_rate": 0}
+        return {
+            "avg_time": 0,
+            "min_time": 0,
+            "max_time": 0,
+            "median_time": 0,
+            "p95_time": 0,
+            "p99_time": 0,
+            "stddev_time": 0,
+            "median_server_time": 0,
+            "median_client_time": 0,
+            "cold_time": benchmark_data["cold_time"] or 0,
+            "success_rate": 0,
+        }
 
     total_attempts = len(times) + len(benchmark_data["errors"])
+    p95, p99 = np.percentile(times, [95, 99])
     return {
         "avg_time": sum(times) / len(times),
         "min_time": min(times),
         "max_time": max(times),
+        "median_time": float(np.median(times)),
+        "p95_time": float(p95),
+        "p99_time": float(p99),
+        "stddev_time": float(np.std(times, ddof=1)) if len(times) > 1 else 0,
+        "median_server_time": float(np.median(benchmark_data["server_times"])),
+        "median_client_time": float(np.median(benchmark_data["client_times"])),
+        "cold_time": benchmark_data["cold_time"] or 0,
         "success_rate": len(times) / total_attempts if total_attempts > 0 else 0,
     }
 
 
-def time_query(api, query_name: str, *args, **kwargs) -> float:
-    """Execute a query and measure its execution time."""
-    start_time = time.time()
-    getattr(api, query_name)(*args, **kwargs)
-    end_time = time.time()
-    return end_time - start_time
-
-
-def generate_scenarios(api) -> List[Tuple[str, dict]]:
-    """Generate test scenarios for benchmarking."""
-    end_date = datetime.now()
-    date_ranges = {
-        "1d": end_date - timedelta(days=1),
-        "7d": end_date - timedelta(days=7),
-        "30d": end_date - timedelta(days=30),
-    }
-
+@contextmanager
+def track_cursor_time(api):
+    """
+    Accumulate time spent in DBAPI `cursor.execute` calls, per thread.
+
+    Yields a thread-local whose `execute_ns` counter is advanced by every
+    statement the API's engine runs. With psycopg2 the execute call returns
+    once the server has run the query and sent the rows, so the remainder of
+    a query's wall time is client-side fetch and DataFrame construction.
+    """
+    timings = threading.local()
+    engine = getattr(api, "engine", None)
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        timings.started_ns = time.perf_counter_ns()
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        elapsed = time.perf_counter_ns() - timings.started_ns
+        timings.execute_ns = getattr(timings, "execute_ns", 0) + elapsed
+
+    if engine is not None:
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    try:
+        yield timings
+    finally:
+        if engine is not None:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+            event.remove(engine, "after_cursor_execute", after_cursor_execute)
+
+
+def time_query(
+    api, query_name: str, *args, cursor_time=None, **kwargs
+) -> Tuple[float, float]:
+    """
+    Execute a query and measure its execution time.
+
+    Returns the total and server-side times in seconds. The server time is
+    only measured when a `track_cursor_time` tracker is passed in, and is 0
+    otherwise.
+    """
+    if cursor_time is not None:
+        cursor_time.execute_ns = 0
+    start_time = time.perf_counter_ns()
+    resolve_query(api, query_name)(*args, **kwargs)
+    end_time = time.perf_counter_ns()
+
+    server_ns = getattr(cursor_time, "execute_ns", 0)
+    return (end_time - start_time) / 1e9, server_ns / 1e9
+
+
+def generate_scenarios(
+    api, date_ranges: List[str] = DATE_RANGES
+) -> List[Tuple[str, str, dict]]:
+    """
+    Generate test scenarios for benchmarking.
+
+    Covers every `get_*` method on the API over `API_SCENARIO_GRIDS`, and every
+    dashboard fetch function registered with `register_scenarios` over its own
+    grid. Returns (query_name, date_range, params) tuples.
+    """
     queries = [
         method
         for method in dir(api)
         if method.startswith("get_") and callable(getattr(api, method))
     ]
-    v3_queries = [query for query in queries if "v2" not in query]
 
     scenarios = [
-        (
-            query_name,
-            {
-                "start_date": start_date,
-                "end_date": end_date,
-                "chain": chain,
-            },
+        (query_name, date_range, params)
+        for query_name in queries
+        for date_range, params in expand_grid(
+            API_SCENARIO_GRIDS.get(query_name, {}), date_ranges
         )
-        for query_name in v3_queries
-        for start_date_label, start_date in date_ranges.items()
-        for chain in ["arbitrum_mainnet", "base_mainnet"]
     ]
+    scenarios.extend(
+        (name, date_range, params)
+        for name, spec in load_registered_scenarios().items()
+        for date_range, params in expand_grid(
+            spec["grid"],
+            [
+                date_range
+                for date_range in spec["date_ranges"]
+                if date_range in date_ranges
+            ],
+        )
+    )
 
     return scenarios
 
 
-def run_benchmarks(api, num_runs: int = 3) -> Dict[str, BenchmarkData]:
-    """Run benchmarks for all scenarios."""
-    logger.info("Starting benchmark run")
-    scenarios = generate_scenarios(api)
-    results: Dict[str, BenchmarkData] = {}
-
-    total_scenarios = len(scenarios)
-    for idx, (query_name, params) in enumerate(scenarios, 1):
-        scenario_key = f"{query_name} - {params}"
-        logger.info(f"Running scenario {idx}/{total_scenarios}: {scenario_key}")
+def resolve_query(api, query_name: str) -> Callable:
+    """Return the API method or registered fetch function for a scenario."""
+    if query_name in SCENARIO_REGISTRY:
+        return SCENARIO_REGISTRY[query_name]["func"]
+    return getattr(api, query_name)
+
+
+def benchmark_scenario(
+    api,
+    query_name: str,
+    date_range: str,
+    params: dict,
+    num_runs: int,
+    warmup_runs: int,
+    cursor_time=None,
+    concurrency: int = 1,
+) -> BenchmarkData:
+    """
+    Run the warmup and timed executions of one scenario.
+
+    The runs of a scenario always execute one after another, so with a
+    worker pool only the scenarios themselves overlap.
+    """
+    benchmark_data = create_benchmark_data(query_name, params, date_range)
+    benchmark_data["concurrency"] = concurrency
+
+    for run in range(warmup_runs):
+        try:
+            execution_time, _ = time_query(
+                api, query_name, cursor_time=cursor_time, **params
+            )
+            if run == 0:
+                benchmark_data["cold_time"] = execution_time
+        except Exception as e:
+            logger.error(f"Error in warmup run {run + 1}: {str(e)}")
+
+    for run in range(num_runs):
+        try:
+            logger.debug(f"  Run {run + 1}/{num_runs}")
+            execution_time, server_time = time_query(
+                api, query_name, cursor_time=cursor_time, **params
+            )
+            benchmark_data["execution_times"].append(execution_time)
+            benchmark_data["server_times"].append(server_time)
+            benchmark_data["client_times"].append(execution_time - server_time)
+            logger.debug(f"  Completed in {execution_time:.4f} seconds")
+        except Exception as e:
+            error_msg = f"Error in run {run + 1}: {str(e)}"
+            benchmark_data["errors"].append(error_msg)
+            logger.error(error_msg)
+
+    return benchmark_data
+
+
+def run_benchmarks(
+    api,
+    num_runs: int = 3,
+    warmup_runs: int = 1,
+    date_ranges: List[str] = DATE_RANGES,
+    only: Optional[str] = None,
+    explain: bool = False,
+    workers: int = 1,
+    progress: Optional[Callable[[int, int, str, BenchmarkData], None]] = None,
+) -> Dict[str, BenchmarkData]:
+    """
+    Run benchmarks for all scenarios.
+
+    Each scenario runs `warmup_runs` untimed executions before `num_runs`
+    timed ones. The first warmup is kept as the cold time. `only` keeps the
+    scenarios whose query name contains it. With `explain`, each scenario
+    runs once more after the timed runs to capture its query plans.
+
+    With `workers` above 1, scenarios run on a thread pool sharing the API's
+    connection pool, and each result records that concurrency level. Plans
+    are still captured serially once all timings are done. `progress` is
+    called with (completed, total, scenario_key, benchmark_data) as each
+    scenario finishes.
+    """
+    logger.info(f"Starting benchmark run with {workers} worker(s)")
+    scenarios = {
+        f"{query_name} - {date_range} - {params}": (query_name, date_range, params)
+        for query_name, date_range, params in generate_scenarios(api, date_ranges)
+        if only is None or only in query_name
+    }
+    completed: Dict[str, BenchmarkData] = {}
 
-        benchmark_data = create_benchmark_data(query_name, params)
-        results[scenario_key] = benchmark_data
+    # registered fetch functions read the API from the session state
+    st.session_state.api = api
 
-        for run in range(num_runs):
+    def finish(scenario_key: str, benchmark_data: BenchmarkData):
+        completed[scenario_key] = benchmark_data
+        logger.info(
+            f"Completed scenario {len(completed)}/{len(scenarios)}: {scenario_key}"
+        )
+        if progress is not None:
+            progress(len(completed), len(scenarios), scenario_key, benchmark_data)
+
+    with track_cursor_time(api) as cursor_time:
+        if workers <= 1:
+            for scenario_key, scenario in scenarios.items():
+                finish(
+                    scenario_key,
+                    benchmark_scenario(
+                        api, *scenario, num_runs, warmup_runs, cursor_time
+                    ),
+                )
+        else:
+            # worker threads need the page's script context to read session state
+            ctx = get_script_run_ctx()
+            with ThreadPoolExecutor(
+                max_workers=workers,
+                initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx),
+            ) as executor:
+                futures = {
+                    executor.submit(
+                        benchmark_scenario,
+                        api,
+                        *scenario,
+                        num_runs,
+                        warmup_runs,
+                        cursor_time,
+                        workers,
+                    ): scenario_key
+                    for scenario_key, scenario in scenarios.items()
+                }
+                for future in as_completed(futures):
+                    finish(futures[future], future.result())
+
+    results = {scenario_key: completed[scenario_key] for scenario_key in scenarios}
+
+    if explain:
+        for scenario_key, (query_name, _, params) in scenarios.items():
             try:
-                logger.debug(f"  Run {run + 1}/{num_runs}")
-                execution_time = time_query(api, query_name, **params)
-                benchmark_data["execution_times"].append(execution_time)
-                logger.debug(f"  Completed in {execution_time:.4f} seconds")
+                with capture_plans(api, query_name) as plans:
+                    resolve_query(api, query_name)(**params)
+                results[scenario_key]["plans"] = plans
             except Exception as e:
-                error_msg = f"Error in run {run + 1}: {str(e)}"
-                benchmark_data["errors"].append(error_msg)
-                logger.error(error_msg)
+                logger.error(f"Error capturing plans for {scenario_key}: {str(e)}")
 
     logger.info("Benchmark run completed")
     return results
@@ -124,12 +393,21 @@ def create_benchmark_dataframe(results: Dict[str, BenchmarkData]) -> pd.DataFram
 
         row = {
             "query_name": benchmark_data["query_name"],
-            "avg_time": stats["avg_time"],
-            "min_time": stats["min_time"],
-            "max_time": stats["max_time"],
-            "success_rate": stats["success_rate"],
-            "error_count": len(benchmark_data["errors"]),
+            "date_range": benchmark_data["date_range"],
+            "concurrency": benchmark_data["concurrency"],
+            **stats,
         }
+        row["error_count"] = len(benchmark_data["errors"])
+        if benchmark_data["plans"]:
+            nodes = [
+                node
+                for captured in benchmark_data["plans"]
+                for node in plan_nodes(captured["plan"])
+            ]
+            row["seq_scans"] = sum(node["seq_scan"] for node in nodes)
+            row["rows_removed_by_filter"] = sum(
+                node["rows_removed_by_filter"] for node in nodes
+            )
         row.update(params)
         data.append(row)
 
@@ -167,6 +445,16 @@ def print_report(results: Dict[str, BenchmarkData]):
         print(f"  Average execution time: {stats['avg_time']:.4f} seconds")
         print(f"  Min execution time: {stats['min_time']:.4f} seconds")
         print(f"  Max execution time: {stats['max_time']:.4f} seconds")
+        print(
+            f"  Median / p95 / p99: {stats['median_time']:.4f} / "
+            f"{stats['p95_time']:.4f} / {stats['p99_time']:.4f} seconds"
+        )
+        print(f"  Std deviation: {stats['stddev_time']:.4f} seconds")
+        print(
+            f"  Median server / client time: {stats['median_server_time']:.4f} / "
+            f"{stats['median_client_time']:.4f} seconds"
+        )
+        print(f"  Cold execution time: {stats['cold_time']:.4f} seconds")
         print(f"  Success rate: {stats['success_rate'] * 100:.1f}%")
 
         if benchmark_data["errors"]:
@@ -183,21 +471,319 @@ def save_results(df: pd.DataFrame, prefix: str = "benchmark_results") -> str:
     return filename
 
 
-if __name__ == "__main__":
-    logger.info("Initializing benchmark script")
+def page_bundles(date_range: str = "30d") -> Dict[str, List[Tuple[str, dict]]]:
+    """
+    Return the queries each key_metrics page runs in `fetch_data`.
 
-    db_config = get_db_config(streamlit=False)
-    api = SynthetixAPI(db_config, environment="prod", streamlit=False)
+    Bundles mirror the pages with the "all" chain filter selected, which is
+    the default view and the heaviest query set.
+    """
+    end_date = datetime.now().date()
+    start_date = get_start_date(date_range).date()
+    dates = {"start_date": start_date, "end_date": end_date}
+
+    return {
+        "cross_chain": [
+            *[
+                (
+                    "get_core_stats_by_collateral",
+                    {**dates, "chain": chain, "resolution": "7d"},
+                )
+                for chain in SUPPORTED_CHAINS_CORE
+            ],
+            *[
+                ("get_core_stats", {**dates, "chain": chain})
+                for chain in SUPPORTED_CHAINS_CORE
+            ],
+            *[
+                ("get_perps_stats", {**dates, "chain": chain, "resolution": "daily"})
+                for chain in SUPPORTED_CHAINS_PERPS
+            ],
+            *[
+                (
+                    "get_perps_open_interest",
+                    {**dates, "chain": chain, "resolution": "daily"},
+                )
+                for chain in SUPPORTED_CHAINS_PERPS
+            ],
+            *[
+                (
+                    "get_perps_account_activity",
+                    {**dates, "chain": chain, "resolution": "day"},
+                )
+                for chain in SUPPORTED_CHAINS_PERPS
+            ],
+        ],
+        "perps": [
+            *[
+                ("get_perps_stats", {**dates, "chain": chain, "resolution": "daily"})
+                for chain in SUPPORTED_CHAINS_PERPS
+            ],
+            *[
+                (
+                    "get_perps_account_activity",
+                    {**dates, "chain": chain, "resolution": resolution},
+                )
+                for resolution in ["day", "month"]
+                for chain in SUPPORTED_CHAINS_PERPS
+            ],
+        ],
+        "lp": [
+            *[
+                (
+                    "get_core_stats_by_collateral",
+                    {**dates, "chain": chain, "resolution": "7d"},
+                )
+                for chain in SUPPORTED_CHAINS_CORE
+            ],
+            *[
+                (
+                    "get_core_account_activity",
+                    {**dates, "chain": chain, "resolution": "day"},
+                )
+                for chain in SUPPORTED_CHAINS_CORE
+            ],
+        ],
+        "v2": [
+            ("get_perps_v2_stats", {**dates, "resolution": "daily"}),
+            ("get_perps_v2_open_interest", {**dates, "resolution": "daily"}),
+        ],
+    }
 
-    # Run benchmarks
-    results = run_benchmarks(api)
 
-    # Create DataFrame
-    df = create_benchmark_dataframe(results)
+def run_virtual_user(
+    api,
+    bundles: Dict[str, List[Tuple[str, dict]]],
+    weights: List[float],
+    stop_at: float,
+    think_time: Tuple[float, float],
+    seed: int,
+) -> List[LoadSample]:
+    """Replay randomly chosen page bundles until `stop_at`, pausing between pages."""
+    rng = random.Random(seed)
+    names = list(bundles)
+    samples: List[LoadSample] = []
+
+    while time.perf_counter() < stop_at:
+        bundle = rng.choices(names, weights=weights)[0]
+        error = None
+        queries = 0
+        start_time = time.perf_counter()
+        try:
+            for query_name, params in bundles[bundle]:
+                getattr(api, query_name)(**params)
+                queries += 1
+        except Exception as e:
+            error = str(e)
+        samples.append(
+            {
+                "bundle": bundle,
+                "latency": time.perf_counter() - start_time,
+                "queries": queries,
+                "error": error,
+            }
+        )
+        time.sleep(rng.uniform(*think_time))
 
-    # Print report
-    print_report(results)
+    return samples
 
-    # Save results
-    csv_filename = save_results(df)
+
+def summarize_load(samples: List[LoadSample], elapsed: float) -> Dict[str, float]:
+    """Calculate throughput, latency percentiles and error rate for one load level."""
+    latencies = [s["latency"] for s in samples if s["error"] is None]
+    errors = sum(1 for s in samples if s["error"] is not None)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if latencies else (0, 0, 0)
+    return {
+        "bundles": len(samples),
+        "queries": sum(s["queries"] for s in samples),
+        "throughput": len(latencies) / elapsed if elapsed > 0 else 0,
+        "query_throughput": (
+            sum(s["queries"] for s in samples) / elapsed if elapsed > 0 else 0
+        ),
+        "p50_latency": p50,
+        "p95_latency": p95,
+        "p99_latency": p99,
+        "errors": errors,
+        "error_rate": errors / len(samples) if samples else 0,
+    }
+
+
+def pool_usage(before: dict, after: dict) -> Dict[str, float]:
+    """
+    Summarize the connection pool between two `pool_metrics()` snapshots.
+
+    Checkouts and wait time are the difference between the snapshots. The
+    peaks are the API's peaks since startup, which the ramp reaches at its
+    current level.
+    """
+    checkouts = after["checkouts"] - before["checkouts"]
+    wait = after["wait_seconds"] - before["wait_seconds"]
+    return {
+        "pool_checkouts": checkouts,
+        "avg_pool_wait": wait / checkouts if checkouts else 0,
+        "pool_wait_seconds": wait,
+        "peak_checked_out": after["peak_checked_out"],
+        "peak_overflow": after["peak_overflow"],
+    }
+
+
+def run_load_test(
+    api,
+    concurrency_levels: List[int] = LOAD_CONCURRENCY_LEVELS,
+    duration: float = LOAD_DURATION,
+    think_time: Tuple[float, float] = LOAD_THINK_TIME,
+    bundles: Optional[Dict[str, List[Tuple[str, dict]]]] = None,
+    weights: Optional[Dict[str, float]] = None,
+) -> pd.DataFrame:
+    """
+    Ramp concurrent virtual users replaying page bundles against the API.
+
+    Each level runs for `duration` seconds with one thread per virtual user,
+    all sharing the API's connection pool. Returns one row per level.
+    """
+    logger.info("Starting load test")
+    bundles = bundles if bundles is not None else page_bundles()
+    bundle_weights = [(weights or {}).get(name, 1.0) for name in bundles]
+    results = []
+
+    for users in concurrency_levels:
+        logger.info(f"Running {users} virtual users for {duration}s")
+        before = api.pool_metrics()
+        start_time = time.perf_counter()
+        stop_at = start_time + duration
+        with ThreadPoolExecutor(max_workers=users) as executor:
+            futures = [
+                executor.submit(
+                    run_virtual_user,
+                    api,
+                    bundles,
+                    bundle_weights,
+                    stop_at,
+                    think_time,
+                    seed,
+                )
+                for seed in range(users)
+            ]
+            samples = [s for future in futures for s in future.result()]
+        elapsed = time.perf_counter() - start_time
+
+        row = {"users": users, "elapsed": elapsed}
+        row.update(summarize_load(samples, elapsed))
+        row.update(pool_usage(before, api.pool_metrics()))
+        results.append(row)
+
+        for error in {s["error"] for s in samples if s["error"] is not None}:
+            logger.error(f"  {users} users: {error}")
+
+    logger.info("Load test completed")
+    return pd.DataFrame(results)
+
+
+def print_load_report(df: pd.DataFrame):
+    """Print a formatted report of load test results."""
+    print("\nSynthetixAPI Load Test Report")
+    print("=============================")
+    print(
+        df.to_string(
+            index=False,
+            float_format=lambda value: f"{value:.4f}",
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark SynthetixAPI queries.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument(
+        "--workers", type=int, default=1, help="scenarios to run concurrently"
+    )
+    parser.add_argument(
+        "--date-ranges",
+        default=",".join(DATE_RANGES),
+        help="comma-separated date ranges to benchmark",
+    )
+    parser.add_argument("--only", help="only run queries whose name contains this")
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="capture EXPLAIN (ANALYZE, BUFFERS) plans for every scenario",
+    )
+    parser.add_argument("--history", default=HISTORY_DB)
+    parser.add_argument("--label", help="free-text note stored with the run")
+    parser.add_argument(
+        "--load",
+        action="store_true",
+        help="replay page query bundles from concurrent virtual users",
+    )
+    parser.add_argument(
+        "--users",
+        default=",".join(str(users) for users in LOAD_CONCURRENCY_LEVELS),
+        help="comma-separated concurrency levels to ramp through",
+    )
+    parser.add_argument("--duration", type=float, default=LOAD_DURATION)
+    parser.add_argument(
+        "--think-time", type=float, nargs=2, default=list(LOAD_THINK_TIME)
+    )
+    parser.add_argument(
+        "--pool-size", type=int, help=f"defaults to POOL_SIZE or {POOL_SIZE}"
+    )
+    parser.add_argument(
+        "--max-overflow",
+        type=int,
+        help=f"defaults to MAX_OVERFLOW or {MAX_OVERFLOW}",
+    )
+    args = parser.parse_args()
+
+    logger.info("Initializing benchmark script")
+
+    db_config = get_db_config(streamlit=False)
+    api = SynthetixAPI(
+        db_config,
+        environment="prod",
+        streamlit=False,
+        pool_size=args.pool_size,
+        max_overflow=args.max_overflow,
+    )
+
+    if args.load:
+        df = run_load_test(
+            api,
+            concurrency_levels=[int(users) for users in args.users.split(",")],
+            duration=args.duration,
+            think_time=tuple(args.think_time),
+        )
+        print_load_report(df)
+        csv_filename = save_results(df, prefix="load_test_results")
+    else:
+        # Run benchmarks
+        results = run_benchmarks(
+            api,
+            num_runs=args.runs,
+            warmup_runs=args.warmup,
+            date_ranges=args.date_ranges.split(","),
+            only=args.only,
+            explain=args.explain,
+            workers=args.workers,
+        )
+
+        # Create DataFrame
+        df = create_benchmark_dataframe(results)
+
+        # Print report
+        print_report(results)
+
+        # Save results
+        csv_filename = save_results(df)
+        run_id = save_run(
+            results,
+            environment=api.environment,
+            num_runs=args.runs,
+            warmup_runs=args.warmup,
+            concurrency=args.workers,
+            label=args.label,
+            path=args.history,
+        )
+        logger.info(f"Run {run_id} appended to {args.history}")
+    logger.info(f"Connection pool: {api.pool_metrics()}")
     logger.info(f"Results saved to {csv_filename}")
@@ -0,0 +1,242 @@
+import os
+import sys
+import json
+import time
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import streamlit as st
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# constants
+PROFILE_ENV = "DASHBOARD_PROFILE"
+PROFILE_DIR_ENV = "DASHBOARD_PROFILE_DIR"
+PROFILE_DIR = "profiles"
+MAX_PROFILES = 50
+SAMPLE_INTERVAL = 0.005
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+CODE_ROOTS = tuple(
+    os.path.join(REPO_ROOT, package) for package in ["api", "dashboards"]
+)
+PHASE_PATTERNS = {
+    "fetch": ["/sqlalchemy/", "/psycopg2/", os.path.join("api", "internal_api.py")],
+    "chart": ["/plotly/", os.path.join("dashboards", "utils", "charts.py")],
+    "render": ["/streamlit/"],
+    "transform": ["/pandas/", "/numpy/"],
+}
+
+Frame = Tuple[str, str, int]
+
+
+def profiling_enabled() -> bool:
+    """Profile when `DASHBOARD_PROFILE` is set in the environment or secrets."""
+    if os.environ.get(PROFILE_ENV):
+        return True
+    try:
+        return bool(st.secrets.settings.get(PROFILE_ENV))
+    except (FileNotFoundError, KeyError, AttributeError):
+        return False
+
+
+class SamplingProfiler:
+    """
+    Sample the call stack of one thread at a fixed interval.
+
+    Samples are taken from a background thread with `sys._current_frames`, so
+    the profiled code runs unmodified. Each sample is weighted by the time
+    elapsed since the previous one.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.samples: List[Tuple[Tuple[Frame, ...], float]] = []
+        self._thread_id = None
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def start(self):
+        self._thread_id = threading.get_ident()
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._run, daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        self._stop.set()
+        self._sampler.join()
+
+    def _run(self):
+        last_time = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            now = time.perf_counter()
+            if frame is not None:
+                self.samples.append((_stack(frame), now - last_time))
+            last_time = now
+
+    def phases(self) -> Dict[str, float]:
+        """Return seconds spent in each phase."""
+        totals = {phase: 0.0 for phase in [*PHASE_PATTERNS, "other"]}
+        for stack, weight in self.samples:
+            totals[classify_stack(stack)] += weight
+        return totals
+
+    def collapsed(self) -> str:
+        """Return the samples as collapsed stacks for flame graph tools."""
+        counts = Counter(
+            ";".join(
+                f"{name} ({_short_path(path)}:{line})" for name, path, line in stack
+            )
+            for stack, _ in self.samples
+        )
+        return "\n".join(f"{stack} {count}" for stack, count in counts.items())
+
+    def speedscope(self, name: str) -> dict:
+        """Return the samples in the speedscope file format."""
+        frames: Dict[Frame, int] = {}
+        samples = []
+        for stack, _ in self.samples:
+            samples.append([frames.setdefault(frame, len(frames)) for frame in stack])
+        weights = [weight for _, weight in self.samples]
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {
+                "frames": [
+                    {"name": name, "file": path, "line": line}
+                    for name, path, line in frames
+                ]
+            },
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+            "name": name,
+            "exporter": "dashboards.utils.profiling",
+        }
+
+
+def _stack(frame) -> Tuple[Frame, ...]:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    return tuple(reversed(stack))
+
+
+def _short_path(path: str) -> str:
+    if path.startswith(REPO_ROOT):
+        return os.path.relpath(path, REPO_ROOT)
+    return os.path.basename(path)
+
+
+def classify_stack(stack: Tuple[Frame, ...]) -> str:
+    """
+    Assign a sample to a phase.
+
+    The innermost dashboard frame decides. Inside the query or chart helpers
+    the sample is fetch or chart. Otherwise it goes to the phase of the
+    library that frame is calling into, so plotly serialization inside
+    `st.plotly_chart` is render, not chart. Time in dashboard code itself
+    counts as transform.
+    """
+    code_frames = [
+        idx for idx, (_, path, _) in enumerate(stack) if path.startswith(CODE_ROOTS)
+    ]
+    if not code_frames:
+        return "other"
+
+    innermost = code_frames[-1]
+    for phase in ["fetch", "chart"]:
+        if any(pattern in stack[innermost][1] for pattern in PHASE_PATTERNS[phase]):
+            return phase
+
+    if innermost == len(stack) - 1:
+        return "transform"
+    callee = stack[innermost + 1][1]
+    for phase, patterns in PHASE_PATTERNS.items():
+        if any(pattern in callee for pattern in patterns):
+            return phase
+    return "other"
+
+
+def save_profile(profiler: SamplingProfiler, name: str) -> List[str]:
+    """Write the speedscope, collapsed stack and phase files for a profile."""
+    profile_dir = os.environ.get(PROFILE_DIR_ENV, PROFILE_DIR)
+    os.makedirs(profile_dir, exist_ok=True)
+    prefix = os.path.join(
+        profile_dir, f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    )
+
+    paths = [
+        f"{prefix}.speedscope.json",
+        f"{prefix}.folded",
+        f"{prefix}.phases.json",
+    ]
+    with open(paths[0], "w") as f:
+        json.dump(profiler.speedscope(name), f)
+    with open(paths[1], "w") as f:
+        f.write(profiler.collapsed())
+    with open(paths[2], "w") as f:
+        json.dump(profiler.phases(), f, indent=2)
+    prune_profiles(profile_dir)
+    return paths
+
+
+def prune_profiles(profile_dir: str, keep: int = MAX_PROFILES):
+    """Delete all but the newest `keep` profiles in `profile_dir`."""
+    files = sorted(
+        (os.path.join(profile_dir, file) for file in os.listdir(profile_dir)),
+        key=os.path.getmtime,
+        reverse=True,
+    )
+    # each profile is written as three files
+    for path in files[keep * 3 :]:
+        os.remove(path)
+
+
+@contextmanager
+def profile_page(name: Optional[str] = None):
+    """
+    Profile a page run when profiling is enabled.
+
+    Wrap `nav.run()` or a module's `main()` with it. The profile is saved to
+    `DASHBOARD_PROFILE_DIR` (default `profiles/`), which keeps the newest
+    `MAX_PROFILES`, and the phase breakdown is shown in the sidebar.
+    """
+    if not profiling_enabled():
+        yield
+        return
+
+    name = (name or "page").lower().replace(" ", "_")
+    profiler = SamplingProfiler()
+    profiler.start()
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.stop()
+        elapsed = time.perf_counter() - start_time
+        paths = save_profile(profiler, name)
+        logger.info(f"Profiled {name} in {elapsed:.3f}s, saved to {paths[0]}")
+
+    phases = profiler.phases()
+    with st.sidebar.expander("Profile"):
+        st.caption(f"{name}: {elapsed:.3f}s, {len(profiler.samples)} samples")
+        st.dataframe(
+            pd.DataFrame({"phase": list(phases), "seconds": list(phases.values())}),
+            hide_index=True,
+        )
+        st.caption(f"Saved to {paths[0]}")
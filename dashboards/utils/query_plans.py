@@ -0,0 +1,110 @@
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+import pandas as pd
+
+# constants
+INDEX_SCAN_NODE_TYPES = ["Index Scan", "Index Only Scan", "Bitmap Heap Scan"]
+TABLE_SUMMARY_COLUMNS = [
+    "table",
+    "seq_scans",
+    "index_scans",
+    "rows_returned",
+    "rows_removed_by_filter",
+    "shared_hit_blocks",
+    "shared_read_blocks",
+    "hit_ratio",
+]
+
+
+def _walk(node: dict) -> Iterator[dict]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk(child)
+
+
+def plan_nodes(plan: dict) -> List[dict]:
+    """
+    Flatten the scan nodes of an `EXPLAIN (FORMAT JSON)` plan.
+
+    Row counts are multiplied by the loop count, since Postgres reports them
+    per loop.
+    """
+    nodes = []
+    for node in _walk(plan["Plan"]):
+        if "Relation Name" not in node:
+            continue
+        loops = node.get("Actual Loops", 1)
+        nodes.append(
+            {
+                "table": node["Relation Name"],
+                "node_type": node["Node Type"],
+                "seq_scan": node["Node Type"] == "Seq Scan",
+                "rows_returned": node.get("Actual Rows", 0) * loops,
+                "rows_removed_by_filter": node.get("Rows Removed by Filter", 0) * loops,
+                "shared_hit_blocks": node.get("Shared Hit Blocks", 0),
+                "shared_read_blocks": node.get("Shared Read Blocks", 0),
+            }
+        )
+    return nodes
+
+
+def summarize_plans(plans: List[dict]) -> pd.DataFrame:
+    """
+    Summarize scans per table across a list of captured plans.
+
+    Each plan is a dict with `query_name` and the `plan` returned by
+    `SynthetixAPI.explain_query`.
+    """
+    rows = [
+        {"query_name": captured["query_name"], **node}
+        for captured in plans
+        for node in plan_nodes(captured["plan"])
+    ]
+    if not rows:
+        return pd.DataFrame(columns=TABLE_SUMMARY_COLUMNS + ["queries"])
+
+    df = pd.DataFrame(rows)
+    summary = df.groupby("table").agg(
+        seq_scans=("seq_scan", "sum"),
+        index_scans=(
+            "node_type",
+            lambda types: types.isin(INDEX_SCAN_NODE_TYPES).sum(),
+        ),
+        rows_returned=("rows_returned", "sum"),
+        rows_removed_by_filter=("rows_removed_by_filter", "sum"),
+        shared_hit_blocks=("shared_hit_blocks", "sum"),
+        shared_read_blocks=("shared_read_blocks", "sum"),
+        queries=("query_name", lambda names: ", ".join(sorted(set(names)))),
+    )
+    blocks = summary["shared_hit_blocks"] + summary["shared_read_blocks"]
+    summary["hit_ratio"] = (summary["shared_hit_blocks"] / blocks).where(blocks > 0)
+    return (
+        summary.reset_index()[TABLE_SUMMARY_COLUMNS + ["queries"]]
+        .sort_values(["seq_scans", "rows_removed_by_filter"], ascending=False)
+        .reset_index(drop=True)
+    )
+
+
+def full_scans(summary: pd.DataFrame, prefix: str = "fct_") -> pd.DataFrame:
+    """Return the tables matching `prefix` that were read with a sequential scan."""
+    return summary[
+        summary["table"].str.startswith(prefix) & (summary["seq_scans"] > 0)
+    ].reset_index(drop=True)
+
+
+@contextmanager
+def capture_plans(api, query_name: str) -> Iterator[List[Dict]]:
+    """
+    Capture a query plan for every query this thread runs inside the block.
+
+    Queries still return their results; each one is then explained with
+    `EXPLAIN (ANALYZE, BUFFERS)`, which executes it a second time, so timings
+    taken inside this block are not representative. Other threads sharing
+    the API, such as other sessions of the app, are not affected.
+    """
+    plans: List[Dict] = []
+    with api.explain(
+        lambda plan: plans.append({"query_name": query_name, "plan": plan})
+    ):
+        yield plans
@@ -0,0 +1,74 @@
+import pkgutil
+import importlib
+import itertools
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple, TypedDict
+
+from dashboards.utils.date_utils import get_start_date
+
+# constants
+DATE_RANGES = ["1d", "7d", "30d", "90d", "1y", "All"]
+SCENARIO_PACKAGES = [
+    "dashboards.all_metrics.modules.v2",
+    "dashboards.all_metrics.modules.v3",
+]
+
+
+class ScenarioSpec(TypedDict):
+    func: Callable
+    grid: Dict[str, list]
+    date_ranges: List[str]
+
+
+SCENARIO_REGISTRY: Dict[str, ScenarioSpec] = {}
+
+
+def register_scenarios(
+    grid: Optional[Dict[str, list]] = None, date_ranges: List[str] = DATE_RANGES
+) -> Callable:
+    """
+    Register a fetch function with the parameter grid the benchmarks run it over.
+
+    Apply it beneath `cache_fetch` so the registered function is the
+    uncached one. The grid maps argument names to the values the page offers;
+    `start_date` and `end_date` are filled in from `date_ranges`.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        name = ".".join([*func.__module__.split(".")[-2:], func.__name__])
+        SCENARIO_REGISTRY[name] = {
+            "func": func,
+            "grid": grid or {},
+            "date_ranges": date_ranges,
+        }
+        return func
+
+    return decorator
+
+
+def load_registered_scenarios() -> Dict[str, ScenarioSpec]:
+    """Import every dashboard module so its fetch functions register."""
+    for package_name in SCENARIO_PACKAGES:
+        package = importlib.import_module(package_name)
+        for module_info in pkgutil.iter_modules(package.__path__):
+            importlib.import_module(f"{package_name}.{module_info.name}")
+    return SCENARIO_REGISTRY
+
+
+def date_params(date_range: str) -> Dict[str, datetime]:
+    """Return the start and end dates a page uses for a date range."""
+    return {
+        "start_date": get_start_date(date_range).date(),
+        "end_date": datetime.today().date() + timedelta(days=1),
+    }
+
+
+def expand_grid(
+    grid: Dict[str, list], date_ranges: List[str]
+) -> List[Tuple[str, dict]]:
+    """Return every (date_range, params) combination of a parameter grid."""
+    return [
+        (date_range, {**dict(zip(grid, values)), **date_params(date_range)})
+        for date_range in date_ranges
+        for values in itertools.product(*grid.values())
+    ]
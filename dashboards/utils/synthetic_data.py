@@ -0,0 +1,194 @@
+import re
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from api.internal_api import SynthetixAPI
+
+# constants
+TIME_COLUMNS = ["ts", "date", "block_timestamp"]
+CATEGORY_VALUES = {
+    "chain": ["Arbitrum", "Base", "Ethereum"],
+    "market": ["ETH", "BTC", "SOL", "SNX", "OP", "ARB", "LINK", "DOGE"],
+    "market_symbol": ["ETH", "BTC", "SOL", "SNX", "OP", "ARB", "LINK", "DOGE"],
+    "action": ["Delegated", "Withdrawn", "Claimed"],
+    "side": ["Long", "Short"],
+}
+CATEGORY_COLUMNS = [
+    "label",
+    "keeper",
+    "keeper_full",
+    "tracking_code",
+    "collateral_type",
+    "token_symbol",
+    "synth_symbol",
+    "market_name",
+    "token_pair",
+    "reward_token",
+    "account_id",
+    "transaction_hash",
+]
+RATIO_SUFFIXES = ("_pct", "_share", "_rate", "_ratio")
+
+
+def select_columns(query: str) -> Dict[str, str]:
+    """
+    Return the output columns of a SQL query, mapped to their expressions.
+
+    The first top-level SELECT list is used, falling back to the first nested
+    SELECT when the top-level query selects `*` from a CTE.
+    """
+    masked = _mask_literals(query)
+    selects = [
+        (
+            match.start(),
+            masked[: match.start()].count("(") - masked[: match.start()].count(")"),
+        )
+        for match in re.finditer(r"\bselect\b", masked, re.IGNORECASE)
+    ]
+    top_level = [pos for pos, depth in selects if depth == 0]
+    columns = _parse_select_list(query, top_level[0] if top_level else selects[0][0])
+    if list(columns) == ["*"]:
+        columns = _parse_select_list(query, selects[0][0])
+    return columns
+
+
+def _mask_literals(text: str) -> str:
+    # blank out string literals without changing offsets
+    return re.sub(r"'[^']*'", lambda m: "'" + " " * (len(m.group()) - 2) + "'", text)
+
+
+def _parse_select_list(query: str, pos: int) -> Dict[str, str]:
+    text = query[pos + len("select") :]
+    masked = _mask_literals(text)
+    from_match = None
+    depth, start, expressions = 0, 0, []
+    for idx, char in enumerate(masked):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            expressions.append(text[start:idx])
+            start = idx + 1
+        elif (
+            depth == 0
+            and re.match(r"from\b", masked[idx:], re.IGNORECASE)
+            and not (masked[idx - 1].isalnum() or masked[idx - 1] == "_")
+        ):
+            from_match = idx
+            break
+    expressions.append(text[start:from_match])
+
+    columns = {}
+    for expression in expressions:
+        expression = expression.strip()
+        alias = re.search(r"\bas\s+(\w+)\s*$", expression, re.IGNORECASE)
+        if alias:
+            columns[alias.group(1)] = expression[: alias.start()].strip()
+        elif expression == "*":
+            columns["*"] = expression
+        else:
+            columns[re.findall(r"\w+", expression)[-1]] = expression
+    return columns
+
+
+def synthetic_frame(
+    columns: Dict[str, str],
+    periods: int = 90,
+    groups: int = 10,
+    freq: str = "D",
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Build a frame for the given columns, one row per period and group.
+
+    Time columns get a date range, known categorical columns get a distinct
+    label per group, and every other column gets random non-negative values.
+    Columns selected as a string literal keep that literal, and categorical
+    labels carry any literals in their expression (such as a chain name), so
+    frames fetched per chain stay distinct when concatenated.
+    """
+    literals = {
+        column: re.findall(r"'([^']*)'", expression)
+        for column, expression in columns.items()
+    }
+    constants = {
+        column: values[0]
+        for column, values in literals.items()
+        if re.fullmatch(r"'[^']*'", columns[column])
+    }
+    grouped = [
+        column
+        for column in columns
+        if column not in constants
+        and (column in CATEGORY_VALUES or column in CATEGORY_COLUMNS)
+    ]
+    groups = groups if grouped else 1
+
+    rng = np.random.default_rng(seed)
+    n_rows = periods * groups
+    group_ids = np.tile(np.arange(groups), periods)
+    timestamps = pd.date_range(end=datetime.now(), periods=periods, freq=freq).floor(
+        freq
+    )
+
+    df = pd.DataFrame(index=range(n_rows))
+    for column in columns:
+        suffix = "".join(literals[column])
+        if column == "*":
+            continue
+        elif column in constants:
+            df[column] = constants[column]
+        elif column in TIME_COLUMNS:
+            df[column] = np.repeat(timestamps, groups)
+        elif column in CATEGORY_VALUES or column in CATEGORY_COLUMNS:
+            values = CATEGORY_VALUES.get(column) or [
+                f"{column}_{group}" for group in range(groups)
+            ]
+            labels = [
+                values[group % len(values)]
+                + (f" {group // len(values)}" if group >= len(values) else "")
+                + suffix
+                for group in range(groups)
+            ]
+            df[column] = np.array(labels, dtype=object)[group_ids]
+        elif column.endswith("_id"):
+            df[column] = group_ids + 1
+        elif "apr" in column or column.endswith(RATIO_SUFFIXES):
+            df[column] = rng.random(n_rows)
+        else:
+            df[column] = rng.random(n_rows) * 1e6
+    return df
+
+
+class SyntheticAPI(SynthetixAPI):
+    """A SynthetixAPI that answers every query with a synthetic frame."""
+
+    def __init__(
+        self,
+        environment: str = "prod",
+        periods: int = 90,
+        groups: int = 10,
+        freq: str = "D",
+    ):
+        self.environment = environment
+        self.periods = periods
+        self.groups = groups
+        self.freq = freq
+        self.statement_timeout = None
+        self._local = threading.local()
+
+    def _run_query(self, query: str, timeout: Optional[float] = None) -> pd.DataFrame:
+        df = synthetic_frame(
+            select_columns(query),
+            periods=self.periods,
+            groups=self.groups,
+            freq=self.freq,
+        )
+        df.attrs["query_key"] = str(hash(query))
+        df.attrs["fetched_at"] = 0
+        return df
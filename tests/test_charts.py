@@ -0,0 +1,48 @@
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+from dashboards.utils.charts import D3_FORMAT_MAP, _hover_value
+
+SUFFIXES = {"K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}
+VALUES = [0.000123456, 0.25, 1, 9.876, 42.42, 999, 1234.5, 987654, 1.2345e9, -5678]
+
+
+def d3_format(value: float, spec: str) -> str:
+    # the subset of d3-format used by D3_FORMAT_MAP
+    if spec == "$,.3r":
+        return f"{'-' if value < 0 else ''}${Decimal(f'{abs(value):.3g}'):,f}"
+    if spec == ",.0f":
+        return f"{value:,.0f}"
+    if spec == ".2%":
+        return f"{value:.2%}"
+    raise ValueError(spec)
+
+
+def parse(text: str) -> float:
+    text = text.replace("$", "").replace(",", "")
+    if text.endswith("%"):
+        return float(text[:-1]) / 100
+    if text[-1] in SUFFIXES:
+        return float(text[:-1]) * SUFFIXES[text[-1]]
+    return float(text)
+
+
+@pytest.mark.parametrize("y_format", ["$", "#", "%"])
+def test_client_hover_matches_human_format(y_format):
+    y = pd.Series(VALUES)
+    custom_data, _ = _hover_value(y, y_format, human_format=True)
+    _, template = _hover_value(y, y_format, human_format=True, client_hover=True)
+
+    assert template == f"%{{y:{D3_FORMAT_MAP[y_format]}}}"
+    for value, server in zip(VALUES, custom_data):
+        client = d3_format(value, D3_FORMAT_MAP[y_format])
+        assert parse(client) == pytest.approx(parse(server), rel=1e-9)
+
+
+def test_client_hover_keeps_prefix_without_human_format():
+    _, template = _hover_value(
+        pd.Series(VALUES), "$", human_format=False, client_hover=True
+    )
+    assert template == "$%{y}"
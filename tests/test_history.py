@@ -0,0 +1,36 @@
+import time
+
+import pandas as pd
+
+from dashboards.system_monitor.modules import history
+
+
+def test_empty_store(tmp_path):
+    path = str(tmp_path / "history.db")
+    assert history.latest_snapshot(8453, path=path) is None
+    assert history.fresh_snapshot(8453, path=path) is None
+    assert history.load_history(8453, "vaults", path=path).empty
+
+
+def test_latest_snapshot(tmp_path):
+    path = str(tmp_path / "history.db")
+    vaults = pd.DataFrame({"vault_debt": [1.0, 2.0]}, index=["0xa", "0xb"])
+    history.save_snapshot(8453, 100, {"vaults": vaults}, path=path)
+    history.save_snapshot(8453, 200, {"vaults": vaults * 2}, path=path)
+
+    snapshot = history.fresh_snapshot(8453, path=path)
+    assert snapshot["block"] == 200
+    assert snapshot["frames"]["vaults"]["vault_debt"].tolist() == [2.0, 4.0]
+    assert history.load_history(8453, "vaults", path=path).shape[0] == 4
+    assert history.latest_snapshot(1, path=path) is None
+
+
+def test_prune_snapshots(tmp_path):
+    path = str(tmp_path / "history.db")
+    vaults = pd.DataFrame({"vault_debt": [1.0]}, index=["0xa"])
+    history.save_snapshot(8453, 100, {"vaults": vaults}, path=path)
+    time.sleep(0.01)
+
+    assert history.prune_snapshots(0, path=path) == 1
+    assert history.latest_snapshot(8453, path=path) is None
+    assert history.load_history(8453, "vaults", path=path).empty